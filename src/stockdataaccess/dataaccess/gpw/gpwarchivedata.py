@@ -142,6 +142,29 @@ class GpwArchiveData( BaseWorksheetData ):
         values = worksheet.iloc[:, colIndex]
         return dict( zip(names, values) )
 
+    ## returns DataFrame indexed by 'indexType' (stock name by default)
+    ## with column for each of given (numeric) data types
+    def getDataColumns(self, dataTypes: List[StockDataType], day: datetime.date = None,
+                       indexType: StockDataType = StockDataType.STOCK_NAME) -> DataFrame:
+        if day is not None:
+            self.dao = GpwArchiveData.GpwArchiveDAO( day )
+
+        worksheet = self.getWorksheetData()
+        if worksheet is None:
+            return None
+        nameIndex = self.getDataColumnIndex( indexType )
+        names     = worksheet.iloc[:, nameIndex]
+        columnsDict = {}
+        for dataType in dataTypes:
+            colIndex = self.getDataColumnIndex( dataType )
+            columnsDict[ dataType ] = pandas.to_numeric( worksheet.iloc[:, colIndex], errors="coerce" )
+        dataFrame = DataFrame( columnsDict )
+        dataFrame.index = names
+        ## remove summary rows and repeated names
+        dataFrame = dataFrame[ dataFrame.index.notna() ]
+        dataFrame = dataFrame[ ~dataFrame.index.duplicated() ]
+        return dataFrame
+
     def getDataByDate(self, day: datetime.date):
         self.dao = GpwArchiveData.GpwArchiveDAO( day )
         return self.accessWorksheetData()
@@ -0,0 +1,190 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import os
+import logging
+import datetime
+import threading
+from typing import Dict, List
+
+import numpy
+import pandas
+from pandas.core.frame import DataFrame
+
+from stockdataaccess import persist
+from stockdataaccess.dataaccess import TMP_DIR
+from stockdataaccess.dataaccess.datatype import StockDataType
+from stockdataaccess.dataaccess.holidaydata import HolidayData
+from stockdataaccess.dataaccess.gpw.gpwarchivedata import GpwArchiveData
+from stockdataaccess.synchronized import synchronized
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## daily OHLCV series of single instrument, field names are the same as in chart data
+SERIES_DTYPE = numpy.dtype( [ ("t", "datetime64[D]"),
+                              ("o", "f8"), ("h", "f8"), ("l", "f8"), ("c", "f8"), ("v", "f8") ] )
+
+SERIES_COLUMNS = [ StockDataType.OPENING, StockDataType.MAX, StockDataType.MIN,
+                   StockDataType.CLOSING, StockDataType.VOLUME ]
+
+
+class GpwArchiveSeries():
+    """Per instrument daily series derived from GPW archive.
+
+    Each ISIN is stored in separate file as single contiguous array (see SERIES_DTYPE).
+    Series are extended incrementally by days not ingested yet. Store is shared
+    (see 'get_archive_series()') and extended by archive days loaded by analysis.
+    """
+
+    def __init__(self, dataDir: str = None, archiveData: GpwArchiveData = None, holidays: HolidayData = None):
+        if dataDir is None:
+            dataDir = f"{TMP_DIR}data/gpw/archseries/"
+        if archiveData is None:
+            archiveData = GpwArchiveData()
+        if holidays is None:
+            holidays = HolidayData()
+        self.dataDir     = dataDir
+        self.archiveData = archiveData
+        self.holidays    = holidays
+        ## last ingested day
+        self.lastDay: datetime.date = persist.load_object_simple( self._statePath(), None, silent=True )
+
+    def sourceLink( self ):
+        return self.archiveData.sourceLink()
+
+    def getLastDay(self) -> datetime.date:
+        return self.lastDay
+
+    ## ingest archive days from range [fromDay, toDay]
+    ## days up to recently ingested day are skipped (series are only extended forward)
+    ## ingestion stops on first trading day without data (not published yet or failed
+    ## to download), so the day is requested again on next update
+    ## returns number of ingested days
+    @synchronized
+    def update(self, fromDay: datetime.date, toDay: datetime.date = None) -> int:
+        if toDay is None:
+            ## archive of current day is not complete
+            toDay = datetime.date.today() - datetime.timedelta(days=1)
+        currDay = fromDay
+        if self.lastDay is not None and self.lastDay >= currDay:
+            currDay = self.lastDay + datetime.timedelta(days=1)
+        if currDay > toDay:
+            ## nothing to do
+            return 0
+
+        newRows: Dict[ str, List[tuple] ] = {}
+        daysCounter = 0
+        lastIngested = None
+        while currDay <= toDay:
+            if self._isHoliday( currDay ):
+                currDay += datetime.timedelta(days=1)
+                continue
+            dayData = self.archiveData.getDataColumns( SERIES_COLUMNS, currDay, StockDataType.ISIN )
+            if dayData is None:
+                _LOGGER.debug( "missing archive data for %s", currDay )
+                break
+            daysCounter += 1
+            lastIngested = currDay
+            dayStamp = numpy.datetime64( currDay, "D" )
+            for isin, values in zip( dayData.index, dayData.itertuples( index=False ) ):
+                if pandas.isna( values[3] ):
+                    ## no closing value -- no trading
+                    continue
+                rowsList = newRows.setdefault( isin, [] )
+                rowsList.append( (dayStamp, *values) )
+            currDay += datetime.timedelta(days=1)
+
+        _LOGGER.debug( "appending %s days to %s series", daysCounter, len( newRows ) )
+        for isin, rowsList in newRows.items():
+            newBlock = numpy.array( rowsList, dtype=SERIES_DTYPE )
+            series   = self.getSeriesArray( isin )
+            if series is not None and len( series ) > 0:
+                ## rows could be already stored if state was not persisted (e.g. crash)
+                newBlock = newBlock[ newBlock["t"] > series["t"][-1] ]
+                if len( newBlock ) < 1:
+                    continue
+                newBlock = numpy.concatenate( [ series, newBlock ] )
+            self._storeSeries( isin, newBlock )
+
+        if lastIngested is not None:
+            self.lastDay = lastIngested
+            persist.store_object_simple( self.lastDay, self._statePath() )
+        return daysCounter
+
+    ## returns array of SERIES_DTYPE or None if there is no data for given ISIN
+    def getSeriesArray(self, isin: str) -> numpy.ndarray:
+        filePath = self._seriesPath( isin )
+        if os.path.isfile( filePath ) is False:
+            return None
+        return numpy.load( filePath )
+
+    ## returns DataFrame with columns: 't', 'o', 'h', 'l', 'c', 'v' (the same as chart data)
+    def getSeries(self, isin: str, fromDay: datetime.date = None) -> DataFrame:
+        series = self.getSeriesArray( isin )
+        if series is None:
+            return None
+        if fromDay is not None:
+            startIndex = numpy.searchsorted( series["t"], numpy.datetime64( fromDay, "D" ) )
+            series = series[ startIndex: ]
+        dataFrame = DataFrame( series )
+        dataFrame['t'] = dataFrame['t'].astype( "datetime64[ns]" )
+        return dataFrame
+
+    def _storeSeries(self, isin: str, series: numpy.ndarray):
+        filePath = self._seriesPath( isin )
+        os.makedirs( os.path.dirname( filePath ), exist_ok=True )
+        tmpPath = filePath + "_tmp.npy"
+        numpy.save( tmpPath, numpy.ascontiguousarray( series ) )
+        os.replace( tmpPath, filePath )
+
+    def _isHoliday(self, day: datetime.date) -> bool:
+        if HolidayData.isWeekend( day ):
+            return True
+        ## 'HolidayData.isHoliday' warns on every day of not handled years
+        return day in self.holidays.holidaySet
+
+    def _seriesPath(self, isin: str) -> str:
+        return os.path.join( self.dataDir, f"isin_{isin}.npy" )
+
+    def _statePath(self) -> str:
+        return os.path.join( self.dataDir, "state.pickle" )
+
+
+## ==============================================================
+
+
+_SERIES_MUTEX = threading.Lock()
+_SERIES: GpwArchiveSeries = None
+
+
+## returns series store shared by analysis
+def get_archive_series() -> GpwArchiveSeries:
+    # pylint: disable=W0603
+    global _SERIES
+    with _SERIES_MUTEX:
+        if _SERIES is None:
+            _SERIES = GpwArchiveSeries()
+        return _SERIES
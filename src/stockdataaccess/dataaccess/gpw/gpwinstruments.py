@@ -0,0 +1,261 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import datetime
+import threading
+from typing import Dict
+
+from stockdataaccess import persist
+from stockdataaccess.dataaccess import TMP_DIR
+from stockdataaccess.dataaccess.datatype import StockDataType
+from stockdataaccess.dataaccess.gpw.gpwarchivedata import GpwArchiveData
+from stockdataaccess.synchronized import synchronized
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class InstrumentEntry():
+    """Single instrument of GPW universe."""
+
+    def __init__(self, name: str, isin: str, firstDay: datetime.date = None):
+        self.name   = name
+        self.isin   = isin
+        self.ticker: str = None
+        ## days of first and last appearance in archive (since tracking started)
+        self.firstDay: datetime.date = firstDay
+        self.lastDay: datetime.date  = firstDay
+
+
+class GpwInstruments( persist.Versionable ):
+    """Snapshot of instruments listed on GPW.
+
+    Snapshot is derived from archive of recent valid session and refreshed
+    only when archive contains new session. Provides constant time mapping
+    between name, ISIN and ticker.
+    """
+
+    ## 0 - first version
+    _class_version = 0
+
+    def __init__(self):
+        ## archive session the snapshot is based on
+        self.sessionDay: datetime.date = None
+        ## key: ISIN
+        self.entries: Dict[ str, InstrumentEntry ] = {}
+
+        self._nameToIsin: Dict[ str, str ]   = {}
+        self._tickerToIsin: Dict[ str, str ] = {}
+        ## names listed in recent session
+        self._sessionNames: Dict[ str, str ] = {}
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        ## indexes are rebuilt after load
+        del state["_nameToIsin"]
+        del state["_tickerToIsin"]
+        del state["_sessionNames"]
+        return state
+
+    def __setstate__(self, dict_):
+        super().__setstate__( dict_ )
+        self._rebuildIndex()
+
+    ## returns True if snapshot changed
+    def updateSession(self, sessionDay: datetime.date, nameIsinDict: Dict[ str, str ]) -> bool:
+        if nameIsinDict is None:
+            return False
+        if self.sessionDay is not None and sessionDay <= self.sessionDay:
+            return False
+        for name, isin in nameIsinDict.items():
+            entry = self.entries.get( isin )
+            if entry is None:
+                entry = InstrumentEntry( name, isin, sessionDay )
+                self.entries[ isin ] = entry
+            entry.name    = name
+            entry.lastDay = sessionDay
+        self.sessionDay = sessionDay
+        self._rebuildIndex()
+        return True
+
+    ## 'nameTickerDict' -- dict of pairs: (name, ticker)
+    ## returns True if snapshot changed
+    def updateTickers(self, nameTickerDict: Dict[ str, str ]) -> bool:
+        if nameTickerDict is None:
+            return False
+        changed = False
+        for name, ticker in nameTickerDict.items():
+            isin = self._nameToIsin.get( name )
+            if isin is None:
+                continue
+            entry = self.entries[ isin ]
+            if entry.ticker != ticker:
+                if entry.ticker is not None and self._tickerToIsin.get( entry.ticker ) == isin:
+                    del self._tickerToIsin[ entry.ticker ]
+                entry.ticker = ticker
+                self._tickerToIsin[ ticker ] = isin
+                changed = True
+        return changed
+
+    ## returns Dict[ name, isin ] of instruments listed in recent session
+    def getNameIsinDict(self) -> Dict[ str, str ]:
+        return dict( self._sessionNames )
+
+    def getEntry(self, isin) -> InstrumentEntry:
+        return self.entries.get( isin )
+
+    def getIsinFromName(self, name):
+        return self._nameToIsin.get( name )
+
+    def getIsinFromTicker(self, ticker):
+        return self._tickerToIsin.get( ticker )
+
+    def getNameFromIsin(self, isin):
+        entry = self.entries.get( isin )
+        if entry is None:
+            return None
+        return entry.name
+
+    def getTickerFromIsin(self, isin):
+        entry = self.entries.get( isin )
+        if entry is None:
+            return None
+        return entry.ticker
+
+    def getTickerFromName(self, name):
+        return self.getTickerFromIsin( self._nameToIsin.get( name ) )
+
+    def getNameFromTicker(self, ticker):
+        return self.getNameFromIsin( self._tickerToIsin.get( ticker ) )
+
+    def _rebuildIndex(self):
+        self._nameToIsin   = {}
+        self._tickerToIsin = {}
+        self._sessionNames = {}
+        for isin, entry in self.entries.items():
+            self._nameToIsin[ entry.name ] = isin
+            if entry.ticker is not None:
+                self._tickerToIsin[ entry.ticker ] = isin
+            if entry.lastDay == self.sessionDay:
+                self._sessionNames[ entry.name ] = isin
+
+
+class GpwInstrumentsProvider():
+    """Keeps persisted instruments snapshot up to date with archive.
+
+    Archive access (downloading and walking back through sheets) is serialized
+    by '_archiveLock'. Snapshot is modified and stored under separate '_stateLock',
+    so updating tickers does not wait for archive downloads.
+    """
+
+    def __init__(self, archiveData: GpwArchiveData = None, storagePath: str = None):
+        if archiveData is None:
+            archiveData = GpwArchiveData()
+        if storagePath is None:
+            storagePath = f"{TMP_DIR}data/gpw/instruments.pickle"
+        self.archiveData = archiveData
+        self.storagePath = storagePath
+        self.instruments: GpwInstruments = persist.load_object_simple( storagePath, None, silent=True )
+        if self.instruments is None:
+            self.instruments = GpwInstruments()
+        ## resolved valid days, key: requested day
+        self._validDays: Dict[ datetime.date, datetime.date ] = {}
+        self._stateLock = threading.RLock()
+
+    ## returns instruments snapshot for recent valid session before or equal given day
+    @synchronized( "_archiveLock" )
+    def getInstruments(self, day: datetime.date = None) -> GpwInstruments:
+        if day is None:
+            day = datetime.date.today() - datetime.timedelta(days=1)
+        validDay = self._getRecentValidDay( day )
+        self._refresh( validDay )
+        return self.instruments
+
+    ## returns Dict[ name, isin ] for recent valid session before or equal given day
+    @synchronized( "_archiveLock" )
+    def getISINForDate(self, day: datetime.date) -> Dict[ str, str ]:
+        validDay = self._getRecentValidDay( day )
+        self._refresh( validDay )
+        with self._stateLock:
+            if validDay is None or validDay == self.instruments.sessionDay:
+                return self.instruments.getNameIsinDict()
+        ## historical session
+        _LOGGER.info( "loading ISIN data for %s", validDay )
+        return self.archiveData.getData( StockDataType.ISIN, validDay )
+
+    ## does not access archive -- can be called from GUI thread
+    def updateTickers(self, nameTickerDict: Dict[ str, str ]):
+        with self._stateLock:
+            if self.instruments.updateTickers( nameTickerDict ):
+                self.store()
+
+    def store(self):
+        with self._stateLock:
+            persist.store_object_simple( self.instruments, self.storagePath )
+
+    ## resolving valid day walks back through archive sheets, so result is remembered
+    ## recent days are not remembered, because their archive can be not published yet
+    def _getRecentValidDay(self, day: datetime.date) -> datetime.date:
+        validDay = self._validDays.get( day )
+        if validDay is not None:
+            return validDay
+        validDay = self.archiveData.getRecentValidDay( day )
+        if validDay is None:
+            return None
+        recentDay = datetime.date.today() - datetime.timedelta(days=1)
+        if validDay == day or day < recentDay:
+            self._validDays[ day ] = validDay
+        return validDay
+
+    ## archive is loaded without holding '_stateLock', the lock is taken only to update snapshot
+    def _refresh(self, validDay: datetime.date):
+        if validDay is None:
+            return
+        with self._stateLock:
+            sessionDay = self.instruments.sessionDay
+        if sessionDay is not None and validDay <= sessionDay:
+            return
+        _LOGGER.info( "loading instruments of session %s", validDay )
+        nameIsinDict = self.archiveData.getData( StockDataType.ISIN, validDay )
+        with self._stateLock:
+            if self.instruments.updateSession( validDay, nameIsinDict ):
+                self.store()
+
+
+## ==============================================================
+
+
+_PROVIDER_MUTEX = threading.Lock()
+_PROVIDER: GpwInstrumentsProvider = None
+
+
+## returns provider shared by analysis and GUI
+def get_instruments_provider() -> GpwInstrumentsProvider:
+    # pylint: disable=W0603
+    global _PROVIDER
+    with _PROVIDER_MUTEX:
+        if _PROVIDER is None:
+            _PROVIDER = GpwInstrumentsProvider()
+        return _PROVIDER
@@ -26,6 +26,7 @@ import datetime
 import math
 import multiprocessing.pool
 import abc
+from typing import List
 
 import pandas
 
@@ -34,11 +35,12 @@ from stockdataaccess.dataaccess import TMP_DIR
 from stockdataaccess.dataaccess.datatype import StockDataType
 from stockdataaccess.dataaccess.gpw.gpwintradaydata import GpwCurrentStockIntradayData
 from stockdataaccess.dataaccess.metastockdata import MetaStockIntradayData
+from stockdataaccess.dataaccess.gpw.gpwinstruments import get_instruments_provider
 
 from stockmonitor.analysis import write_to_csv
 from stockmonitor.analysis.stockanalysisdata import VarCalc, SourceDataLoader, StatsDict
-from stockmonitor.analysis.stockanalysisdata import StockAnalysisData
 from stockmonitor.analysis.stockanalysis import dates_to_string
+from stockmonitor.analysis.analysisjob import AnalysisJob, job_step
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -177,6 +179,8 @@ class ActivityAnalysis:
         if pool is None:
             pool = multiprocessing.dummy.Pool( 6 )
         self.pool           = pool
+        ## reports progress and allows to cancel calculation
+        self.job: AnalysisJob = None
 
     # pylint: disable=R0914
     def calcActivity( self, fromDay: datetime.date, toDay: datetime.date, thresholdPercent,
@@ -192,13 +196,16 @@ class ActivityAnalysis:
 
         # === load precalculated data ===
 
-        precalc_data_list = []
+        daysNum = (toDay - fromDay).days + 1
+        precalc_data_list: List[tuple] = []
         currDate = fromDay
         currDate -= datetime.timedelta(days=1)
         while currDate < toDay:
             currDate += datetime.timedelta(days=1)
+            job_step( self.job, len( precalc_data_list ), daysNum )
             dataTuple  = self.getPrecalcData( currDate )
             precalc_data_list.append( dataTuple )
+        job_step( self.job, daysNum, daysNum )
 
         # === calculate activity ===
 
@@ -438,8 +445,8 @@ class ActivityAnalysis:
 
     ## returns Dict[ name, isin ]
     def getISINForDate( self, toDay ):
-        dataProvider = StockAnalysisData()
-        return dataProvider.getISINForDate( toDay )
+        instrumentsProvider = get_instruments_provider()
+        return instrumentsProvider.getISINForDate( toDay )
 
 #     def getCurrent( self ):
 #         dataProvider = StockAnalysisData()
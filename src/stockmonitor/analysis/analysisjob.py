@@ -0,0 +1,146 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import threading
+from typing import Dict, List, Callable, Tuple, Any
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AnalysisCancelledError( Exception ):
+    """Raised inside analysis when job was cancelled."""
+
+
+class AnalysisJob():
+    """Cancellable analysis job reporting progress.
+
+    Analysis code calls 'step()' between processed items (e.g. days).
+    Cancellation is cooperative: 'step()' raises AnalysisCancelledError
+    when 'cancel()' was requested.
+    Many callers can wait for the same job -- each of them 'attach()' own callbacks.
+    """
+
+    def __init__(self, key=None, registry: 'AnalysisJobRegistry' = None):
+        self.key = key
+        self.registry = registry
+        ## callables receiving pair: (done, total)
+        self._progressCallbacks: List[ Callable[ [int, int], None ] ] = []
+        ## callables receiving pair: (job, result)
+        self._finishCallbacks: List[ Callable[ ['AnalysisJob', Any], None ] ] = []
+        self._result = None
+        self._mutex = threading.Lock()
+        self._cancelEvent = threading.Event()
+        self._finishEvent = threading.Event()
+
+    ## 'finishCallback' receives pair: (job, result), result is None if job was cancelled or failed
+    ## if job is already finished then 'finishCallback' is called immediately
+    def attach(self, progressCallback=None, finishCallback=None):
+        with self._mutex:
+            if progressCallback is not None:
+                self._progressCallbacks.append( progressCallback )
+            if finishCallback is None:
+                return
+            finished = self._finishEvent.is_set()
+            if finished is False:
+                self._finishCallbacks.append( finishCallback )
+            result = self._result
+        if finished:
+            finishCallback( self, result )
+
+    def cancel(self):
+        self._cancelEvent.set()
+
+    def isCancelled(self):
+        return self._cancelEvent.is_set()
+
+    def isFinished(self):
+        return self._finishEvent.is_set()
+
+    def step(self, done, total):
+        if self.isCancelled():
+            raise AnalysisCancelledError( f"job cancelled: {self.key}" )
+        for callback in list( self._progressCallbacks ):
+            callback( done, total )
+
+    ## execute function, returns function result or None if job was cancelled
+    ## result is passed to all attached finish callbacks
+    def run(self, function, *args):
+        result = None
+        try:
+            result = function( *args )
+        except AnalysisCancelledError:
+            _LOGGER.info( "job cancelled: %s", self.key )
+        finally:
+            if self.registry is not None:
+                self.registry.release( self )
+            self._finish( result )
+        return result
+
+    def _finish(self, result):
+        with self._mutex:
+            self._result = result
+            self._finishEvent.set()
+            callbacks = list( self._finishCallbacks )
+        for callback in callbacks:
+            callback( self, result )
+
+
+class AnalysisJobRegistry():
+    """Jobs in progress, prevents calculating the same request many times."""
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._jobs: Dict[ object, AnalysisJob ] = {}
+
+    ## returns pair: (job, created)
+    ## if identical job is in progress then it is returned with 'created' equal False,
+    ## caller should 'attach()' to it instead of starting new calculation
+    def acquire(self, key) -> Tuple[ AnalysisJob, bool ]:
+        with self._mutex:
+            job = self._jobs.get( key )
+            if job is not None and job.isCancelled() is False:
+                return ( job, False )
+            job = AnalysisJob( key, self )
+            self._jobs[ key ] = job
+            return ( job, True )
+
+    def release(self, job: AnalysisJob):
+        with self._mutex:
+            if self._jobs.get( job.key ) is job:
+                del self._jobs[ job.key ]
+
+    def get(self, key) -> AnalysisJob:
+        with self._mutex:
+            return self._jobs.get( key )
+
+
+## registry shared by analysis tools
+JOBS_REGISTRY = AnalysisJobRegistry()
+
+
+def job_step( job: AnalysisJob, done, total ):
+    if job is not None:
+        job.step( done, total )
@@ -27,7 +27,7 @@ import datetime
 import calendar
 import multiprocessing.dummy
 
-from typing import Dict, List
+from typing import List
 
 import csv
 import pandas
@@ -35,9 +35,10 @@ import pandas
 from stockdataaccess.dataaccess.datatype import StockDataType
 from stockdataaccess.dataaccess import TMP_DIR
 
-from stockmonitor.analysis.stockanalysisdata import CounterDict, StockDict, GpwCurrentIntradayDataLoader, \
+from stockmonitor.analysis.stockanalysisdata import StockDict, GpwCurrentIntradayDataLoader, \
     VarCalc
 from stockmonitor.analysis.stockanalysisdata import StockAnalysisData
+from stockmonitor.analysis.analysisjob import AnalysisJob, job_step
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -54,6 +55,8 @@ class StockAnalysis():
     def __init__(self):
         self.data: StockAnalysisData = StockAnalysisData()
         self.isinDict = None
+        ## reports progress and allows to cancel calculation
+        self.job: AnalysisJob = None
 
         self.minValue  = None
         self.minDate   = None
@@ -384,16 +387,20 @@ class StockAnalysis():
 
         self.logger.debug( "Found companies: %s", len(rowsList) )
 
-    def calcMonday(self, numOfWeeks=1, lastDay: datetime.date = datetime.date.today(), outFilePath=None):
+    ## 'percentiles' -- list of percentiles (0-100) of day change to add to results
+    def calcMonday(self, numOfWeeks=1, lastDay: datetime.date = datetime.date.today(), outFilePath=None,
+                   percentiles: List[int] = None):
         self.logger.info( "Calculating Monday stock" )
-        return self._calcDayOfWeek( 0, numOfWeeks, lastDay, outFilePath, True )
+        return self._calcDayOfWeek( 0, numOfWeeks, lastDay, outFilePath, True, percentiles=percentiles )
 
-    def calcFriday(self, numOfWeeks=1, lastDay: datetime.date = datetime.date.today(), outFilePath=None):
+    def calcFriday(self, numOfWeeks=1, lastDay: datetime.date = datetime.date.today(), outFilePath=None,
+                   percentiles: List[int] = None):
         self.logger.info( "Calculating Friday stock" )
-        return self._calcDayOfWeek( 4, numOfWeeks, lastDay, outFilePath, False )
+        return self._calcDayOfWeek( 4, numOfWeeks, lastDay, outFilePath, False, percentiles=percentiles )
 
     # pylint: disable=R0914
-    def calcWeekend(self, numOfWeeks=1, lastDay: datetime.date = datetime.date.today(), outFilePath=None):
+    def calcWeekend(self, numOfWeeks=1, lastDay: datetime.date = datetime.date.today(), outFilePath=None,
+                    percentiles: List[int] = None):
         file = outFilePath
         if file is None:
             file = TMP_DIR + "out/weekend_change.csv"
@@ -404,50 +411,49 @@ class StockAnalysis():
         weekDay = lastValid.weekday()                               # 0 for Monday
         lastMonday = lastValid - datetime.timedelta(days=weekDay)
 
+        prevDays = []
+        nextDays = []
+        counterMonday = lastMonday
+        for weekIndex in range(0, numOfWeeks):
+            job_step( self.job, weekIndex, numOfWeeks )
+            prevDays.append( self.getRecentValidDay(counterMonday) )
+            nextDays.append( self.getNextValidDay(counterMonday) )
+            ## preload data
+            self.data.getDayData( prevDays[-1] )
+            self.data.getDayData( nextDays[-1] )
+            counterMonday -= datetime.timedelta(days=7)
+        job_step( self.job, numOfWeeks, numOfWeeks )
+
+        prevPanel = self.data.getDataPanel( StockDataType.CLOSING, prevDays )
+        nextPanel = self.data.getDataPanel( StockDataType.CLOSING, nextDays )
+        statsFrame = calc_change_stats( prevPanel, nextPanel, percentiles, zeroRefRaise=True )
+
         with open(file, 'w', encoding="utf-8") as csv_file:
             writer = csv.writer( csv_file )
             writer.writerow( ["last monday:", str(lastMonday) ] )
             writer.writerow( ["num of weeks:", numOfWeeks ] )
             writer.writerow( [] )
 
-            columnsList = ["name", "friday val", "monday val", "potential", "accuracy", "link"]
-
-            raiseCounter = CounterDict()
-            counterMonday = lastMonday
-
-            for _ in range(0, numOfWeeks):
-                prevDay = self.getRecentValidDay(counterMonday)
-                nextDay = self.getNextValidDay(counterMonday)
-
-                ## calc
-                prevValue = self.data.getData( StockDataType.CLOSING, prevDay )
-                nextValue = self.data.getData( StockDataType.CLOSING, nextDay )
-
-                for key, nextVal in nextValue.items():
-                    prevVal = prevValue[ key ]
-                    diff = nextVal - prevVal
-                    if diff <= 0:
-                        continue
-                    raiseCounter.count( key )
-
-                counterMonday -= datetime.timedelta(days=7)
+            columnsList = ["name", "friday val", "monday val", "potential", "accuracy"]
+            percentileColumns = get_percentile_columns( percentiles )
+            columnsList.extend( percentileColumns )
+            columnsList.append( "link" )
 
             rowsList = []
 
-            prevDay = self.getRecentValidDay( lastMonday )
-            nextDay = self.getNextValidDay( lastMonday )
-            prevValue = self.data.getData( StockDataType.CLOSING, prevDay )
-            nextValue = self.data.getData( StockDataType.CLOSING, nextDay )
-
-            for key, val in raiseCounter.counter.items():
-                currAccuracy = val / numOfWeeks
-
-                prevVal = prevValue[ key ]
-                nextVal = nextValue[ key ]
-                diff = nextVal - prevVal
-                pot = diff / prevVal
+            statsFrame = statsFrame[ statsFrame["raise count"] > 0 ]
+            for key, stats in statsFrame.iterrows():
+                currAccuracy = stats["raise count"] / numOfWeeks
+                prevVal = get_panel_value( prevPanel, 0, key )
+                nextVal = get_panel_value( nextPanel, 0, key )
+                pot = 0.0
+                if prevVal != 0:
+                    pot = (nextVal - prevVal) / prevVal
                 moneyLink = self.getMoneyPlLink( key )
-                rowsList.append( [key, prevVal, nextVal, pot, currAccuracy, moneyLink] )
+                row = [key, prevVal, nextVal, pot, currAccuracy]
+                row.extend( round( stats[ col ], 4 ) for col in percentileColumns )
+                row.append( moneyLink )
+                rowsList.append( row )
 
             ## sort by accuracy, then by potential
             rowsList.sort(key=lambda x: (x[4], x[3]), reverse=True)
@@ -688,7 +694,7 @@ class StockAnalysis():
     # ==========================================================================
 
     def _calcDayOfWeek( self, numOfDay, numOfWeeks=1, lastDay: datetime.date = datetime.date.today(),
-                        outFilePath=None, validDirection=True ):
+                        outFilePath=None, validDirection=True, *, percentiles: List[int] = None ):
         # ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         dayName = calendar.day_name[ numOfDay ].lower()
         file = outFilePath
@@ -705,70 +711,55 @@ class StockAnalysis():
             lastValid -= datetime.timedelta(days=7)
         lastValid += datetime.timedelta(days=numOfDay)                  ## move to desired day
 
+        ## each week is represented by single valid day (holidays are skipped)
+        weekDays = []
+        counterDay = lastValid
+        for weekIndex in range(0, numOfWeeks):
+            job_step( self.job, weekIndex, numOfWeeks )
+            if validDirection:
+                weekDays.append( self.getNextValidDay( counterDay ) )
+            else:
+                weekDays.append( self.getRecentValidDay( counterDay, True ) )
+            ## preload data
+            self.data.getDayData( weekDays[-1] )
+            counterDay -= datetime.timedelta(days=7)
+        job_step( self.job, numOfWeeks, numOfWeeks )
+
+        openingPanel = self.data.getDataPanel( StockDataType.OPENING, weekDays )
+        closingPanel = self.data.getDataPanel( StockDataType.CLOSING, weekDays )
+        statsFrame = calc_change_stats( openingPanel, closingPanel, percentiles )
+
         with open(file, 'w', encoding="utf-8") as csv_file:
             writer = csv.writer( csv_file )
             writer.writerow( ["last " + dayName + ":", str(lastValid) ] )
             writer.writerow( ["num of weeks:", numOfWeeks ] )
             writer.writerow( [] )
 
-            columnsList = ["name", "opening val", "closing val", "potential", "potential avg", "accuracy", "link"]
-
-            raiseCounter: Dict[ str, int ]    = {}
-            potAvg: Dict[ str, List[float] ]  = {}
-            counterMonday = lastValid
-
-            for _ in range(0, numOfWeeks):
-                if validDirection:
-                    nextDay = self.getNextValidDay( counterMonday )
-                else:
-                    nextDay = self.getRecentValidDay( counterMonday, True )
-
-                ## calc
-                prevValue = self.data.getData( StockDataType.OPENING, nextDay )
-                nextValue = self.data.getData( StockDataType.CLOSING, nextDay )
-
-                for key, nextVal in nextValue.items():
-                    prevVal = prevValue[ key ]
-                    if prevVal == 0:
-                        continue
-                    diff = nextVal - prevVal
-                    if diff <= 0:
-                        continue
-                    raiseCounter[key] = raiseCounter.get( key, 0 ) + 1
-                    avgPair: List[ float ] = potAvg.get(key, [0, 0])
-                    avgPair[0] = avgPair[0] + diff / prevVal
-                    avgPair[1] = avgPair[1] + 1
-                    potAvg[ key ] = avgPair
-
-                counterMonday -= datetime.timedelta(days=7)
+            columnsList = ["name", "opening val", "closing val", "potential", "potential avg", "accuracy"]
+            percentileColumns = get_percentile_columns( percentiles )
+            columnsList.extend( percentileColumns )
+            columnsList.append( "link" )
 
             rowsList = []
 
-            if validDirection:
-                nextDay = self.getNextValidDay( lastValid )
-            else:
-                nextDay = self.getRecentValidDay( lastValid, True )
-
-            prevValue = self.data.getData( StockDataType.OPENING, nextDay )
-            nextValue = self.data.getData( StockDataType.CLOSING, nextDay )
-
-            for key, val in raiseCounter.items():
-                currAccuracy = val / numOfWeeks
+            statsFrame = statsFrame[ statsFrame["raise count"] > 0 ]
+            for key, stats in statsFrame.iterrows():
+                currAccuracy = stats["raise count"] / numOfWeeks
 
-                prevVal = prevValue.get( key, 0 )
-                nextVal = nextValue.get( key, 0 )
-                diff = nextVal - prevVal
+                prevVal = get_panel_value( openingPanel, 0, key )
+                nextVal = get_panel_value( closingPanel, 0, key )
                 pot = 0.0
                 if prevVal != 0:
-                    pot = diff / prevVal
-                avgPair = potAvg.get(key, [0, 0])
-                avgVal = avgPair[0] / avgPair[1]
+                    pot = (nextVal - prevVal) / prevVal
                 moneyLink = self.getMoneyPlLink( key )
 
                 pot    = round( pot, 4 )
-                avgVal = round( avgVal, 4 )
+                avgVal = round( stats["raise avg"], 4 )
 
-                rowsList.append( [key, prevVal, nextVal, pot, avgVal, currAccuracy, moneyLink] )
+                row = [key, prevVal, nextVal, pot, avgVal, currAccuracy]
+                row.extend( round( stats[ col ], 4 ) for col in percentileColumns )
+                row.append( moneyLink )
+                rowsList.append( row )
 
             ## sort by accuracy, then by potential
             rowsList.sort(key=lambda x: (x[5], x[3]), reverse=True)
@@ -792,3 +783,44 @@ def dates_to_string(datesList):
     for d in datesList:
         output += str(d) + " "
     return output
+
+
+def get_percentile_columns( percentiles: List[int] = None ) -> List[str]:
+    if not percentiles:
+        return []
+    return [ f"change p{perc}" for perc in percentiles ]
+
+
+def get_panel_value( panel: pandas.DataFrame, rowIndex, name ):
+    if name not in panel.columns:
+        return 0
+    value = panel[ name ].iloc[ rowIndex ]
+    if pandas.isna( value ):
+        return 0
+    return value
+
+
+## calculate change statistics of given panels (rows are periods, columns are stock names)
+## change is calculated as: (value - reference) / reference
+## returns DataFrame indexed by stock name with columns:
+##     'raise count' -- number of periods with positive change
+##     'raise avg'   -- average of positive changes
+##     'change pXX'  -- percentiles of changes over all periods
+## 'zeroRefRaise' -- count raise also for zero reference (change of such period is undefined)
+def calc_change_stats( refPanel: pandas.DataFrame, valPanel: pandas.DataFrame,
+                       percentiles: List[int] = None, *, zeroRefRaise=False ) -> pandas.DataFrame:
+    ## periods are matched by position, not by date
+    refData = refPanel.reset_index( drop=True )
+    valData = valPanel.reset_index( drop=True )
+    refData, valData = refData.align( valData )
+    raised = valData > refData
+    if zeroRefRaise is False:
+        raised = raised & ( refData != 0 )
+    change = (valData - refData) / refData.where( refData != 0 )
+
+    statsFrame = pandas.DataFrame( index=change.columns )
+    statsFrame["raise count"] = raised.sum()
+    statsFrame["raise avg"]   = change.where( raised ).mean()
+    for perc, colName in zip( percentiles or [], get_percentile_columns( percentiles ) ):
+        statsFrame[ colName ] = change.quantile( perc / 100.0 )
+    return statsFrame
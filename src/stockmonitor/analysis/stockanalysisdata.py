@@ -27,10 +27,15 @@ from datetime import date
 import urllib
 import math
 import abc
+import collections
+from typing import Dict, List, Tuple, Callable, OrderedDict
+
 import pandas
 
 from stockdataaccess.dataaccess.datatype import StockDataType
 from stockdataaccess.dataaccess.gpw.gpwarchivedata import GpwArchiveData
+from stockdataaccess.dataaccess.gpw.gpwarchiveseries import GpwArchiveSeries, get_archive_series
+from stockdataaccess.dataaccess.gpw.gpwinstruments import get_instruments_provider
 from stockdataaccess.dataaccess.gpw.gpwintradaydata import GpwCurrentStockIntradayData
 
 
@@ -40,12 +45,64 @@ _LOGGER = logging.getLogger(__name__)
 class StockAnalysisData():
     """Abstraction for stock data."""
 
+    ## data types stored in days cache
+    PANEL_TYPES = [ StockDataType.OPENING, StockDataType.MAX, StockDataType.MIN,
+                    StockDataType.CLOSING, StockDataType.VOLUME ]
+
+    ## max number of days kept in days cache
+    DAYS_CACHE_SIZE = 512
+
     def __init__(self):
         self.dataProvider: GpwArchiveData = GpwArchiveData()
+        ## archive data of past days does not change, so it is safe to keep it
+        ## least recently used days are dropped above DAYS_CACHE_SIZE
+        self.daysCache: OrderedDict[ date, pandas.DataFrame ] = collections.OrderedDict()
+        self.archiveSeries: GpwArchiveSeries = get_archive_series()
 
     def getData(self, dataType: StockDataType, day: date):
         return self.dataProvider.getData( dataType, day )
 
+    ## returns DataFrame indexed by stock name with columns of PANEL_TYPES
+    def getDayData(self, day: date) -> pandas.DataFrame:
+        if day is None:
+            return None
+        dayData = self.daysCache.get( day )
+        if dayData is not None:
+            self.daysCache.move_to_end( day )
+            return dayData
+        dayData = self.dataProvider.getDataColumns( self.PANEL_TYPES, day )
+        if dayData is None:
+            return None
+        self.updateArchiveSeries( day )
+        self.daysCache[ day ] = dayData
+        while len( self.daysCache ) > self.DAYS_CACHE_SIZE:
+            self.daysCache.popitem( last=False )
+        return dayData
+
+    ## returns DataFrame with days as index and stock names as columns
+    ## days without data are represented by NaN rows
+    def getDataPanel(self, dataType: StockDataType, days: List[date]) -> pandas.DataFrame:
+        rowsList = []
+        for day in days:
+            dayData = self.getDayData( day )
+            if dayData is None:
+                rowsList.append( pandas.Series( dtype=float ) )
+                continue
+            rowsList.append( dayData[ dataType ] )
+        return pandas.DataFrame( rowsList, index=days )
+
+    ## archive of given day was loaded -- extend per instrument series up to the day
+    ## series are only extended forward, so loading of older days does not change them
+    ## returns number of ingested days
+    def updateArchiveSeries(self, day: date) -> int:
+        if self.archiveSeries is None:
+            return 0
+        lastDay = self.archiveSeries.getLastDay()
+        if lastDay is not None and day <= lastDay:
+            return 0
+        fromDay = day if lastDay is None else lastDay + datetime.timedelta(days=1)
+        return self.archiveSeries.update( fromDay, day )
+
     def getRecentValidDay(self, day: date ) -> datetime.date:
         return self.dataProvider.getRecentValidDay( day )
 
@@ -58,9 +115,8 @@ class StockAnalysisData():
 
     ## returns Dict[ name, isin ]
     def getISINForDate(self, day: date) -> dict:
-        validDay = self.getRecentValidDay( day )
-        _LOGGER.info("loading recent ISIN data for %s", validDay )
-        return self.dataProvider.getData( StockDataType.ISIN, validDay )
+        instrumentsProvider = get_instruments_provider()
+        return instrumentsProvider.getISINForDate( day )
 
     def sourceLink(self):
         return self.dataProvider.sourceLink()
@@ -443,10 +499,14 @@ class GpwCurrentIntradayDataLoader( DataProcessor ):
 
 class VarCalc():
 
+    ## dict: metric name -> calculation function
+    METRICS: Dict[ str, Callable ] = {}
+
     def __init__(self, day):
         self.day   = day
         self.func  = None
         self.cName = None
+        self.metrics: List[ Tuple[str, str] ] = []
 
     def load(self, isinList, pool):
         self.func  = VarCalc.calcChange1
@@ -477,28 +537,60 @@ class VarCalc():
         self.cName = colName
         return pool.map( self._calc, isinList )
 
-    def _calc(self, isin):
-        for _ in range(0, 3):
-            try:
-                return self._calcSingle( isin )
-            except urllib.error.URLError as e:
-                _LOGGER.info( "exception: %s", str(e) )
-        return self._calcSingle( isin )
+    ## calculate many metrics in one pass -- intraday data of each stock is loaded only once
+    ## 'metrics' is list of pairs: (metric name, column name), valid metric names are keys of 'METRICS'
+    ## returns DataFrame indexed by stock name with column for each metric (named "<metric> <column>")
+    def calculateMetrics(self, metrics: List[ Tuple[str, str] ], isinList, pool) -> pandas.DataFrame:
+        for metricName, _ in metrics:
+            if metricName not in VarCalc.METRICS:
+                raise ValueError( f"unknown metric: {metricName}" )
+        self.metrics = metrics
+        results = pool.map( self._calcMetrics, isinList )
+        columnsList = [ f"{metricName} {colName}" for metricName, colName in metrics ]
+        namesList   = [ item[0] for item in results ]
+        valuesList  = [ item[1] for item in results ]
+        return pandas.DataFrame( valuesList, index=namesList, columns=columnsList )
 
-    def _calcSingle(self, key):
-        name, isin = key
-        intradayData = GpwCurrentStockIntradayData( isin )
-        dataFrame    = intradayData.getWorksheetForDate( self.day )
+    def _calc(self, isin):
+        name, _ = isin
+        dataFrame = self._loadWorksheetRetry( isin )
         if dataFrame is None:
             ## no data
             return (name, 0)
-
         dataColumn = dataFrame[ self.cName ]
         value = self.func( dataColumn )
         if math.isnan(value):
             return (name, 0)
         return (name, value)
 
+    def _calcMetrics(self, isin):
+        name, _ = isin
+        dataFrame = self._loadWorksheetRetry( isin )
+        if dataFrame is None:
+            ## no data
+            return (name, [0] * len( self.metrics ))
+        values = []
+        for metricName, colName in self.metrics:
+            func  = VarCalc.METRICS[ metricName ]
+            value = func( dataFrame[ colName ] )
+            if math.isnan(value):
+                value = 0
+            values.append( value )
+        return (name, values)
+
+    def _loadWorksheetRetry(self, isin):
+        for _ in range(0, 3):
+            try:
+                return self._loadWorksheet( isin )
+            except urllib.error.URLError as e:
+                _LOGGER.info( "exception: %s", str(e) )
+        return self._loadWorksheet( isin )
+
+    def _loadWorksheet(self, key):
+        _, isin = key
+        intradayData = GpwCurrentStockIntradayData( isin )
+        return intradayData.getWorksheetForDate( self.day )
+
     @staticmethod
     def calcActivity(dataColumn):
         if dataColumn.count() < 2:
@@ -611,3 +703,12 @@ class VarCalc():
         if dataColumn.count() < 1:
             return 0.0
         return dataColumn.sum()
+
+
+## metrics available in 'VarCalc.calculateMetrics()'
+VarCalc.METRICS = { "activity": VarCalc.calcActivity,
+                    "change1":  VarCalc.calcChange1,
+                    "change2":  VarCalc.calcChange2,
+                    "stddev":   VarCalc.calcStdDev,
+                    "var":      VarCalc.calcVar,
+                    "sum":      VarCalc.calcSum }
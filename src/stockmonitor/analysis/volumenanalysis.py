@@ -24,6 +24,7 @@
 import logging
 import datetime
 import multiprocessing.dummy
+from typing import List
 
 import pandas
 
@@ -31,11 +32,12 @@ from stockdataaccess import persist
 from stockdataaccess.dataaccess import TMP_DIR
 from stockdataaccess.dataaccess.gpw.gpwintradaydata import GpwCurrentStockIntradayData
 from stockdataaccess.dataaccess.metastockdata import MetaStockIntradayData
+from stockdataaccess.dataaccess.gpw.gpwinstruments import get_instruments_provider
 
 from stockmonitor.analysis import write_to_csv
 from stockmonitor.analysis.stockanalysisdata import VarCalc, SourceDataLoader, StatsDict
-from stockmonitor.analysis.stockanalysisdata import StockAnalysisData
 from stockmonitor.analysis.stockanalysis import dates_to_string
+from stockmonitor.analysis.analysisjob import AnalysisJob, job_step
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -139,6 +141,8 @@ class VolumenAnalysis:
         if pool is None:
             pool = multiprocessing.dummy.Pool( 6 )
         self.pool           = pool
+        ## reports progress and allows to cancel calculation
+        self.job: AnalysisJob = None
 
     # pylint: disable=R0914
     def calcVolumen( self, fromDay: datetime.date, toDay: datetime.date,
@@ -153,10 +157,12 @@ class VolumenAnalysis:
 
         # === load precalculated data ===
 
-        dataPairList = []
+        daysNum = (toDay - fromDay).days + 1
+        dataPairList: List[tuple] = []
         currDate = fromDay
 #         currDate -= datetime.timedelta( 1 )
         while currDate < toDay:
+            job_step( self.job, len( dataPairList ), daysNum )
             dayPair = self.getPrecalcData( currDate )
             dataPairList.append( dayPair )
             currDate += datetime.timedelta(days=1)
@@ -165,7 +171,9 @@ class VolumenAnalysis:
 #             dayDict["ATLANTIS"].printData()
 #                 #print( "aaaa:", priceColumn, volumenColumn, volSum, tradingSum )
 
+        job_step( self.job, daysNum - 1, daysNum )
         lastDayTuple = self.getPrecalcData( currDate )
+        job_step( self.job, daysNum, daysNum )
 
         # === calculate volumen ===
 
@@ -314,8 +322,8 @@ class VolumenAnalysis:
 
     ## returns Dict[ name, isin ]
     def getISINForDate( self, toDay ):
-        dataProvider = StockAnalysisData()
-        return dataProvider.getISINForDate( toDay )
+        instrumentsProvider = get_instruments_provider()
+        return instrumentsProvider.getISINForDate( toDay )
 
 #     def getCurrent( self ):
 #         dataProvider = StockAnalysisData()
@@ -22,146 +22,160 @@
 #
 
 import logging
-import tempfile
+import io
 import codecs
 
 import pandas
 
-from stockdataaccess.dataaccess.convert import convert_float, convert_int, \
-    apply_on_column
-
 
 _LOGGER = logging.getLogger(__name__)
 
 
+## columns of export without commission fields
+MB_TRANSACTIONS_HEADER = [ "trans_time", "name", "stock_id", "k_s", "amount",
+                           "unit_price", "unit_currency", "price", "currency" ]
+
+## columns of export with commission fields
+MB_TRANSACTIONS_COMMISSION_HEADER = [ "trans_time", "name", "stock_id", "k_s", "amount",
+                                      "unit_price", "unit_currency", "commission_value", "commission_currency",
+                                      "price", "currency" ]
+
+MB_TRANSACTIONS_DTYPES = { "trans_time": str,
+                           "name": str,
+                           "stock_id": str,
+                           "k_s": str,
+                           "amount": "float64",                ## converted to int after removing empty values
+                           "unit_price": "float64",
+                           "unit_currency": str,
+                           "commission_value": "float64",
+                           "commission_currency": str,
+                           "price": "float64",
+                           "currency": str }
+
+
 def load_mb_transactions( filePath ):
     ## imported transaction values are not affected by broker's commission
     ## real sell profit is transaction value decreased by broker's commission
     ## real buy cost is transaction value increased by broker's commission
     ## broker commission: greater of 5PLN and 0.39%
 
+    with codecs.open(filePath, 'r', encoding='utf-8', errors='replace') as srcFile:
+        content = srcFile.read()
+
+    importedData, dataType = load_mb_transactions_data( content )
+    if importedData is None:
+        _LOGGER.warning( "unable to load transactions from file %s", filePath )
+    return ( importedData, dataType )
+
+
+## returns tuple: ( DataFrame, data type )
+## data type: 0 -- transactions history, 1 -- current transactions, -1 -- unable to load data
+def load_mb_transactions_data( content: str ):
     ##
-    ## find line in file and remove header information leaving raw data
+    ## find header line and remove header information leaving raw data
     ##
-    headerFound  = False
-    historyFound = False
-    currentFound = False
-    with tempfile.NamedTemporaryFile( mode='w+t' ) as tmpfile:
-        with codecs.open(filePath, 'r', encoding='utf-8', errors='replace') as srcFile:
-            for line in srcFile:
-                if headerFound:
-                    tmpfile.write(line)
-                elif "Czas transakcji" in line:
-                    headerFound = True
-                elif "Historia transakcji" in line:
-                    historyFound = True
-                elif "Transakcje bie" in line:
-                    currentFound = True
-        tmpfile.seek(0)
-
-        if headerFound is False:
-            _LOGGER.error("unable to find data header")
-            return ( None, -1 )
-
-        importedData = parse_mb_transactions_file( tmpfile )
-        ## print("importing:", importedData)
-
-    if historyFound:
+    headerPos = content.find( "Czas transakcji" )
+    if headerPos < 0:
+        _LOGGER.error("unable to find data header")
+        return ( None, -1 )
+
+    preamble = content[ :headerPos ]
+    dataPos  = content.find( "\n", headerPos )
+    rawData  = content[ dataPos + 1: ] if dataPos >= 0 else ""
+
+    if "Historia transakcji" in preamble:
         ## load history transactions
-        return ( importedData, 0 )
-    if currentFound:
+        dataType = 0
+    elif "Transakcje bie" in preamble:
         ## add transactions
-        return ( importedData, 1 )
-    # else
+        dataType = 1
+    else:
+        return ( None, -1 )
 
-    _LOGGER.warning( "unable to load transactions from file %s", filePath )
-    return ( None, -1 )
+    try:
+        importedData = parse_mb_transactions_data( rawData )
+    except ValueError:
+        _LOGGER.exception( "unable to parse transactions data" )
+        return ( None, -1 )
+    return ( importedData, dataType )
 
 
 def parse_mb_transactions_file( sourceFile ):
-    with fix_separator( sourceFile ) as tmpfile:
-#     with sourceFile as tmpfile:
-#         print( "file:\n" + tmpfile.read() )
-#         tmpfile.seek(0)
+    return parse_mb_transactions_data( sourceFile.read() )
 
-        columns = count_separator( tmpfile, ";" )
-        tmpfile.seek(0)
 
-        header = []
-        if columns == 8:
-            header = [ "trans_time", "name", "stock_id", "k_s", "amount",
-                       "unit_price", "unit_currency", "price", "currency" ]
-        elif columns == 10:
-            header = [ "trans_time", "name", "stock_id", "k_s", "amount",
-                       "unit_price", "unit_currency", "commission_value", "commission_currency", "price", "currency" ]
+def parse_mb_transactions_data( content: str ):
+    content = fix_separator( content )
 
-#         print( "header:", header, columns )
+    firstLine = next( ( line for line in content.splitlines() if line.strip() ), "" )
+    columns   = firstLine.count( ";" )
 
-        dataFrame = pandas.read_csv( tmpfile, names=header,
-                                     sep=r'[;\t]', decimal=',', thousands=' ', engine='python', encoding='utf_8' )
+    header = []
+    if columns == 8:
+        header = MB_TRANSACTIONS_HEADER
+    elif columns == 10:
+        header = MB_TRANSACTIONS_COMMISSION_HEADER
 
-#     print( "raw data:\n" + str( dataFrame ) )
+    dtypes = { col: MB_TRANSACTIONS_DTYPES[ col ] for col in header }
+    dataFrame = pandas.read_csv( io.StringIO( content ), names=header, dtype=dtypes,
+                                 sep=';', decimal=',', thousands=' ', engine='c' )
 
-    apply_on_column( dataFrame, 'name', str )
+    if "amount" in dataFrame.columns:
+        invalidAmount = dataFrame["amount"].isna()
+        if invalidAmount.any():
+            _LOGGER.warning( "skipping %s transactions without amount", invalidAmount.sum() )
+            dataFrame = dataFrame[ ~invalidAmount ].reset_index( drop=True )
+        dataFrame["amount"] = dataFrame["amount"].astype( "int64" )
+
+#     print( "raw data:\n" + str( dataFrame ) )
 
     #### fix names to match GPW names
     ## XTRADEBDM -> XTB
     ## CELONPHARMA -> CLNPHARMA
     dataFrame["name"].replace({"XTRADEBDM": "XTB", "CELONPHARMA": "CLNPHARMA"}, inplace=True)
 
-    apply_on_column( dataFrame, 'amount', convert_int )
-
-    apply_on_column( dataFrame, 'unit_price', convert_float )
-    apply_on_column( dataFrame, 'price', convert_float )
-
     return dataFrame
 
 
-def fix_separator( sourceFile ):
-    # pylint: disable=R1732
-    tmpfile = tempfile.NamedTemporaryFile( mode='w+t' )
-
-#     with codecs.open(sourceFilePath, 'r', encoding='utf-8', errors='replace') as srcFile:
-    for line in sourceFile:
-        colonsNum = line.count( "," )
-        if colonsNum == 10:
-            ## old -- without commission fields
-            ## example: 21.11.2020 11:22:33,ENTER,WWA-GPW,S,100,22,70,PLN,2 270,0,PLN
-            line = replace_nth( line, ",", ".", 9 )     ## decimal separator
-            line = replace_nth( line, ",", ".", 6 )     ## decimal separator
-            line = line.replace( ",", ";" )             ## set proper field separator
-            line = line.replace( ".", "," )             ## restore old decimal separator
-        elif colonsNum == 13:
-            ## new -- with commission fields
-            ## example: 18.10.2021 10:54:59,ENTER,WWA-GPW,K,120,12,30,PLN,5,76,PLN,1 476,0,PLN
-            line = replace_nth( line, ",", ".", 12 )    ## decimal separator
-            line = replace_nth( line, ",", ".", 9 )     ## decimal separator
-            line = replace_nth( line, ",", ".", 6 )     ## decimal separator
-            line = line.replace( ",", ";" )             ## set proper field separator
-            line = line.replace( ".", "," )             ## restore old decimal separator
-        tmpfile.write(line)
-
-    tmpfile.seek(0)
-    return tmpfile
-
-
-def count_separator( sourceFile, separator ):
-    for line in sourceFile:
-        return line.count( separator )
-    return 0
-
-
-## 'occurence' starts from 1
-def replace_nth(stringData, sub, repl, occurence):
-    find = stringData.find(sub)
-    # If find is not -1 we have found at least one match for the substring
-    i = find != -1
-    # loop util we find the nth or we find no match
-    while find != -1 and i != occurence:
-        # find + 1 means we start searching from after the last match
-        find = stringData.find(sub, find + 1)
-        i += 1
-    # If i is equal to n we found nth match so replace
-    if i == occurence:
-        return stringData[:find] + repl + stringData[find + len(sub):]
-    return stringData
+## convert content to ';' separated fields with ',' decimal separator and ' ' thousands separator
+def fix_separator( content: str ) -> str:
+    if "\t" in content:
+        content = content.replace( "\t", ";" )
+    if "\xa0" in content:
+        content = content.replace( "\xa0", " " )
+
+    firstLine = next( ( line for line in content.splitlines() if line.strip() ), "" )
+    if ";" in firstLine:
+        ## proper format -- nothing to fix
+        return content
+
+    lines = content.splitlines( keepends=True )
+    return "".join( fix_line_separator( line ) for line in lines )
+
+
+def fix_line_separator( line: str ) -> str:
+    fields = line.split( "," )
+    fieldsNum = len( fields )
+    if fieldsNum == 11:
+        ## old -- without commission fields
+        ## example: 21.11.2020 11:22:33,ENTER,WWA-GPW,S,100,22,70,PLN,2 270,0,PLN
+        fields[5:7]  = [ fields[5] + "," + fields[6] ]      ## unit price decimal separator
+        fields[7:9]  = [ fields[7] + "," + fields[8] ]      ## price decimal separator
+        return ";".join( fields )
+    if fieldsNum == 14:
+        ## new -- with commission fields
+        ## example: 18.10.2021 10:54:59,ENTER,WWA-GPW,K,120,12,30,PLN,5,76,PLN,1 476,0,PLN
+        fields[5:7]   = [ fields[5] + "," + fields[6] ]     ## unit price decimal separator
+        fields[7:9]   = [ fields[7] + "," + fields[8] ]     ## commission decimal separator
+        fields[9:11]  = [ fields[9] + "," + fields[10] ]    ## price decimal separator
+        return ";".join( fields )
+    return line
+
+
+## convert 'trans_time' column to list of 'datetime' objects ('None' for invalid values)
+def parse_transaction_times( timeColumn ):
+    ## 31.03.2020 13:21:44
+    times = pandas.to_datetime( timeColumn, format='%d.%m.%Y %H:%M:%S', errors='coerce' )
+    validMask = times.notna().tolist()
+    pyTimes   = times.dt.to_pydatetime()
+    return [ timeObj if valid else None for timeObj, valid in zip( pyTimes, validMask ) ]
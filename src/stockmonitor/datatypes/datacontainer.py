@@ -27,8 +27,8 @@ from typing import Dict, List, Tuple
 
 import datetime
 #from datetime import datetime, date, timedelta
-import functools
 
+import pandas
 from pandas.core.frame import DataFrame
 
 from stockdataaccess import persist
@@ -36,19 +36,20 @@ from stockdataaccess.dataaccess.datatype import StockDataType
 from stockdataaccess.dataaccess.gpw.gpwdata import GpwIndicatorsData
 from stockdataaccess.dataaccess.gpw.gpwcurrentdata import GpwCurrentStockData, GpwCurrentIndexesData
 from stockdataaccess.dataaccess.gpw.gpwespidata import GpwESPIData
-from stockdataaccess.dataaccess.gpw.gpwarchivedata import GpwArchiveData
 
 from stockdataaccess.dataaccess.dividendsdata import DividendsCalendarData
 from stockdataaccess.dataaccess.finreportscalendardata import PublishedFinRepsCalendarData, FinRepsCalendarData
 from stockdataaccess.dataaccess.globalindexesdata import GlobalIndexesData
 from stockdataaccess.dataaccess.shortsellingsdata import CurrentShortSellingsData, HistoryShortSellingsData
 
+from stockmonitor.dataaccess.transactionsloader import parse_transaction_times
 from stockmonitor.datatypes.datatypes import UserContainer, \
     FavData, WalletData, MarkersContainer, MarkerEntry
 from stockmonitor.datatypes.stocktypes import BaseWorksheetDAOProvider, GpwStockIntradayMap, \
     GpwIndexIntradayMap, StockDataProvider, StockDataWrapper
-from stockmonitor.datatypes.wallettypes import broker_commission, TransHistory, \
-    Transaction
+from stockmonitor.datatypes.wallettypes import TransHistory, Transaction, TransactionMatchMode
+from stockmonitor.datatypes.walletsnapshot import WalletSnapshot
+from stockmonitor.datatypes.walletgain import WalletGainHistory
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -80,6 +81,13 @@ class DataContainer():
         self.gpwCurrentShortSellingsData = CurrentShortSellingsData()
         self.gpwHistoryShortSellingsData = HistoryShortSellingsData()
 
+        self._walletSnapshot: WalletSnapshot = None
+        self._walletGainHistory: Dict[ TransactionMatchMode, WalletGainHistory ] = {}
+        ## rows of fav groups: group -> ( current data frame, group tickers, rows of group )
+        self._favStockCache: Dict[ str, Tuple[ DataFrame, Tuple[ str, ... ], DataFrame ] ] = {}
+        ## positions of rows in current data frame: ( current data frame, ticker -> rows positions )
+        self._tickerRows: Tuple[ DataFrame, Dict[ str, List[ int ] ] ] = None
+
 #         self.gpwIsinMap         = GpwIsinMapData()
 
     def store( self, outputDir ):
@@ -138,9 +146,38 @@ class DataContainer():
             allFavsSet |= set( favs )
         return allFavsSet
 
+    ## returns rows of current stock data (in order of data frame) of given fav group
+    ## result is cached until current data or group content change
     def getFavStock(self, favGroup):
         stockList = self.favs.getFavs( favGroup )
-        return self.gpwCurrentData.getStockData( stockList )
+        if stockList is None:
+            return None
+        dataFrame = self.gpwCurrentData.getWorksheetData()
+        if dataFrame is None:
+            return None
+        favsKey = tuple( stockList )
+        cachedData = self._favStockCache.get( favGroup )
+        if cachedData is not None and cachedData[0] is dataFrame and cachedData[1] == favsKey:
+            return cachedData[2]
+        tickerRows = self._getTickerRows( dataFrame )
+        positions = set()
+        for ticker in set( stockList ):
+            positions.update( tickerRows.get( ticker, [] ) )
+        favStock = dataFrame.take( sorted( positions ) )
+        self._favStockCache[ favGroup ] = ( dataFrame, favsKey, favStock )
+        return favStock
+
+    def _getTickerRows(self, dataFrame: DataFrame) -> Dict[ str, List[ int ] ]:
+        if self._tickerRows is not None and self._tickerRows[0] is dataFrame:
+            return self._tickerRows[1]
+        ## new data -- cached groups are outdated
+        self._favStockCache = {}
+        tickerIndex = GpwCurrentStockData.getColumnIndex( StockDataType.TICKER )
+        tickerRows: Dict[ str, List[ int ] ] = {}
+        for rowIndex, ticker in enumerate( dataFrame.iloc[ :, tickerIndex ] ):
+            tickerRows.setdefault( ticker, [] ).append( rowIndex )
+        self._tickerRows = ( dataFrame, tickerRows )
+        return tickerRows
 
     ## ======================================================================
 
@@ -241,35 +278,40 @@ class DataContainer():
 #         wallet: WalletData = self.wallet
         importWallet = WalletData()
 
-        for _, row in dataFrame.iterrows():
-            transTime   = row['trans_time']
-            stockName   = row['name']
-            oper        = row['k_s']
-            amount      = row['amount']
-            unit_price  = row['unit_price']
-            commission  = row.get('commission_value', 0.0)
-
-#             print("raw row:", transTime, stockName, oper, amount, unit_price)
-
-            dateObject = None
-            try:
-                ## 31.03.2020 13:21:44
-                dateObject = datetime.datetime.strptime(transTime, '%d.%m.%Y %H:%M:%S')
-            except ValueError:
-                dateObject = None
-
-            # gpwArchiveSource = GpwArchiveData()
-            # gpwArchiveSource.getTickerFromName()
+        ## 31.03.2020 13:21:44
+        transTimes = parse_transaction_times( dataFrame['trans_time'] )
 
+        ## resolve each stock name once
+        tickersDict = {}
+        for stockName in dataFrame['name'].unique():
             ticker = self.gpwCurrentData.getTickerFromName( stockName )
             if ticker is None:
                 _LOGGER.warning( "could not find stock ticker for name: >%s<", stockName )
+            tickersDict[ stockName ] = ticker
 
+        if 'commission_value' in dataFrame.columns:
+            commissions = dataFrame['commission_value'].tolist()
+        else:
+            commissions = [ 0.0 ] * len( dataFrame )
+
+        ## group transactions by stock
+        stockTransactions: Dict[ Tuple[str, str], List[ Transaction ] ] = {}
+        rowsData = zip( dataFrame['name'].tolist(), dataFrame['k_s'].tolist(), dataFrame['amount'].tolist(),
+                        dataFrame['unit_price'].tolist(), transTimes, commissions )
+        for stockName, oper, amount, unit_price, dateObject, commission in rowsData:
+#             print("raw row:", dateObject, stockName, oper, amount, unit_price)
             if oper == "K":
-                importWallet.addTransaction( stockName, ticker,  amount, unit_price, dateObject, commission, False )
-
+                pass
             elif oper == "S":
-                importWallet.addTransaction( stockName, ticker, -amount, unit_price, dateObject, commission, False )
+                amount = -amount
+            else:
+                continue
+            stockId = ( stockName, tickersDict[ stockName ] )
+            transList = stockTransactions.setdefault( stockId, [] )
+            transList.append( Transaction( amount, unit_price, commission, dateObject ) )
+
+        for stockId, transList in stockTransactions.items():
+            importWallet.addTransactionsList( stockId, transList, False )
 
         if addTransactions:
             ## merge wallets
@@ -331,332 +373,26 @@ class DataContainer():
     ## ======================================================================
 
     # pylint: disable=R0914
-    def getWalletStock(self, show_soldout=True) -> DataFrame:
-        columnsList = [ "Nazwa", "Ticker", "Liczba", "Średni kurs nabycia",
-                        "Kurs",
-                        "Zm.do k.odn.[%]", "Zm.do k.odn.[PLN]",
-                        "Wartość [PLN]", "Udział [%]",
-                        "Zysk [%]", "Zysk [PLN]", "Zysk całkowity [PLN]" ]
-
-        # apply_on_column( dataFrame, 'Zm.do k.odn.(%)', convert_float )
-
-        walletState = self.getWalletState()
-        walletValue = walletState[0]
-
-        currentStock: GpwCurrentStockData = self.gpwCurrentSource.stockData
+    ## returns snapshot of wallet for current stock prices
+    ## snapshot is recalculated only if wallet, match mode or current stock data changed
+    def getWalletSnapshot(self) -> WalletSnapshot:
+        transMode    = self.userContainer.transactionsMatchMode
+        currentStock = self.gpwCurrentData
+        snapshot     = self._walletSnapshot
+        if snapshot is not None and snapshot.isValid( self.wallet, transMode, currentStock ):
+            return snapshot
+        snapshot = WalletSnapshot( self.wallet, transMode, currentStock )
+        self._walletSnapshot = snapshot
+        return snapshot
 
-        dataChangeIndex = currentStock.getDataColumnIndex( StockDataType.CHANGE_TO_REF )
-
-        rowsList = []
-
-        transMode = self.userContainer.transactionsMatchMode
-
-        for stock_id, transactions in self.wallet.stockData().items():
-            stock_name: str = stock_id[0] if stock_id else None
-            ticker: str     = stock_id[1] if stock_id else None
-
-            amount, buy_unit_price = transactions.currentTransactionsAvg( transMode )
-            if show_soldout is False and amount < 1:
-                continue
-
-            currentStockRow = currentStock.getRowByTicker( ticker )
-
-            if not ticker:
-                ticker = ""
-
-            currUnitValue = 0.0
-            sellValue = 0.0
-            currChangePnt = 0.0
-            valueChange = 0.0
-            participation = 0.0
-            profit = 0.0
-            profitPnt = 0.0
-
-            buyValue = buy_unit_price * amount
-
-            if not (currentStockRow is None or currentStockRow.empty):
-                # stock rate found
-                currUnitValue = GpwCurrentStockData.unitPrice( currentStockRow )
-
-                currChangeRaw = currentStockRow.iloc[ dataChangeIndex ]
-                currChangePnt = 0.0
-                if currChangeRaw != "-":
-                    currChangePnt = float( currChangeRaw )
-
-                sellValue = currUnitValue * amount                 ## amount is positive
-                if amount > 0:
-                    ## ( curr_unit_price - ref_unit_price ) * unit_price * amount
-                    valueChange = currChangePnt / 100.0 * sellValue
-                    sellValue -= broker_commission( sellValue )
-
-                if walletValue > 0:
-                    participation = sellValue / walletValue * 100.0
-
-                profit    = sellValue - buyValue
-                profitPnt = 0.0
-                if buyValue != 0:
-                    profitPnt = profit / buyValue * 100.0
-
-            totalProfit = transactions.transactionsOverallProfit() + sellValue
-            totalProfit = round( totalProfit, 2 )
-
-            buy_unit_price = round( buy_unit_price, 4 )
-            currUnitValue = round( currUnitValue, 2 )
-            currChangePnt = round( currChangePnt, 2 )
-            valueChange = round( valueChange, 2 )
-            sellValue = round( sellValue, 2 )
-            participation = round( participation, 2 )
-            profitPnt = round( profitPnt, 2 )
-            profit = round( profit, 2 )
-
-            row_buy_unit_price = ""
-            row_currUnitValue = ""
-            row_currChangePnt = ""
-            row_valueChange = ""
-            row_sellValue = ""
-            row_participation = ""
-            row_profitPnt = ""
-            row_profit = ""
-
-            if not (currentStockRow is None or currentStockRow.empty):
-                ## stock rate found
-                if amount > 0:
-                    ## stock in wallet (not sold out)
-                    row_buy_unit_price = buy_unit_price         # type: ignore
-                    row_currUnitValue = currUnitValue           # type: ignore
-                    row_currChangePnt = currChangePnt           # type: ignore
-                    row_valueChange = valueChange               # type: ignore
-                    row_sellValue = sellValue                   # type: ignore
-                    row_participation = participation           # type: ignore
-                    row_profitPnt = profitPnt                   # type: ignore
-                    row_profit = profit                         # type: ignore
-                else:
-                    ## sold out
-                    row_currUnitValue = currUnitValue           # type: ignore
-                    row_currChangePnt = currChangePnt           # type: ignore
-            else:
-                ## stock not found
-                if amount > 0:
-                    ## stock in wallet (not sold out)
-                    row_buy_unit_price = buy_unit_price         # type: ignore
-                else:
-                    ## sold out
-                    pass
-
-            rowDict = {}
-            rowDict[ columnsList[ 0] ] = stock_name
-            rowDict[ columnsList[ 1] ] = ticker
-            rowDict[ columnsList[ 2] ] = amount                             ## liczba
-            rowDict[ columnsList[ 3] ] = row_buy_unit_price                 ## sredni kurs nabycia
-            rowDict[ columnsList[ 4] ] = row_currUnitValue                  ## kurs
-            rowDict[ columnsList[ 5] ] = row_currChangePnt                  ## zm. kur. odn %
-            rowDict[ columnsList[ 6] ] = row_valueChange                    ## zm. kur. odn. PLN
-            rowDict[ columnsList[ 7] ] = row_sellValue                      ## wartosc
-            rowDict[ columnsList[ 8] ] = row_participation                  ## udzial
-            rowDict[ columnsList[ 9] ] = row_profitPnt                      ## zysk %
-            rowDict[ columnsList[10] ] = row_profit                         ## zysk PLN
-            rowDict[ columnsList[11] ] = totalProfit                        ## zysk calk.
-            rowsList.append( rowDict )
-
-        def compare_float( value_a, value_b ):
-            if isinstance(value_a, str):
-                value_a = -float("inf")
-            if isinstance(value_b, str):
-                value_b = -float("inf")
-
-            if value_a < value_b:
-                return -1
-            if value_a > value_b:
-                return 1
-            return 0
-
-        def sort_wallet_profit(item_a, item_b):
-            value_a = item_a[columnsList[9]]
-            value_b = item_b[columnsList[9]]
-            cmp = compare_float( value_a, value_b )
-            if cmp != 0:
-                return cmp
-            value_a = item_a[columnsList[11]]
-            value_b = item_b[columnsList[11]]
-            return compare_float( value_a, value_b )
-
-        rowsList.sort( key=functools.cmp_to_key(sort_wallet_profit), reverse=True )           # sort
-        #rowsList.sort( key=lambda x: (not isinstance(x, str), x[columnsList[9]]) )           # sort
-
-        dataFrame = DataFrame( rowsList )
-        return dataFrame
+    def getWalletStock(self, show_soldout=True) -> DataFrame:
+        return self.getWalletSnapshot().getWalletStock( show_soldout )
 
-    # pylint: disable=R0914
     def getWalletBuyTransactions(self, groupByDay=False, sort_data=False) -> DataFrame:
-        columnsList = [ "Nazwa", "Ticker", "Liczba", "Kurs kupna", "Opłata", "Wartość K",
-                        "Kurs aktualny",
-                        "Zysk", "Zysk %", "Data transakcji" ]
-
-        currentStock: GpwCurrentStockData = self.gpwCurrentSource.stockData
-
-        rowsList = []
-
-        transMode = self.userContainer.transactionsMatchMode
-
-        stock_id: Tuple[ str, str ]
-        transactions: TransHistory
-        for stock_id, transactions in self.wallet.stockData().items():
-            stock_name: str = stock_id[0] if stock_id else None
-            ticker: str     = stock_id[1] if stock_id else None
-
-            currTransactions = transactions.currentTransactions( transMode )
-            if groupByDay:
-                currTransactions = TransHistory.groupTransactionsByDay( currTransactions )
-
-            if not currTransactions:
-                # all stock sold out
-                continue
-
-            stock_unit_value = None
-            currentStockRow = currentStock.getRowByTicker( ticker )
-            if currentStockRow is None or currentStockRow.empty:
-                _LOGGER.info( "could not find stock by ticker: %s name: %s", ticker, stock_name )
-            else:
-                stock_unit_value = GpwCurrentStockData.unitPrice( currentStockRow )
-
-            if not ticker:
-                ticker = ""
-
-            for item in currTransactions:
-                trans_amount     = item.amount
-                trans_unit_price = item.unitPrice
-                trans_commission = round( item.commission, 2 )
-                trans_date       = item.transTime
-                buy_value        = trans_amount * trans_unit_price
-
-                currUnitValue = stock_unit_value
-                if currUnitValue:
-                    currValue = currUnitValue * trans_amount
-                    profit    = currValue - buy_value
-                    profitPnt = 0.0
-                    if buy_value != 0:
-                        profitPnt = profit / buy_value * 100.0
-                    profitPnt      = round( profitPnt, 2 )
-                    profit         = round( profit, 2 )
-                else:
-                    currUnitValue = "-"
-                    currValue = "-"
-                    profit = "-"
-                    profitPnt = "-"             # type: ignore
-
-                trans_unit_price = round( trans_unit_price, 4 )
-                buy_value = round( buy_value, 2 )
-
-                rowsList.append( [ stock_name, ticker, trans_amount, trans_unit_price, trans_commission,
-                                   buy_value, currUnitValue,
-                                   profit, profitPnt, trans_date ] )
-
-        if sort_data:
-            def compare_raw( value_a, value_b ):
-                if value_a < value_b:
-                    return 1
-                if value_a > value_b:
-                    return -1
-                return 0
-
-            def sort_buy_trans(item_a, item_b):
-                value_a = item_a[0]
-                value_b = item_b[0]
-                cmp = compare_raw( value_a, value_b )
-                if cmp != 0:
-                    return cmp
-                value_a = item_a[-1]
-                value_b = item_b[-1]
-                return compare_raw( value_a, value_b )
-
-            rowsList.sort( key=functools.cmp_to_key(sort_buy_trans), reverse=True )           # sort
-
-        dataFrame = DataFrame.from_records( rowsList, columns=columnsList )
-        return dataFrame
+        return self.getWalletSnapshot().getWalletBuyTransactions( groupByDay, sort_data )
 
     def getWalletSellTransactions(self, groupByDay=False) -> DataFrame:
-        columnsList = [ "Nazwa", "Ticker", "Liczba",
-                        "Kurs K", "Kurs S", "Wartość K", "Wartość S",
-                        "Zysk", "Zysk %", "Opłata", "Data K", "Data S" ]
-
-        # currentStock: GpwCurrentStockData = self.gpwCurrentSource.stockData
-        rowsList = []
-
-        transMode = self.userContainer.transactionsMatchMode
-
-        stock_id: Tuple[ str, str ]
-        transactions: TransHistory
-        for stock_id, transactions in self.wallet.stockData().items():
-            stock_name: str = stock_id[0] if stock_id else None
-            ticker: str     = stock_id[1] if stock_id else None
-            if not ticker:
-                ticker = ""
-
-            if groupByDay:
-                transactions = transactions.groupByDay()
-
-            # currentStockRow = currentStock.getRowByTicker( ticker )
-            # stockName = "-"
-            # if currentStockRow.empty:
-            #     _LOGGER.warning( "could not find stock by ticker: %s", ticker )
-            # else:
-            #     stockName = currentStockRow["Nazwa"]
-
-            currTransactions = transactions.sellTransactions( transMode )
-            if groupByDay:
-                newList = []
-                currDate  = None
-                buyTrans  = Transaction.empty()
-                sellTrans = Transaction.empty()
-                for buy, sell in currTransactions:
-                    transTime = sell.transTime
-                    transDate = transTime.date()
-
-                    if transDate != currDate:
-                        if sellTrans.isEmpty() is False:
-                            newList.append( (buyTrans, sellTrans) )
-                        buyTrans  = Transaction.empty()
-                        sellTrans = Transaction.empty()
-
-                    currDate = transDate
-                    buyTrans.addAvg( buy )
-                    sellTrans.addAvg( sell )
-
-                if sellTrans.isEmpty() is False:
-                    newList.append( (buyTrans, sellTrans) )
-                currTransactions = newList
-
-            for buy, sell in currTransactions:
-                trans_amount     = buy.amount
-                buy_unit_price   = buy.unitPrice
-                sell_unit_price  = sell.unitPrice
-                buy_date         = buy.transTime
-                sell_date        = sell.transTime
-
-                sellValue = sell_unit_price * trans_amount
-                buyValue  = buy_unit_price  * trans_amount
-                profit    = sellValue - buyValue
-                profitPnt = 0.0
-                if buyValue != 0:
-                    profitPnt = profit / buyValue * 100.0
-
-                trans_commission = round( buy.commission + sell.commission, 2 )
-                buy_unit_price  = round( buy_unit_price, 4 )
-                sell_unit_price = round( sell_unit_price, 4 )
-                profitPnt      = round( profitPnt, 2 )
-                profit         = round( profit, 2 )
-
-                buyValue = round( buyValue, 2 )
-                sellValue = round( sellValue, 2 )
-
-                rowsList.append( [ stock_name, ticker, trans_amount,
-                                   buy_unit_price, sell_unit_price, buyValue, sellValue,
-                                   profit, profitPnt, trans_commission, buy_date, sell_date ] )
-
-        rowsList.sort( key=lambda x: x[-1], reverse=False )           # sort
-
-        dataFrame = DataFrame.from_records( rowsList, columns=columnsList )
-        return dataFrame
+        return self.getWalletSnapshot().getWalletSellTransactions( groupByDay )
 
     # pylint: disable=R0914
     def getAllTransactions(self, groupByDay=False) -> DataFrame:
@@ -771,74 +507,7 @@ class DataContainer():
 
     ## wallet summary: wallet value, wallet profit, ref change, gain, overall profit
     def getWalletState(self, prev_day_ref=True):
-        gpwArchiveSource = None
-        if prev_day_ref:
-            gpwArchiveSource = GpwArchiveData()
-            gpwArchiveSource.getPrevDayData()  # loads data
-
-        currentStock: GpwCurrentStockData = self.gpwCurrentSource.stockData
-
-        transMode = self.userContainer.transactionsMatchMode
-
-        walletValue    = 0.0
-        refWalletValue = 0.0
-        walletProfit   = 0.0
-        totalGain      = 0.0
-        for stock_id, tickerTransactions in self.wallet.stockData().items():
-            stock_name: str = stock_id[0] if stock_id else None
-            ticker: str     = stock_id[1] if stock_id else None
-            amount, buy_unit_price = tickerTransactions.currentTransactionsAvg( transMode )
-
-            stockGain  = tickerTransactions.transactionsGain( transMode, True )
-            totalGain += stockGain
-
-            if amount == 0:
-                continue
-
-            currentStockRow = currentStock.getRowByTicker( ticker )
-            if currentStockRow is None or currentStockRow.empty:
-                _LOGGER.info( "could not find stock by ticker: %s name: %s", ticker, stock_name )
-                continue
-
-            currUnitValue = GpwCurrentStockData.unitPrice( currentStockRow )
-
-            sellValue      = currUnitValue * amount             ## amount is positive
-            sellValue     -= broker_commission( sellValue )
-            buyValue       = buy_unit_price * amount
-
-#             _LOGGER.info( "wallet state: %s %s %s %s", ticker, amount, currUnitValue, sellValue )
-
-            walletValue   += sellValue
-            walletProfit  += sellValue - buyValue
-
-            refUnitValue = None
-            if prev_day_ref:
-                # returns None in case of companies removed from stock exchange
-                isin = self.gpwCurrentData.getStockIsinFromTicker( ticker )
-                if isin:
-                    prev_day_row = gpwArchiveSource.getRowByIsin(isin)
-                    if prev_day_row.shape[0] > 0:
-                        refUnitValue = GpwArchiveData.getClosingFromRow(prev_day_row)
-
-            if refUnitValue is None:
-                refUnitValue = GpwCurrentStockData.unitReferencePrice( currentStockRow )
-
-            referenceValue = refUnitValue * amount
-            refWalletValue += referenceValue
-
-        walletValue    = round( walletValue, 2 )
-        walletProfit   = round( walletProfit, 2 )
-        refWalletValue = round( refWalletValue, 2 )
-        if refWalletValue != 0.0:
-            referenceFactor = walletValue / refWalletValue - 1
-            rounded_factor = round( referenceFactor * 100, 2 )
-            changeToRef = f"{rounded_factor}%"
-        else:
-            changeToRef = "--"
-        totalGain      = round( totalGain, 2 )
-        overallProfit  = walletProfit + totalGain
-        overallProfit  = round( overallProfit, 2 )
-        return ( walletValue, walletProfit, changeToRef, totalGain, overallProfit )
+        return self.getWalletSnapshot().getWalletState( prev_day_ref )
 
     ## =========================================================================
 
@@ -849,16 +518,15 @@ class DataContainer():
         if not tickerList:
             tickerList = self.wallet.tickers()
         _LOGGER.info( "calculating history for tickers: %s", tickerList )
-        mergedList = None
+        framesList = []
         for ticker in tickerList:
             _LOGGER.info( "calculating history for ticker: %s", ticker )
             stockData = self.getWalletStockValueHistory( ticker, rangeCode )
             if stockData is None:
                 continue
-            mergedList = join_list_dataframe( mergedList, stockData )
+            framesList.append( stockData )
 
-        retData = DataFrame( mergedList, columns=["t", "c"] )
-        return retData
+        return join_step_frames( framesList )
 
     ## calculate value of single stock
     def getWalletStockValueHistory( self, ticker, rangeCode ) -> DataFrame:
@@ -883,30 +551,26 @@ class DataContainer():
         startDateTime = get_start_date( rangeCode )
 
         transMode = self.userContainer.transactionsMatchMode
-        mergedList = None
-        for _, transactions in self.wallet.stockData().items():
-            gainList = transactions.transactionsGainHistory( transMode, True, startDateTime )
-            stockData = DataFrame( gainList, columns=["t", "c"] )
-            mergedList = join_list_dataframe( mergedList, stockData )
-
-        retData = DataFrame( mergedList, columns=["t", "c"] )
-        return retData
+        gainHistory = self._walletGainHistory.get( transMode )
+        if gainHistory is None:
+            gainHistory = WalletGainHistory( transMode )
+            self._walletGainHistory[ transMode ] = gainHistory
+        return gainHistory.getHistory( self.wallet.stockData(), startDateTime )
 
     ## returns DataFrame with two columns: 't' (timestamp) and 'c' (value)
     def getWalletProfitHistory(self, rangeCode, calculateOverall: bool = True, tickerList=None) -> DataFrame:
         if not tickerList:
             tickerList = self.wallet.tickers()
         _LOGGER.info( "calculating history for tickers: %s", tickerList )
-        mergedList = None
+        framesList = []
         for ticker in tickerList:
             _LOGGER.info( "calculating history for ticker: %s", ticker )
             stockData = self.getWalletStockProfitHistory( ticker, rangeCode, calculateOverall )
             if stockData is None:
                 continue
-            mergedList = join_list_dataframe( mergedList, stockData )
+            framesList.append( stockData )
 
-        retData = DataFrame( mergedList, columns=["t", "c"] )
-        return retData
+        return join_step_frames( framesList )
 
     ## calculate profit of single stock
     def getWalletStockProfitHistory(self, ticker, rangeCode, calculateOverall: bool = True) -> DataFrame:
@@ -1001,78 +665,26 @@ class DataContainer():
 #         return self.gpwIndexIntradayData.getData(isin)
 
 
-## stockData contains two columns: 't' and 'c'
-def join_list_dataframe( mergedList, stockData: DataFrame ):
-    if mergedList is None:
-        return stockData.values.tolist()
-
-    mSize = len( mergedList )
-    if mSize < 1:
-        return stockData.values.tolist()
-
-    stockSize = stockData.shape[0]
-    if stockSize < 1:
-        return mergedList
-
-    ## merge data frames
-    newList = []
-
-    m = 0
-    s = 0
-    while m < mSize and s < stockSize:
-        currTime  = mergedList[ m ][ 0 ]
-        stockTime = stockData.at[ s, "t" ]
-        if stockTime < currTime:
-            if m > 0:
-                prevIndex = max( m - 1, 0 )
-                newValue = mergedList[ prevIndex ][ 1 ] + stockData.at[ s, "c" ]
-                rowList = [ stockTime, newValue ]
-                newList.append( rowList )
-                s += 1
-            else:
-                newValue = stockData.at[ s, "c" ]
-                rowList = [ stockTime, newValue ]
-                newList.append( rowList )
-                s += 1
-        elif stockTime == currTime:
-            newValue = mergedList[ m ][ 1 ] + stockData.at[ s, "c" ]
-            rowList = [ stockTime, newValue ]
-            newList.append( rowList )
-            m += 1
-            s += 1
-        else:
-            ## stockTime > currTime
-            if s > 0:
-                prevIndex = max( s - 1, 0 )
-                newValue = mergedList[ m ][ 1 ] + stockData.at[ prevIndex, "c" ]
-                rowList = [ currTime, newValue ]
-                newList.append( rowList )
-                m += 1
-            else:
-                newValue = mergedList[ m ][ 1 ]
-                rowList = [ currTime, newValue ]
-                newList.append( rowList )
-                m += 1
-
-    ## join rest of stockData
-    lastValue = mergedList[ mSize - 1][1]
-    while s < stockSize:
-        stockTime = stockData.at[ s, "t" ]
-        newValue = stockData.at[ s, "c" ] + lastValue
-        rowList = [ stockTime, newValue ]
-        newList.append( rowList )
-        s += 1
-
-    ## join rest of mergedList
-    lastValue = stockData.at[ stockSize - 1, "c" ]
-    while m < mSize:
-        currTime  = mergedList[ m ][ 0 ]
-        newValue = mergedList[ m ][ 1 ] + lastValue
-        rowList = [ currTime, newValue ]
-        newList.append( rowList )
-        m += 1
-
-    return newList
+## each frame contains two columns: 't' and 'c'
+## frames are interpreted as step functions (value is valid until next row)
+## returns DataFrame containing sum of step functions over union of times of all frames
+def join_step_frames( framesList: List[ DataFrame ] ) -> DataFrame:
+    seriesList = []
+    for stockData in framesList:
+        if stockData is None or stockData.empty:
+            continue
+        series = pandas.Series( stockData["c"].values, index=stockData["t"].values )
+        series = series[ ~series.index.duplicated( keep="last" ) ]
+        seriesList.append( series )
+
+    if not seriesList:
+        return DataFrame( columns=["t", "c"] )
+
+    ## align all series on common time index
+    alignedFrame = pandas.concat( seriesList, axis=1, sort=True )
+    alignedFrame = alignedFrame.ffill().fillna( 0.0 )
+    sumValues    = alignedFrame.sum( axis=1 )
+    return DataFrame( { "t": alignedFrame.index, "c": sumValues.values } )
 
 
 def get_start_date( rangeCode ):
@@ -25,8 +25,10 @@ from enum import Enum, unique
 import logging
 import collections
 import glob
+import bisect
+import numbers
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from stockdataaccess import persist
 from stockmonitor.datatypes.wallettypes import TransactionMatchMode
@@ -174,6 +176,11 @@ class FavData( persist.Versionable ):
 ## ================================================================
 
 
+def is_number( value ) -> bool:
+    # pylint: disable=R0124
+    return isinstance( value, numbers.Real ) and value == value        ## NaN is not equal to itself
+
+
 class MarkerEntry( persist.Versionable ):
 
     @unique
@@ -282,6 +289,19 @@ class MarkersContainer( persist.Versionable ):
 
     def __init__(self):
         self.markers: List[MarkerEntry] = []
+        ## ticker -> ( BUY values, BUY entries, SELL values, SELL entries ), entries sorted by value
+        ## built on demand, None if have to be recalculated (not persisted)
+        self._tickerIndex: Dict[ str, Tuple[ List, List, List, List ] ] = None
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop( "_tickerIndex", None )
+        return state
+
+    def __setstate__(self, dict_):
+        super().__setstate__( dict_ )
+        # pylint: disable=W0201
+        self._tickerIndex = None
 
     def _convertstate_(self, dict_, dictVersion_ ):
         _LOGGER.info( "converting object from version %s to %s", dictVersion_, self._class_version )
@@ -308,33 +328,68 @@ class MarkersContainer( persist.Versionable ):
         ## return best color
         if ticker is None:
             return None
-        bestBuy: MarkerEntry  = None
-        bestSell: MarkerEntry = None
+        tickerMarkers = self._getTickerIndex().get( ticker )
+        if tickerMarkers is None:
+            return None
+        buyValues, buyEntries, sellValues, sellEntries = tickerMarkers
+        # pylint: disable=R0124
+        if stockPrice != stockPrice:
+            ## NaN price -- every marker matches (comparison with NaN is always False)
+            if sellEntries:
+                bestIndex = bisect.bisect_left( sellValues, sellValues[-1] )
+                return sellEntries[ bestIndex ].color.lower()
+            if buyEntries:
+                return buyEntries[0].color.lower()
+            return None
+
+        ## check of expensive stock -- the most expensive marker not above stock value
+        sellIndex = bisect.bisect_right( sellValues, stockPrice ) - 1
+        if sellIndex >= 0:
+            ## first added entry among equal values
+            bestIndex = bisect.bisect_left( sellValues, sellValues[ sellIndex ] )
+            return sellEntries[ bestIndex ].color.lower()       ## lower for tests compatibility
+
+        ## check for cheap stock -- the cheapest marker not below stock value
+        buyIndex = bisect.bisect_left( buyValues, stockPrice )
+        if buyIndex < len( buyValues ):
+            return buyEntries[ buyIndex ].color.lower()         ## lower for tests compatibility
+        return None
+
+    ## returns list of best colors for each pair of ticker and price
+    ## None or "-" price means no matching color
+    def matchColors(self, tickers, prices) -> List[ str ]:
+        tickerIndex = self._getTickerIndex()
+        ret: List[ str ] = []
+        for ticker, stockPrice in zip( tickers, prices ):
+            if ticker not in tickerIndex or stockPrice is None or stockPrice == "-":
+                ret.append( None )
+                continue
+            ret.append( self.getBestMatchingColor( ticker, stockPrice ) )
+        return ret
+
+    def _getTickerIndex(self) -> Dict[ str, Tuple[ List, List, List, List ] ]:
+        if self._tickerIndex is not None:
+            return self._tickerIndex
+        buyType  = MarkerEntry.OperationType.BUY
+        sellType = MarkerEntry.OperationType.SELL
+        tickerEntries: Dict[ str, List[ MarkerEntry ] ] = {}
         for item in self.markers:
-            if item.ticker != ticker:
+            if item.ticker is None or not is_number( item.value ):
+                ## invalid value (None, NaN or text)
                 continue
-            if item.value is None:
-                ## invalid value
+            if item.operation is not buyType and item.operation is not sellType:
                 continue
-            if item.operation is MarkerEntry.OperationType.BUY:
-                ## check for cheap stock
-                if item.value < stockPrice:
-                    ## marker value is cheaper than stock value -- skip
-                    continue
-                if bestBuy is None or item.value < bestBuy.value:
-                    bestBuy = item
-            elif item.operation is MarkerEntry.OperationType.SELL:
-                ## check of expensive stock
-                if item.value > stockPrice:
-                    ## marker value is more expensive than stock value -- skip
-                    continue
-                if bestSell is None or item.value > bestSell.value:
-                    bestSell = item
-        if bestSell is not None:
-            return bestSell.color.lower()       ## lower for tests compatibility
-        if bestBuy is not None:
-            return bestBuy.color.lower()        ## lower for tests compatibility
-        return None
+            tickerEntries.setdefault( item.ticker, [] ).append( item )
+        index: Dict[ str, Tuple[ List, List, List, List ] ] = {}
+        for ticker, entriesList in tickerEntries.items():
+            ## sort is stable -- equal values keep order of container
+            entriesList.sort( key=lambda item: item.value )
+            buyEntries  = [ item for item in entriesList if item.operation is buyType ]
+            sellEntries = [ item for item in entriesList if item.operation is sellType ]
+            index[ ticker ] = ( [ item.value for item in buyEntries ], buyEntries,
+                                [ item.value for item in sellEntries ], sellEntries )
+        self._tickerIndex = index
+        return index
 
     def getMatchingColor(self, itemIndex, stockPrice):
         if itemIndex >= len(self.markers):
@@ -368,9 +423,11 @@ class MarkersContainer( persist.Versionable ):
 
     def addItem(self, entry):
         self.markers.append( entry )
+        self._tickerIndex = None
 
     def addItemList(self, entries):
         self.markers += entries
+        self._tickerIndex = None
 
     def replaceItem(self, oldEntry, newEntry):
         _LOGGER.debug( "replacing marker %s with %s", oldEntry, newEntry )
@@ -378,6 +435,7 @@ class MarkersContainer( persist.Versionable ):
             currItem = self.markers[i]
             if currItem == oldEntry:
                 self.markers[i] = newEntry
+                self._tickerIndex = None
 #                 self.sort()
                 return True
         _LOGGER.debug( "replacing failed" )
@@ -385,9 +443,11 @@ class MarkersContainer( persist.Versionable ):
 
     def deleteItem(self, entry):
         self.markers.remove( entry )
+        self._tickerIndex = None
 
     def deleteItemsList(self, entries):
         self.markers = [x for x in self.markers if x not in entries]
+        self._tickerIndex = None
 
 
 ## ================================================================
@@ -24,7 +24,7 @@
 import logging
 from datetime import datetime
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, FrozenSet
 
 from stockdataaccess import persist
 
@@ -44,12 +44,47 @@ class WalletData( persist.Versionable ):
     ## 2 - sort transactions
     ## 3 - add 'commission' field to transaction
     ## 4 - rename "stockList" to "_stockDict" and change key from ticker to pair (name, ticker)
-    _class_version = 4
+    ## 5 - compact transactions (slotted 'Transaction') sorted by time
+    _class_version = 5
+
+    ## attributes derived from '_stockDict' (not persisted)
+    _INDEX_ATTRIBUTES = ( "_modCounter", "_tickerIndex", "_tickersSet", "_currentStock", "_currentStockSet" )
 
     def __init__(self):
         # key:   (stockName, ticker)
         # value: TransHistory
         self._stockDict: Dict[ StockId, TransHistory ] = {}
+        self._initIndexes()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        for key in WalletData._INDEX_ATTRIBUTES:
+            state.pop( key, None )
+        return state
+
+    def __setstate__(self, dict_):
+        super().__setstate__( dict_ )
+        self._initIndexes()
+
+    # pylint: disable=W0201
+    def _initIndexes(self):
+        ## counter of wallet modifications
+        self._modCounter = 0
+        ## ticker -> stock id (first added)
+        self._tickerIndex: Dict[ str, StockId ] = {}
+        for stock_id in self._stockDict:
+            ticker = stock_id[1] if stock_id else None
+            self._tickerIndex.setdefault( ticker, stock_id )
+        ## all tickers, None if have to be recalculated
+        self._tickersSet: FrozenSet[ str ] = None
+        ## tickers of current stock, None if have to be recalculated
+        self._currentStock: List[ str ] = None
+        self._currentStockSet: FrozenSet[ str ] = frozenset()
+
+    def _modified(self):
+        self._modCounter  += 1
+        self._tickersSet   = None
+        self._currentStock = None
 
     def _convertstate_(self, dict_, dictVersion_ ):
         _LOGGER.info( "converting object from version %s to %s", dictVersion_, self._class_version )
@@ -78,7 +113,7 @@ class WalletData( persist.Versionable ):
                 for i in range( 0, transSize ):
                     trans = transHist.transactions[i]
                     convertedList.append( Transaction( trans[0], trans[1], 0.0, trans[2] ) )
-                transHist.transactions = convertedList
+                transHist.setTransactions( convertedList )
             dictVersion_ = 3
 
         if dictVersion_ == 3:
@@ -91,42 +126,64 @@ class WalletData( persist.Versionable ):
             dict_["_stockDict"] = histDict
             dictVersion_ = 4
 
+        if dictVersion_ == 4:
+            ## 'Transaction' objects are converted while unpickling ('Transaction.__setstate__()')
+            ## sorting allows binary search in history
+            histDict = dict_["_stockDict"]
+            for _, transHist in histDict.items():
+                transHist.sort()
+            dictVersion_ = 5
+
         # pylint: disable=W0201
         self.__dict__ = dict_
 
     def __getitem__(self, ticker) -> TransHistory:
-        for stock_id, hist in self._stockDict.items():
-            stock_ticker = stock_id[1]
-            if stock_ticker == ticker:
-                return hist
-        return None
-        #return self._stockDict.get( ticker, None )
+        stock_id = self._tickerIndex.get( ticker )
+        if stock_id is None:
+            return None
+        return self._stockDict.get( stock_id, None )
 
     def size(self):
         return len( self._stockDict )
 
     def clear(self):
         self._stockDict.clear()
+        self._tickerIndex.clear()
+        self._modified()
+
+    ## value changes on every modification of wallet
+    def modificationCounter(self) -> int:
+        return self._modCounter
 
     def stockData(self):
         return self._stockDict
 
-    ## return all tickers (even sold)
-    def tickers(self):
-        tickers_set = set()
-        for stock_id in self._stockDict:
-            stock_ticker = stock_id[1]
-            tickers_set.add( stock_ticker )
-        return tickers_set
+    ## return all tickers (even sold), returned set is shared and can not be modified
+    def tickers(self) -> FrozenSet[ str ]:
+        if self._tickersSet is None:
+            self._tickersSet = frozenset( self._tickerIndex.keys() )
+        return self._tickersSet
 
     ## get current tickers
     def getCurrentStock(self) -> List[ str ]:
+        return list( self._getCurrentStock() )
+
+    ## get current tickers as set (returned object should not be modified)
+    def getCurrentStockSet(self) -> FrozenSet[ str ]:
+        self._getCurrentStock()
+        return self._currentStockSet
+
+    def _getCurrentStock(self) -> List[ str ]:
+        if self._currentStock is not None:
+            return self._currentStock
         ret = []
         for stockId, hist in self._stockDict.items():
             amount = hist.currentAmount()
             if amount > 0:
                 ticker = stockId[1] if stockId else None
                 ret.append( ticker )
+        self._currentStockSet = frozenset( ret )
+        self._currentStock    = ret
         return ret
 
     def transactions(self, ticker) -> TransHistory:
@@ -160,12 +217,10 @@ class WalletData( persist.Versionable ):
     def addTransaction( self, stockName, ticker, amount, unitPrice, transTime: datetime = datetime.today(),
                         commission=0.0, joinSimilar=True ):
         stock_id = ( stockName, ticker )
-        transactions: TransHistory = self._stockDict.get( stock_id, None )
-        if transactions is None:
-            transactions = TransHistory()
-            self._stockDict[ stock_id ] = transactions
+        transactions: TransHistory = self._getHistory( stock_id )
         _LOGGER.debug( "adding transaction: %s %s %s %s %s", stock_id, amount, unitPrice, commission, transTime )
         transactions.add( amount, unitPrice, commission, transTime, joinSimilar )
+        self._modified()
 
     def addTransactionObject( self, stockId: StockId, transaction: Transaction, joinSimilar=True ):
         self.addTransaction( stockId[0], stockId[1], transaction.amount, transaction.unitPrice,
@@ -176,17 +231,35 @@ class WalletData( persist.Versionable ):
         if transactions is None:
             return
         transactions.rem( transaction.amount, transaction.unitPrice, transaction.commission, transaction.transTime )
+        self._modified()
 
-    def addWallet(self, wallet: 'WalletData', joinSimilar=True):
-        # remove repeated transactions
-        for stockId, hist in wallet.stockData().items():
-            for trans in hist.transactions:
-                self.remTransactionObject(stockId, trans)
+    ## add transactions of one stock in bulk
+    def addTransactionsList( self, stockId: StockId, transList: List[ Transaction ], joinSimilar=True ):
+        if not transList:
+            return
+        transactions: TransHistory = self._getHistory( stockId )
+        transactions.addList( transList, joinSimilar )
+        self._modified()
 
-        # add new transactions
+    ## add transactions of given wallet replacing same transactions already existing in wallet
+    def addWallet(self, wallet: 'WalletData', joinSimilar=True):
         for stockId, hist in wallet.stockData().items():
-            for trans in hist.transactions:
-                self.addTransactionObject(stockId, trans, joinSimilar)
+            if hist.size() < 1:
+                continue
+            transactions: TransHistory = self._getHistory( stockId )
+            # remove repeated transactions
+            transactions.remList( hist.transactions )
+            # add new transactions
+            transactions.addList( hist.transactions, joinSimilar )
+        self._modified()
+
+    def _getHistory( self, stockId: StockId ) -> TransHistory:
+        transactions: TransHistory = self._stockDict.get( stockId, None )
+        if transactions is None:
+            transactions = TransHistory()
+            self._stockDict[ stockId ] = transactions
+            self._tickerIndex.setdefault( stockId[1], stockId )
+        return transactions
 
     def importDataFromDict(self, wallet_dict):
         if not wallet_dict:
@@ -198,10 +271,11 @@ class WalletData( persist.Versionable ):
         for stock_id, data_dict in wallet_dict.items():
             stock_name = stock_id[0]
             stock_ticker = stock_id[1]
-            trans_list = data_dict["transactions"]
-            for trans_item in trans_list:
+            trans_list = []
+            for trans_item in data_dict["transactions"]:
                 amount = trans_item['amount']
                 unitPrice = trans_item['unitPrice']
                 transTime = trans_item['transTime']
                 commission = trans_item['commission']
-                self.addTransaction(stock_name, stock_ticker, amount, unitPrice, transTime, commission, False )
+                trans_list.append( Transaction( amount, unitPrice, commission, transTime ) )
+            self.addTransactionsList( (stock_name, stock_ticker), trans_list, False )
@@ -0,0 +1,143 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import datetime
+import bisect
+from typing import Dict, List, Tuple
+
+import numpy
+from pandas.core.frame import DataFrame
+
+from stockmonitor.datatypes.wallettypes import TransHistory, TransactionMatchMode, TransactionsMatchState
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## realized gain of whole wallet as stream of sell events of all stocks
+## events are kept in chronological order with cumulative gain,
+## so gain history of any range is a slice of precomputed arrays
+## appending recent transactions to wallet only appends new events
+class WalletGainHistory():
+
+    def __init__( self, transMode: TransactionMatchMode ):
+        self.transMode = transMode
+        ## stock id -> pair: matching state and number of consumed sell pairs
+        self._consumed: Dict[ Tuple[str, str], Tuple[TransactionsMatchState, int] ] = {}
+        ## step series: unique event times (ascending) and cumulative gain after last event of given time
+        self._times: List[ datetime.datetime ] = []
+        self._values: List[ float ] = []
+        self._totalGain = 0.0
+        ## numpy arrays of step series, None if have to be recalculated
+        self._arrays: Tuple[ numpy.ndarray, numpy.ndarray ] = None
+
+    def size(self):
+        return len( self._times )
+
+    def totalGain(self) -> float:
+        return self._totalGain
+
+    ## returns DataFrame with two columns: 't' (timestamp) and 'c' (value)
+    ## gain of events before 'startDate' is accumulated in one entry with 'startDate' time
+    def getHistory( self, stockDict: Dict[ Tuple[str, str], TransHistory ], startDate=None ) -> DataFrame:
+        self.update( stockDict )
+        if not self._times:
+            return DataFrame( columns=["t", "c"] )
+
+        timesArray, valuesArray = self._getArrays()
+        if startDate is None:
+            return DataFrame( { "t": timesArray, "c": valuesArray } )
+
+        startIndex = bisect.bisect_left( self._times, startDate )
+        timesArray  = timesArray[ startIndex: ]
+        valuesArray = valuesArray[ startIndex: ]
+        if 0 < startIndex and ( startIndex == len( self._times ) or self._times[ startIndex ] != startDate ):
+            ## accumulate older events
+            timesArray  = numpy.concatenate( ( numpy.array( [ startDate ], dtype="datetime64[ns]" ), timesArray ) )
+            valuesArray = numpy.concatenate( ( [ self._values[ startIndex - 1 ] ], valuesArray ) )
+        return DataFrame( { "t": timesArray, "c": valuesArray } )
+
+    ## consume new sell events of given wallet stock
+    def update( self, stockDict: Dict[ Tuple[str, str], TransHistory ] ):
+        newEvents = self._collectEvents( stockDict )
+        if newEvents is None:
+            ## history modified in the past -- recalculate all events
+            self._clear()
+            newEvents = self._collectEvents( stockDict )
+        if not newEvents:
+            return
+        newEvents.sort( key=lambda event: event[0] )
+        if self._times and newEvents[0][0] < self._times[-1]:
+            ## events from the past (e.g. transactions of other stock added) -- recalculate all events
+            self._clear()
+            newEvents = self._collectEvents( stockDict )
+            newEvents.sort( key=lambda event: event[0] )
+        self._appendEvents( newEvents )
+
+    def _clear(self):
+        self._consumed.clear()
+        self._times.clear()
+        self._values.clear()
+        self._totalGain = 0.0
+        self._arrays = None
+
+    ## returns list of new events: pairs (time, gain) or None if already consumed events are not valid
+    def _collectEvents( self,
+                        stockDict: Dict[ Tuple[str, str], TransHistory ] ) -> List[ Tuple[datetime.datetime, float] ]:
+        if any( stockId not in stockDict for stockId in self._consumed ):
+            ## stock removed
+            return None
+        newEvents = []
+        for stockId, transactions in stockDict.items():
+            matchState = transactions.matchState( self.transMode )
+            prevState, consumedNum = self._consumed.get( stockId, ( matchState, 0 ) )
+            if prevState is not matchState:
+                return None
+            sellList = matchState.sellList
+            for buyTrans, sellTrans in sellList[ consumedNum: ]:
+                if sellTrans.transTime is None:
+                    ## event can not be placed on time axis
+                    continue
+                buyCost    = buyTrans.getValue( True )
+                sellProfit = sellTrans.getValue( True )
+                newEvents.append( ( sellTrans.transTime, -sellProfit - buyCost ) )
+            self._consumed[ stockId ] = ( matchState, len( sellList ) )
+        return newEvents
+
+    def _appendEvents( self, eventsList: List[ Tuple[datetime.datetime, float] ] ):
+        for eventTime, gainValue in eventsList:
+            self._totalGain += gainValue
+            if self._times and self._times[-1] == eventTime:
+                self._values[-1] = self._totalGain
+            else:
+                self._times.append( eventTime )
+                self._values.append( self._totalGain )
+        self._arrays = None
+
+    def _getArrays(self) -> Tuple[ numpy.ndarray, numpy.ndarray ]:
+        if self._arrays is None:
+            timesArray  = numpy.array( self._times, dtype="datetime64[ns]" )
+            valuesArray = numpy.array( self._values, dtype=float )
+            self._arrays = ( timesArray, valuesArray )
+        return self._arrays
@@ -0,0 +1,536 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+from typing import Dict, Tuple
+
+import functools
+
+import numpy
+import pandas
+from pandas.core.frame import DataFrame
+
+from stockdataaccess.dataaccess.datatype import StockDataType
+from stockdataaccess.dataaccess.gpw.gpwcurrentdata import GpwCurrentStockData
+from stockdataaccess.dataaccess.gpw.gpwarchivedata import GpwArchiveData
+
+from stockmonitor.datatypes.walletdata import WalletData
+from stockmonitor.datatypes.wallettypes import TransHistory, Transaction, TransactionMatchMode, \
+    broker_commission_array
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## state of wallet calculated once for given wallet modification and current stock prices
+## stock prices are joined to wallet stock by ticker
+class WalletSnapshot():
+
+    def __init__( self, wallet: WalletData, transMode: TransactionMatchMode, currentStock: GpwCurrentStockData ):
+        self.wallet        = wallet
+        self.walletCounter = wallet.modificationCounter()
+        self.transMode     = transMode
+        self.currentStock  = currentStock
+        self.currentData   = currentStock.getWorksheetData()
+
+        ## DataFrame with columns: name, ticker, amount, buy_unit_price, gain, overall_profit,
+        ##                         isin, unit_price, ref_unit_price, change_pnt, found
+        self.stockFrame: DataFrame = self._calculateStockFrame()
+
+        self._stateCache: Dict[ bool, tuple ]           = {}
+        self._tablesCache: Dict[ Tuple, DataFrame ]     = {}
+
+    ## check if snapshot is still valid for given data
+    def isValid( self, wallet: WalletData, transMode: TransactionMatchMode, currentStock: GpwCurrentStockData ) -> bool:
+        if wallet is not self.wallet:
+            return False
+        if wallet.modificationCounter() != self.walletCounter:
+            return False
+        if transMode is not self.transMode:
+            return False
+        if currentStock is not self.currentStock:
+            return False
+        return currentStock.getWorksheetData() is self.currentData
+
+    ## ======================================================================
+
+    def _calculateStockFrame(self) -> DataFrame:
+        rowsList = []
+        for stock_id, transactions in self.wallet.stockData().items():
+            stock_name: str = stock_id[0] if stock_id else None
+            ticker: str     = stock_id[1] if stock_id else None
+            amount, buy_unit_price = transactions.currentTransactionsAvg( self.transMode )
+            stockGain     = transactions.transactionsGain( self.transMode, True )
+            overallProfit = transactions.transactionsOverallProfit()
+            rowsList.append( [ stock_name, ticker, amount, buy_unit_price, stockGain, overallProfit ] )
+
+        stockFrame = DataFrame( rowsList, columns=[ "name", "ticker", "amount", "buy_unit_price",
+                                                    "gain", "overall_profit" ] )
+        pricesFrame = get_stock_prices( self.currentData )
+        stockFrame = stockFrame.merge( pricesFrame, on="ticker", how="left", sort=False )
+        stockFrame["found"] = stockFrame["unit_price"].notna()
+        return stockFrame
+
+    ## ======================================================================
+
+    ## wallet summary: wallet value, wallet profit, ref change, gain, overall profit
+    def getWalletState(self, prev_day_ref=True):
+        walletState = self._stateCache.get( prev_day_ref )
+        if walletState is None:
+            walletState = self._calculateWalletState( prev_day_ref )
+            self._stateCache[ prev_day_ref ] = walletState
+        return walletState
+
+    ## returns value of wallet without loading reference data
+    def getWalletValue(self):
+        walletValue, _ = self._calculateWalletValue()
+        return round( walletValue, 2 )
+
+    def _calculateWalletValue(self):
+        stockFrame  = self.stockFrame
+        amount      = stockFrame["amount"].to_numpy( dtype=float )
+        valueMask   = ( amount != 0 ) & stockFrame["found"].to_numpy()
+
+        sellValues  = stockFrame["unit_price"].fillna( 0.0 ).to_numpy() * amount          ## amount is positive
+        sellValues -= broker_commission_array( sellValues )
+        buyValues   = stockFrame["buy_unit_price"].to_numpy( dtype=float ) * amount
+
+        walletValue  = 0.0
+        walletProfit = 0.0
+        for sellValue, buyValue in zip( sellValues[ valueMask ], buyValues[ valueMask ] ):
+            walletValue  += sellValue
+            walletProfit += sellValue - buyValue
+        return ( walletValue, walletProfit )
+
+    def _calculateWalletState(self, prev_day_ref):
+        stockFrame = self.stockFrame
+        walletValue, walletProfit = self._calculateWalletValue()
+
+        totalGain = 0.0
+        for stockGain in stockFrame["gain"]:
+            totalGain += stockGain
+
+        amount    = stockFrame["amount"].to_numpy( dtype=float )
+        valueMask = ( amount != 0 ) & stockFrame["found"].to_numpy()
+
+        refUnitValues = stockFrame["ref_unit_price"].to_numpy( dtype=float )
+        if prev_day_ref:
+            prevClosing = get_prev_day_closing()
+            closingValues = stockFrame["isin"].map( prevClosing ).to_numpy( dtype=float )
+            refUnitValues = numpy.where( numpy.isnan( closingValues ), refUnitValues, closingValues )
+
+        refWalletValue = 0.0
+        for referenceValue in ( refUnitValues * amount )[ valueMask ]:
+            refWalletValue += referenceValue
+
+        walletValue    = round( walletValue, 2 )
+        walletProfit   = round( walletProfit, 2 )
+        refWalletValue = round( refWalletValue, 2 )
+        if refWalletValue != 0.0:
+            referenceFactor = walletValue / refWalletValue - 1
+            rounded_factor = round( referenceFactor * 100, 2 )
+            changeToRef = f"{rounded_factor}%"
+        else:
+            changeToRef = "--"
+        totalGain      = round( totalGain, 2 )
+        overallProfit  = walletProfit + totalGain
+        overallProfit  = round( overallProfit, 2 )
+        return ( walletValue, walletProfit, changeToRef, totalGain, overallProfit )
+
+    ## ======================================================================
+
+    def getWalletStock(self, show_soldout=True) -> DataFrame:
+        cacheKey = ( "stock", show_soldout )
+        dataFrame = self._tablesCache.get( cacheKey )
+        if dataFrame is None:
+            dataFrame = self._calculateWalletStock( show_soldout )
+            self._tablesCache[ cacheKey ] = dataFrame
+        return dataFrame.copy()
+
+    # pylint: disable=R0914
+    def _calculateWalletStock(self, show_soldout=True) -> DataFrame:
+        columnsList = [ "Nazwa", "Ticker", "Liczba", "Średni kurs nabycia",
+                        "Kurs",
+                        "Zm.do k.odn.[%]", "Zm.do k.odn.[PLN]",
+                        "Wartość [PLN]", "Udział [%]",
+                        "Zysk [%]", "Zysk [PLN]", "Zysk całkowity [PLN]" ]
+
+        walletValue = self.getWalletValue()
+
+        stockFrame = self.stockFrame
+        amounts    = stockFrame["amount"].to_numpy( dtype=float )
+        found      = stockFrame["found"].to_numpy()
+        unitPrices = stockFrame["unit_price"].fillna( 0.0 ).to_numpy()
+        changePnts = stockFrame["change_pnt"].fillna( 0.0 ).to_numpy()
+
+        sellValues  = numpy.where( found, unitPrices * amounts, 0.0 )                   ## amount is positive
+        valueChanges = numpy.where( found & (amounts > 0), changePnts / 100.0 * sellValues, 0.0 )
+        sellValues  = numpy.where( found & (amounts > 0),
+                                   sellValues - broker_commission_array( sellValues ), sellValues )
+
+        rowsList = []
+        for rowIndex, stockRow in enumerate( stockFrame.itertuples( index=False ) ):
+            amount = stockRow.amount
+            if show_soldout is False and amount < 1:
+                continue
+
+            ticker = stockRow.ticker
+            if not ticker:
+                ticker = ""
+
+            stockFound     = found[ rowIndex ]
+            buy_unit_price = stockRow.buy_unit_price
+            buyValue       = buy_unit_price * amount
+
+            currUnitValue = 0.0
+            currChangePnt = 0.0
+            participation = 0.0
+            profit = 0.0
+            profitPnt = 0.0
+            sellValue = float( sellValues[ rowIndex ] )
+
+            if stockFound:
+                # stock rate found
+                currUnitValue = float( unitPrices[ rowIndex ] )
+                currChangePnt = float( changePnts[ rowIndex ] )
+
+                if walletValue > 0:
+                    participation = sellValue / walletValue * 100.0
+
+                profit    = sellValue - buyValue
+                if buyValue != 0:
+                    profitPnt = profit / buyValue * 100.0
+
+            totalProfit = stockRow.overall_profit + sellValue
+            totalProfit = round( totalProfit, 2 )
+
+            buy_unit_price = round( buy_unit_price, 4 )
+            currUnitValue = round( currUnitValue, 2 )
+            currChangePnt = round( currChangePnt, 2 )
+            valueChange = round( float( valueChanges[ rowIndex ] ), 2 )
+            sellValue = round( sellValue, 2 )
+            participation = round( participation, 2 )
+            profitPnt = round( profitPnt, 2 )
+            profit = round( profit, 2 )
+
+            row_buy_unit_price = ""
+            row_currUnitValue = ""
+            row_currChangePnt = ""
+            row_valueChange = ""
+            row_sellValue = ""
+            row_participation = ""
+            row_profitPnt = ""
+            row_profit = ""
+
+            if stockFound:
+                ## stock rate found
+                if amount > 0:
+                    ## stock in wallet (not sold out)
+                    row_buy_unit_price = buy_unit_price         # type: ignore
+                    row_currUnitValue = currUnitValue           # type: ignore
+                    row_currChangePnt = currChangePnt           # type: ignore
+                    row_valueChange = valueChange               # type: ignore
+                    row_sellValue = sellValue                   # type: ignore
+                    row_participation = participation           # type: ignore
+                    row_profitPnt = profitPnt                   # type: ignore
+                    row_profit = profit                         # type: ignore
+                else:
+                    ## sold out
+                    row_currUnitValue = currUnitValue           # type: ignore
+                    row_currChangePnt = currChangePnt           # type: ignore
+            else:
+                ## stock not found
+                if amount > 0:
+                    ## stock in wallet (not sold out)
+                    row_buy_unit_price = buy_unit_price         # type: ignore
+
+            rowDict = {}
+            rowDict[ columnsList[ 0] ] = stockRow.name
+            rowDict[ columnsList[ 1] ] = ticker
+            rowDict[ columnsList[ 2] ] = amount                             ## liczba
+            rowDict[ columnsList[ 3] ] = row_buy_unit_price                 ## sredni kurs nabycia
+            rowDict[ columnsList[ 4] ] = row_currUnitValue                  ## kurs
+            rowDict[ columnsList[ 5] ] = row_currChangePnt                  ## zm. kur. odn %
+            rowDict[ columnsList[ 6] ] = row_valueChange                    ## zm. kur. odn. PLN
+            rowDict[ columnsList[ 7] ] = row_sellValue                      ## wartosc
+            rowDict[ columnsList[ 8] ] = row_participation                  ## udzial
+            rowDict[ columnsList[ 9] ] = row_profitPnt                      ## zysk %
+            rowDict[ columnsList[10] ] = row_profit                         ## zysk PLN
+            rowDict[ columnsList[11] ] = totalProfit                        ## zysk calk.
+            rowsList.append( rowDict )
+
+        def compare_float( value_a, value_b ):
+            if isinstance(value_a, str):
+                value_a = -float("inf")
+            if isinstance(value_b, str):
+                value_b = -float("inf")
+
+            if value_a < value_b:
+                return -1
+            if value_a > value_b:
+                return 1
+            return 0
+
+        def sort_wallet_profit(item_a, item_b):
+            value_a = item_a[columnsList[9]]
+            value_b = item_b[columnsList[9]]
+            cmp = compare_float( value_a, value_b )
+            if cmp != 0:
+                return cmp
+            value_a = item_a[columnsList[11]]
+            value_b = item_b[columnsList[11]]
+            return compare_float( value_a, value_b )
+
+        rowsList.sort( key=functools.cmp_to_key(sort_wallet_profit), reverse=True )           # sort
+
+        dataFrame = DataFrame( rowsList, columns=columnsList )
+        return dataFrame
+
+    ## ======================================================================
+
+    def getWalletBuyTransactions(self, groupByDay=False, sort_data=False) -> DataFrame:
+        cacheKey = ( "buy", groupByDay, sort_data )
+        dataFrame = self._tablesCache.get( cacheKey )
+        if dataFrame is None:
+            dataFrame = self._calculateBuyTransactions( groupByDay, sort_data )
+            self._tablesCache[ cacheKey ] = dataFrame
+        return dataFrame.copy()
+
+    # pylint: disable=R0914
+    def _calculateBuyTransactions(self, groupByDay=False, sort_data=False) -> DataFrame:
+        columnsList = [ "Nazwa", "Ticker", "Liczba", "Kurs kupna", "Opłata", "Wartość K",
+                        "Kurs aktualny",
+                        "Zysk", "Zysk %", "Data transakcji" ]
+
+        stockFrame = self.stockFrame
+        foundFrame = stockFrame[ stockFrame["found"] ]
+        unitPrices = dict( zip( foundFrame["ticker"], foundFrame["unit_price"] ) )
+
+        rowsList = []
+
+        stock_id: Tuple[ str, str ]
+        transactions: TransHistory
+        for stock_id, transactions in self.wallet.stockData().items():
+            stock_name: str = stock_id[0] if stock_id else None
+            ticker: str     = stock_id[1] if stock_id else None
+
+            currTransactions = transactions.currentTransactions( self.transMode )
+            if groupByDay:
+                currTransactions = TransHistory.groupTransactionsByDay( currTransactions )
+
+            if not currTransactions:
+                # all stock sold out
+                continue
+
+            stock_unit_value = unitPrices.get( ticker )
+            if stock_unit_value is None:
+                _LOGGER.info( "could not find stock by ticker: %s name: %s", ticker, stock_name )
+
+            if not ticker:
+                ticker = ""
+
+            for item in currTransactions:
+                trans_amount     = item.amount
+                trans_unit_price = item.unitPrice
+                trans_commission = round( item.commission, 2 )
+                trans_date       = item.transTime
+                buy_value        = trans_amount * trans_unit_price
+
+                currUnitValue = stock_unit_value
+                if currUnitValue:
+                    currValue = currUnitValue * trans_amount
+                    profit    = currValue - buy_value
+                    profitPnt = 0.0
+                    if buy_value != 0:
+                        profitPnt = profit / buy_value * 100.0
+                    profitPnt      = round( profitPnt, 2 )
+                    profit         = round( profit, 2 )
+                else:
+                    currUnitValue = "-"
+                    currValue = "-"
+                    profit = "-"
+                    profitPnt = "-"             # type: ignore
+
+                trans_unit_price = round( trans_unit_price, 4 )
+                buy_value = round( buy_value, 2 )
+
+                rowsList.append( [ stock_name, ticker, trans_amount, trans_unit_price, trans_commission,
+                                   buy_value, currUnitValue,
+                                   profit, profitPnt, trans_date ] )
+
+        if sort_data:
+            def compare_raw( value_a, value_b ):
+                if value_a < value_b:
+                    return 1
+                if value_a > value_b:
+                    return -1
+                return 0
+
+            def sort_buy_trans(item_a, item_b):
+                value_a = item_a[0]
+                value_b = item_b[0]
+                cmp = compare_raw( value_a, value_b )
+                if cmp != 0:
+                    return cmp
+                value_a = item_a[-1]
+                value_b = item_b[-1]
+                return compare_raw( value_a, value_b )
+
+            rowsList.sort( key=functools.cmp_to_key(sort_buy_trans), reverse=True )           # sort
+
+        dataFrame = DataFrame.from_records( rowsList, columns=columnsList )
+        return dataFrame
+
+    def getWalletSellTransactions(self, groupByDay=False) -> DataFrame:
+        cacheKey = ( "sell", groupByDay )
+        dataFrame = self._tablesCache.get( cacheKey )
+        if dataFrame is None:
+            dataFrame = self._calculateSellTransactions( groupByDay )
+            self._tablesCache[ cacheKey ] = dataFrame
+        return dataFrame.copy()
+
+    # pylint: disable=R0914
+    def _calculateSellTransactions(self, groupByDay=False) -> DataFrame:
+        columnsList = [ "Nazwa", "Ticker", "Liczba",
+                        "Kurs K", "Kurs S", "Wartość K", "Wartość S",
+                        "Zysk", "Zysk %", "Opłata", "Data K", "Data S" ]
+
+        rowsList = []
+
+        stock_id: Tuple[ str, str ]
+        transactions: TransHistory
+        for stock_id, transactions in self.wallet.stockData().items():
+            stock_name: str = stock_id[0] if stock_id else None
+            ticker: str     = stock_id[1] if stock_id else None
+            if not ticker:
+                ticker = ""
+
+            if groupByDay:
+                transactions = transactions.groupByDay()
+
+            currTransactions = transactions.sellTransactions( self.transMode )
+            if groupByDay:
+                newList = []
+                currDate  = None
+                buyTrans  = Transaction.empty()
+                sellTrans = Transaction.empty()
+                for buy, sell in currTransactions:
+                    transTime = sell.transTime
+                    transDate = transTime.date()
+
+                    if transDate != currDate:
+                        if sellTrans.isEmpty() is False:
+                            newList.append( (buyTrans, sellTrans) )
+                        buyTrans  = Transaction.empty()
+                        sellTrans = Transaction.empty()
+
+                    currDate = transDate
+                    buyTrans.addAvg( buy )
+                    sellTrans.addAvg( sell )
+
+                if sellTrans.isEmpty() is False:
+                    newList.append( (buyTrans, sellTrans) )
+                currTransactions = newList
+
+            for buy, sell in currTransactions:
+                trans_amount     = buy.amount
+                buy_unit_price   = buy.unitPrice
+                sell_unit_price  = sell.unitPrice
+                buy_date         = buy.transTime
+                sell_date        = sell.transTime
+
+                sellValue = sell_unit_price * trans_amount
+                buyValue  = buy_unit_price  * trans_amount
+                profit    = sellValue - buyValue
+                profitPnt = 0.0
+                if buyValue != 0:
+                    profitPnt = profit / buyValue * 100.0
+
+                trans_commission = round( buy.commission + sell.commission, 2 )
+                buy_unit_price  = round( buy_unit_price, 4 )
+                sell_unit_price = round( sell_unit_price, 4 )
+                profitPnt      = round( profitPnt, 2 )
+                profit         = round( profit, 2 )
+
+                buyValue = round( buyValue, 2 )
+                sellValue = round( sellValue, 2 )
+
+                rowsList.append( [ stock_name, ticker, trans_amount,
+                                   buy_unit_price, sell_unit_price, buyValue, sellValue,
+                                   profit, profitPnt, trans_commission, buy_date, sell_date ] )
+
+        rowsList.sort( key=lambda x: x[-1], reverse=False )           # sort
+
+        dataFrame = DataFrame.from_records( rowsList, columns=columnsList )
+        return dataFrame
+
+
+## =======================================================
+
+
+## returns DataFrame with columns: ticker, isin, unit_price, ref_unit_price, change_pnt
+## values are converted the same way as in 'GpwCurrentStockData.unitPrice()'
+def get_stock_prices( currentData: DataFrame ) -> DataFrame:
+    columnsList = [ "ticker", "isin", "unit_price", "ref_unit_price", "change_pnt" ]
+    if currentData is None or currentData.empty:
+        return DataFrame( columns=columnsList )
+
+    def get_column( dataType: StockDataType ):
+        colIndex = GpwCurrentStockData.getColumnIndex( dataType )
+        return currentData.iloc[:, colIndex]
+
+    def get_numeric_column( dataType: StockDataType ):
+        return pandas.to_numeric( get_column( dataType ), errors="coerce" ).to_numpy( dtype=float )
+
+    refValues    = numpy.nan_to_num( get_numeric_column( StockDataType.REFERENCE ), nan=0.0 )
+    recentValues = get_numeric_column( StockDataType.RECENT_VALUE )
+    unitValues   = numpy.where( numpy.isnan( recentValues ), refValues, recentValues )
+    changeValues = numpy.nan_to_num( get_numeric_column( StockDataType.CHANGE_TO_REF ), nan=0.0 )
+
+    pricesFrame = DataFrame( { "ticker":         get_column( StockDataType.TICKER ).to_numpy(),
+                               "isin":           get_column( StockDataType.ISIN ).to_numpy(),
+                               "unit_price":     unitValues,
+                               "ref_unit_price": refValues,
+                               "change_pnt":     changeValues }, columns=columnsList )
+    pricesFrame = pricesFrame[ pricesFrame["ticker"].notna() ]
+    pricesFrame = pricesFrame.drop_duplicates( subset="ticker", keep="first" )
+    return pricesFrame
+
+
+## returns dict: isin -> closing price of previous trading day
+def get_prev_day_closing() -> Dict[ str, float ]:
+    gpwArchiveSource = GpwArchiveData()
+    prevDayData = gpwArchiveSource.getPrevDayData()  # loads data
+    if prevDayData is None or prevDayData.empty:
+        return {}
+    isinIndex    = GpwArchiveData.getColumnIndex( StockDataType.ISIN )
+    closingIndex = GpwArchiveData.getColumnIndex( StockDataType.CLOSING )
+    closingValues = pandas.to_numeric( prevDayData.iloc[:, closingIndex], errors="coerce" )
+    closingValues = closingValues.fillna( 0.0 ).to_numpy( dtype=float )
+    isinValues    = prevDayData.iloc[:, isinIndex].to_numpy()
+    retDict = {}
+    for isin, closing in zip( reversed( isinValues ), reversed( closingValues ) ):
+        ## first row of repeated isin is valid
+        retDict[ isin ] = closing
+    return retDict
@@ -24,11 +24,13 @@
 from enum import Enum, unique
 import logging
 import datetime
-from copy import deepcopy
+import heapq
+import collections
 
-from typing import List, Tuple
+from typing import List, Tuple, Dict
 
 import numpy
+import pandas
 from pandas.core.frame import DataFrame
 
 ## from stockdataaccess.pprint import pprint
@@ -42,12 +44,27 @@ _LOGGER = logging.getLogger(__name__)
 #Transaction = Tuple[int, float, float, datetime]
 class Transaction:
 
+    ## compact object without '__dict__'
+    __slots__ = ( "amount", "unitPrice", "commission", "transTime" )
+
     def __init__(self, amount, unitPrice, commission, transTime: datetime.datetime):
         self.amount     = amount                ## amount > 0 -- buy transaction, otherwise sell transaction
         self.unitPrice  = unitPrice
         self.commission = commission
         self.transTime  = transTime
 
+    def __getstate__(self):
+        return ( self.amount, self.unitPrice, self.commission, self.transTime )
+
+    def __setstate__(self, state):
+        if isinstance( state, dict ):
+            ## object stored before introducing '__slots__'
+            state = ( state["amount"], state["unitPrice"], state.get( "commission", 0.0 ), state["transTime"] )
+        self.amount, self.unitPrice, self.commission, self.transTime = state
+
+    def copy(self) -> "Transaction":
+        return Transaction( self.amount, self.unitPrice, self.commission, self.transTime )
+
 #     def __getitem__(self, key):
 #         if key == 0:
 #             return self.amount
@@ -140,18 +157,136 @@ class TransactionMatchMode(Enum):
         return obj
 
 
+## incremental state of matching buy and sell transactions
+## transactions have to be pushed in chronological order (oldest first)
+## state gives the same results as 'TransHistory.matchTransactions()'
+class TransactionsMatchState():
+
+    def __init__(self, mode: TransactionMatchMode):
+        self.mode = mode
+        self.lotsCounter = 0
+        ## current buy transactions (lots) in order of appearance
+        self.lots: Dict[ int, Transaction ] = {}
+        ## heap of pairs (unit price, -lot id), lazily removed
+        self.cheapestHeap: List[ Tuple[float, int] ] = []
+        self.sellList: SellTransactionsMatch = []
+
+    ## returns pair: current buy transactions (most recent first) and matched sell transactions
+    ## returned transactions are copies, so they are not affected by further 'push()' calls
+    def getMatch(self) -> TransactionsMatch:
+        return ( self.getLots(), self.getSells() )
+
+    ## returns copy of current buy transactions (most recent first)
+    def getLots(self) -> BuyTransactionsMatch:
+        return [ item.copy() for item in reversed( self.lots.values() ) ]
+
+    ## returns copy of matched sell transactions
+    def getSells(self) -> SellTransactionsMatch:
+        return [ ( buy.copy(), sell.copy() ) for buy, sell in self.sellList ]
+
+    def push(self, item: Transaction):
+        if item.amount > 0:
+            ## buy transaction
+            lotId = self.lotsCounter
+            self.lotsCounter += 1
+            self.lots[ lotId ] = Transaction( *item )
+            heapq.heappush( self.cheapestHeap, ( item.unitPrice, -lotId ) )
+            return
+        ## sell transaction -- match buy transactions
+        self._reduceLots( item )
+
+    def _reduceLots(self, sellTransaction: Transaction):
+        amount = -sellTransaction.amount
+        while amount > 0:
+            lotId = self._findMatchingLot( sellTransaction )
+            if lotId is None:
+                ## if this happens then it means there is problem with importing transactions history
+                _LOGGER.error( "invalid index %s %s trans: %s %s", lotId, len( self.lots ),
+                               sellTransaction, self.mode )
+                return
+
+            ## reduce amount
+            bestItem: Transaction = self.lots[ lotId ]
+            amountDiff = bestItem.amount - amount
+            if amountDiff > 0:
+                reducedBuy = Transaction( *bestItem )
+                reducedBuy.reduceAmount( amountDiff )
+                bestItem.reduceAmount( amount )
+                self._addSellPair( reducedBuy, sellTransaction )
+                return
+
+            ## bestAmount <= amount
+            amount -= bestItem.amount
+            del self.lots[ lotId ]
+            self._addSellPair( bestItem, sellTransaction )
+
+    def _addSellPair(self, buy: Transaction, sellTransaction: Transaction):
+        sell = Transaction( *sellTransaction )
+        amountDiff = sell.amount + buy.amount
+        sell.reduceAmount( amountDiff )
+        self.sellList.append( ( buy, sell ) )
+
+    def _findMatchingLot(self, sellTransaction: Transaction):
+        if not self.lots:
+            return None
+        if self.mode is TransactionMatchMode.OLDEST:
+            return next( iter( self.lots ) )
+        if self.mode is TransactionMatchMode.BEST:
+            return self._findCheapestLot()
+        if self.mode is TransactionMatchMode.RECENT_PROFIT:
+            sellPrice = sellTransaction.unitPrice
+            for lotId in reversed( self.lots ):
+                item = self.lots[ lotId ]
+                if item.amount < 1:
+                    continue
+                if item.unitPrice < sellPrice:
+                    ## recent profit found -- return
+                    return lotId
+            ## no cheaper found -- find best
+            return self._findCheapestLot()
+
+        _LOGGER.warning("mode not handled: %s, cheapest returned", self.mode)
+        return self._findCheapestLot()
+
+    def _findCheapestLot(self):
+        while self.cheapestHeap:
+            lotId = -self.cheapestHeap[0][1]
+            if lotId in self.lots:
+                return lotId
+            ## lot already sold out
+            heapq.heappop( self.cheapestHeap )
+        return None
+
+
 # Transactions of single stock
 class TransHistory():
 
     def __init__(self):
         ## most recent transaction on top (with index 0)
         self.transactions: List[ Transaction ] = []
+        ## cache of matching transactions (not persisted)
+        self._matchStates: Dict[ TransactionMatchMode, TransactionsMatchState ] = {}
+        ## are transactions sorted by time (not persisted) -- allows binary search
+        self._timeOrdered = True
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop( "_matchStates", None )
+        state.pop( "_timeOrdered", None )
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self._matchStates = {}
+        self._timeOrdered = self.isTimeOrdered()
 
     def __getitem__(self, index):
         return self.transactions[ index ]
 
     def __setitem__(self, index, value):
         self.transactions[ index ] = value
+        self.invalidateMatch()
+        self._timeOrdered = self.isTimeOrdered()
 
     def __len__(self):
         return len( self.transactions )
@@ -161,6 +296,19 @@ class TransHistory():
 
     def clear(self):
         self.transactions.clear()
+        self.invalidateMatch()
+        self._timeOrdered = True
+
+    ## check if transactions are sorted by time (most recent first)
+    def isTimeOrdered(self) -> bool:
+        for i in range( 1, len( self.transactions ) ):
+            if Transaction.sortKey( self.transactions[ i - 1 ] ) < Transaction.sortKey( self.transactions[ i ] ):
+                return False
+        return True
+
+    ## drop cached state of matching transactions
+    def invalidateMatch(self):
+        self._matchStates.clear()
 
     def items(self):
         return self.transactions
@@ -183,10 +331,17 @@ class TransHistory():
         return stockAmount
 
     def append(self, amount, unitPrice, commission, transTime: datetime.datetime = None):
-        self.transactions.insert( 0, Transaction(amount, unitPrice, commission, transTime) )
+        self.appendItem( Transaction(amount, unitPrice, commission, transTime) )
 
     def appendItem(self, item):
-        self.transactions.insert( 0, Transaction( *item ) )
+        newItem = Transaction( *item )
+        if self._timeOrdered and self.transactions:
+            if Transaction.sortKey( newItem ) < Transaction.sortKey( self.transactions[0] ):
+                self._timeOrdered = False
+        self.transactions.insert( 0, newItem )
+        ## new item is most recent -- update matching incrementally
+        for state in self._matchStates.values():
+            state.push( newItem )
 
     def appendList(self, itemList):
         for item in itemList:
@@ -221,29 +376,74 @@ class TransHistory():
         if sameIndex < 0:
             return
         del self.transactions[sameIndex]
+        self.invalidateMatch()
+
+    ## add transactions in bulk -- same result as calling 'add()' for each item in given order
+    # pylint: disable=W0613
+    def addList(self, itemList, joinSimilar=True):
+        if not itemList:
+            return
+        ## similar transactions are not joined (see 'add()')
+        ## recently added transactions precede older ones of the same time
+        newItems = [ Transaction( *item ) for item in reversed( itemList ) ]
+        newItems.extend( self.transactions )
+        self._replaceTransactions( newItems )
+
+    ## remove transactions in bulk -- same result as calling 'rem()' for each item
+    def remList(self, itemList):
+        if not itemList:
+            return
+        remCounter = collections.Counter( tuple( item ) for item in itemList )
+        keepList = []
+        for item in self.transactions:
+            itemKey = tuple( item )
+            if remCounter.get( itemKey, 0 ) > 0:
+                remCounter[ itemKey ] -= 1
+                continue
+            keepList.append( item )
+        if len( keepList ) == len( self.transactions ):
+            return
+        ## removal keeps order of transactions
+        self.transactions = keepList
+        self.invalidateMatch()
+
+    ## replace transactions keeping given order
+    def setTransactions(self, transList: List[ Transaction ]):
+        self.transactions = transList
+        self._timeOrdered = self.isTimeOrdered()
+        self.invalidateMatch()
+
+    def _replaceTransactions(self, transList: List[ Transaction ]):
+        transList.sort( key=Transaction.sortKey, reverse=True )
+        self.transactions = transList
+        self._timeOrdered = True
+        self.invalidateMatch()
 
     ## =============================================================
 
     ## find transaction pointed by 'findTime'
     def findIndex( self, findTime: datetime.datetime ) -> int:
-        tSize = len( self.transactions )
-        for i in range(0, tSize):
-            item = self.transactions[ i ]
-            transTime = item.transTime
-            if findTime > transTime:             ## transactions are in reverse order
-                return i
-        return tSize
+        def is_before( item ):
+            return findTime > item.transTime         ## transactions are in reverse order
+        return self._findFirst( is_before )
 
     ## find transaction with date before given date and return it's index
     def findIndexBefore( self, endDate: datetime.date ) -> int:
+        def is_before( item ):
+            return endDate > item.transTime.date()  ## transactions are in reverse order
+        return self._findFirst( is_before )
+
+    ## find index of first transaction fulfilling predicate
+    ## predicate have to be monotonic in respect of transaction time
+    ## returns size of history if not found
+    def _findFirst( self, predicate ) -> int:
         tSize = len( self.transactions )
-        for i in range(0, tSize):
-            item = self.transactions[ i ]
-            transTime = item.transTime
-            transDate = transTime.date()
-            if endDate > transDate:             ## transactions are in reverse order
-                return i
-        return tSize
+        if self._timeOrdered is False:
+            for i in range(0, tSize):
+                if predicate( self.transactions[ i ] ):
+                    return i
+            return tSize
+        return bisect_first( self.transactions, predicate )
 
     def splitTransactions( self, afterIndex: int, currentAfter=False ) -> Tuple['TransHistory', 'TransHistory']:
         if currentAfter is True:
@@ -326,8 +526,8 @@ class TransHistory():
 
     ## buy transactions in wallet
     def currentTransactions( self, mode: TransactionMatchMode ) -> BuyTransactionsMatch:
-        retPair = self.matchTransactions( mode )
-        return retPair[0]
+        matchState = self.matchState( mode )
+        return matchState.getLots()
 
     ## average buy unit price of current amount of stock
     ## returns pair: (amount, unit_price)
@@ -350,8 +550,8 @@ class TransHistory():
 
     ## returns List[ (buy transaction, sell transaction) ]
     def sellTransactions(self, mode: TransactionMatchMode) -> SellTransactionsMatch:
-        retPair = self.matchTransactions( mode )
-        return retPair[1]
+        matchState = self.matchState( mode )
+        return matchState.getSells()
 
     ## return profit of sold transactions
     def transactionsGain(self, mode: TransactionMatchMode, considerCommission=True):
@@ -483,6 +683,19 @@ class TransHistory():
         ## no need to reverse 'ret'
         return ret
 
+    ## Return array of indexes of transactions (oldest first) valid for each row of 'stockData' ('t' column).
+    ## Transaction is valid since last stock row not after transaction time (see 'matchStockAfterIndices()')
+    ## until next transaction. Value -1 means that there is no valid transaction for row.
+    def matchStockRowsTransactions(self, stockData: DataFrame) -> numpy.ndarray:
+        rowsNum = stockData.shape[0]
+        if not self.transactions:
+            return numpy.full( rowsNum, -1 )
+        stockTimes   = pandas.to_datetime( stockData["t"] ).to_numpy()
+        transTimes   = pandas.to_datetime( [ item.transTime for item in reversed( self.transactions ) ] ).to_numpy()
+        startIndices = numpy.searchsorted( stockTimes, transTimes, side="right" ) - 1
+        startIndices = numpy.maximum( startIndices, 0 )                             # negative index can occur
+        return numpy.searchsorted( startIndices, numpy.arange( rowsNum ), side="right" ) - 1
+
     ## calculate profit of single stock
     def calculateValueHistory( self, stockData: DataFrame ) -> DataFrame:
         if stockData is None:
@@ -495,42 +708,24 @@ class TransHistory():
         # transBefore: TransHistory
         # pendingTrans: TransHistory
         transBefore, pendingTrans = self.splitTransactions( transStartIndex, True )
-        revPending                = pendingTrans[::-1]                           ## reverse list
-
-        stockValuesFrame = stockData[ ["t"] ].copy()
-        stockValuesFrame["c"] = 0.0
-        rowsNum = stockData.shape[0]
 
-        matchStockIndices = pendingTrans.matchStockAfterIndices( stockValuesFrame )
-        matchStockIndices.reverse()
+        ## amount of stock after each pending transaction
+        pendingAmounts = numpy.array( [ item.amount for item in reversed( pendingTrans.transactions ) ] )
+        transAmounts   = transBefore.currentAmount() + numpy.cumsum( pendingAmounts )
+        transAmounts   = numpy.append( transAmounts, 0 )            ## amount for rows without transaction
 
-        matchSize = len( matchStockIndices )
-
-        matchStockIndices.append( rowsNum )
-
-        ## iterate over transactions
         ## calculate values based on transactions and stock price changes
-        for transIndex in range(0, matchSize):
-            nextTrans = revPending[ transIndex ]
-            transBefore.appendItem( nextTrans )
-            transAmount = transBefore.currentAmount()
+        rowsTrans   = pendingTrans.matchStockRowsTransactions( stockData )
+        rowsAmount  = transAmounts[ rowsTrans ]                     ## index -1 points to last item (zero)
+        stockPrices = stockData["c"].to_numpy( dtype=float )
+        sellValues  = numpy.where( rowsAmount > 0, stockPrices * rowsAmount, 0.0 )
 
-            ## iterate over stock historic prices
-            rowStartIndex = matchStockIndices[ transIndex ]
-            rowStartIndex = max( rowStartIndex, 0 )                 # negative index can occur
-            rowEndIndex = matchStockIndices[ transIndex + 1 ]
-            for rowIndex in range(rowStartIndex, rowEndIndex):
-                sellValue = 0
-                if transAmount > 0:
-                    stockPrice = stockData.at[ rowIndex, "c" ]
-                    sellValue  = stockPrice * transAmount
-                    # sellValue -= broker_commission( sellValue )
-                stockValuesFrame.at[ rowIndex, "c" ] = sellValue
+        stockValuesFrame = stockData[ ["t"] ].copy()
+        stockValuesFrame["c"] = sellValues
 
         ret_data = trim_frame( stockValuesFrame, "c" )
         if ret_data is not None:
-            ret_data['t'] = ret_data['t'].apply(lambda x: x.date())
-            # ret_data.loc[:,'t'] = ret_data['t'].apply(lambda x: x.date())
+            ret_data['t'] = pandas.to_datetime( ret_data['t'] ).dt.date
         return ret_data
 
     ## calculate profit of single stock
@@ -545,58 +740,89 @@ class TransHistory():
 
         transStartIndex           = self.findIndex( startDateTime )
         transBefore, pendingTrans = self.splitTransactions( transStartIndex, True )
-        revPending                = pendingTrans[::-1]                           ## reverse list
-
-        stockValuesFrame = stockData[ ["t"] ].copy()
-        stockValuesFrame["c"] = 0.0
-        rowsNum = stockData.shape[0]
 
-        matchStockIndices = pendingTrans.matchStockAfterIndices( stockValuesFrame )
-        matchStockIndices.reverse()
+        ## amount of stock and profit constant after each pending transaction
+        transAmounts, transProfits = self.calculateSegmentsProfit( transBefore, pendingTrans,
+                                                                   transMode, calculateOverall )
+        transAmounts = numpy.append( transAmounts, 0 )              ## values for rows without transaction
+        transProfits = numpy.append( transProfits, 0.0 )
 
-        matchSize = len( matchStockIndices )
-
-        matchStockIndices.append( rowsNum )
-
-        ## iterate over transactions
         ## calculate values based on transactions and stock price changes
-        for transIndex in range(0, matchSize):
-            nextTrans = revPending[ transIndex ]
-            transBefore.appendItem( nextTrans )
-            transAmount = transBefore.currentAmount()
-
-            transProfit = 0.0
-            if calculateOverall:
-                transProfit = transBefore.transactionsOverallProfit()
-            else:
-                ## cost of stock buy
-                buyAmount, buyUnitPrice = transBefore.currentTransactionsAvg( transMode )
-                buyValue = buyAmount * buyUnitPrice
-                transProfit -= buyValue
+        rowsTrans   = pendingTrans.matchStockRowsTransactions( stockData )
+        rowsAmount  = transAmounts[ rowsTrans ]                     ## index -1 points to last item (zero)
+        stockPrices = stockData["c"].to_numpy( dtype=float )
 
-            ## iterate over stock historic prices
-            rowStartIndex = matchStockIndices[ transIndex ]
-            rowStartIndex = max( rowStartIndex, 0 )                 # negative index can occur
-            rowEndIndex = matchStockIndices[ transIndex + 1 ]
-            # _LOGGER.info( f"cccccccccccccccc: {rowStartIndex} {rowEndIndex} - {matchStockIndices}" )
-            for rowIndex in range(rowStartIndex, rowEndIndex):
-                sellValue = 0
-                if transAmount > 0:
-                    ## calculate hypotetical profit if stock would be sold out
-                    stockTime  = stockData.at[ rowIndex, "t" ]
-                    stockPrice = stockData.at[ rowIndex, "c" ]
-                    sellValue  = stockPrice * transAmount
-                    sellValue -= broker_commission( sellValue, stockTime )
-                profit_value = transProfit + sellValue
-                stockValuesFrame.at[ rowIndex, "c" ] = profit_value
+        ## calculate hypotetical profit if stock would be sold out
+        sellValues  = stockPrices * rowsAmount
+        sellValues -= broker_commission_array( sellValues, stockData["t"] )
+        sellValues  = numpy.where( rowsAmount > 0, sellValues, 0.0 )
+        profitValues = numpy.where( rowsTrans < 0, 0.0, transProfits[ rowsTrans ] + sellValues )
+
+        stockValuesFrame = stockData[ ["t"] ].copy()
+        stockValuesFrame["c"] = profitValues
 
         ret_data = trim_frame( stockValuesFrame, "c" )
         if ret_data is not None:
-            ret_data['t'] = ret_data['t'].apply(lambda x: x.date())
-            # ret_data.loc[:,'t'] = ret_data['t'].apply(lambda x: x.date())
+            ret_data['t'] = pandas.to_datetime( ret_data['t'] ).dt.date
         return ret_data
 
+    ## calculate amount of stock and profit constant after each transaction of 'pendingTrans'
+    ## profit constant is overall profit of transactions or negative value of current buy transactions
+    ## returns pair of arrays (oldest transaction first)
+    @staticmethod
+    def calculateSegmentsProfit( transBefore: 'TransHistory', pendingTrans: 'TransHistory',
+                                 transMode: TransactionMatchMode, calculateOverall: bool = True ):
+        pendingList = list( reversed( pendingTrans.transactions ) )
+        pendingAmounts = numpy.array( [ item.amount for item in pendingList ], dtype=float )
+        transAmounts   = transBefore.currentAmount() + numpy.cumsum( pendingAmounts )
+
+        if calculateOverall:
+            pendingValues = numpy.array( [ item.getValue( True ) for item in pendingList ], dtype=float )
+            transProfits  = transBefore.transactionsOverallProfit() - numpy.cumsum( pendingValues )
+            return ( transAmounts, transProfits )
+
+        ## single pass of matching transactions -- the same as 'matchTransactions()' called after each transaction
+        currTransactions = TransHistory()
+
+        def match_item( item ):
+            if item.amount > 0:
+                currTransactions.appendItem( item )
+            else:
+                currTransactions.reduceTransactions( item, transMode )
+
+        for item in reversed( transBefore.transactions ):
+            match_item( item )
+
+        transProfits = numpy.zeros( len( pendingList ) )
+        for transIndex, item in enumerate( pendingList ):
+            match_item( item )
+            ## cost of stock buy
+            buyValue = 0.0
+            for buyItem in currTransactions.transactions:
+                buyValue += buyItem.getValue( True )
+            transProfits[ transIndex ] = -buyValue
+        return ( transAmounts, transProfits )
+
     def matchTransactions( self, mode: TransactionMatchMode, matchTime: datetime.datetime = None ) -> TransactionsMatch:
+        if matchTime is not None:
+            return self.replayTransactions( mode, matchTime )
+        matchState = self.matchState( mode )
+        return matchState.getMatch()
+
+    ## cached incremental state of matching transactions
+    ## state object is replaced when history is modified in other way than appending recent transaction
+    def matchState( self, mode: TransactionMatchMode ) -> TransactionsMatchState:
+        matchState = self._matchStates.get( mode )
+        if matchState is None:
+            matchState = TransactionsMatchState( mode )
+            for item in reversed( self.transactions ):
+                matchState.push( item )
+            self._matchStates[ mode ] = matchState
+        return matchState
+
+    ## match transactions from scratch
+    def replayTransactions( self, mode: TransactionMatchMode,
+                            matchTime: datetime.datetime = None ) -> TransactionsMatch:
         ## Buy value raises then current unit price rises
         ## Sell value raises then current unit price decreases
         sellList = []
@@ -617,7 +843,7 @@ class TransHistory():
 #                 _LOGGER.info( "invalid reduction: %s %s", item, mode )
 #                 pprint( self.transactions )
             for buy in reducedBuy:
-                sell = deepcopy( item )
+                sell = item.copy()
                 amountDiff = sell.amount + buy.amount
                 sell.reduceAmount( amountDiff )
                 pair = ( buy, sell )
@@ -649,12 +875,14 @@ class TransHistory():
                                sellTransaction, mode )
                 return retList
 
+            self.invalidateMatch()
+
             ## reduce amount
             bestItem: Transaction = self.transactions[ bestIndex ]
             bestAmount = bestItem.amount
             amountDiff = bestAmount - amount
             if amountDiff > 0:
-                bestCopied = deepcopy( bestItem )
+                bestCopied = bestItem.copy()
                 bestCopied.reduceAmount( amountDiff )
                 retList.append( bestCopied )
                 bestItem.reduceAmount( amount )
@@ -710,7 +938,16 @@ class TransHistory():
         return self.findCheapest()
 
     def _findSame(self, unit_price, trans_date, amount, commission):
-        for i, item in enumerate( self.transactions ):
+        startIndex = 0
+        if self._timeOrdered and trans_date is not None:
+            ## skip transactions made after 'trans_date'
+            searchKey = Transaction.sortKey( Transaction( amount, unit_price, commission, trans_date ) )
+            startIndex = bisect_first( self.transactions, lambda item: Transaction.sortKey( item ) <= searchKey )
+        for i in range( startIndex, len( self.transactions ) ):
+            item = self.transactions[ i ]
+            if self._timeOrdered and trans_date is not None and item.transTime != trans_date:
+                ## all transactions with 'trans_date' checked
+                return -1
             itemAmount, itemPrice, itemCommission, itemTime = item
             if itemAmount != amount:
                 continue
@@ -736,7 +973,11 @@ class TransHistory():
 #         return -1
 
     def sort(self):
+        if self._timeOrdered:
+            return
         self.transactions.sort( key=Transaction.sortKey, reverse=True )
+        self._timeOrdered = True
+        self.invalidateMatch()
 
 
 ## =======================================================
@@ -757,6 +998,33 @@ def broker_commission( value, transTime=None ):
     return commission
 
 
+## vectorized version of 'broker_commission()'
+def broker_commission_array( values, transTimes=None ) -> numpy.ndarray:
+    ## always returns positive values
+    values = numpy.abs( numpy.asarray( values, dtype=float ) )
+    if transTimes is None:
+        minCommission = broker_commission( 0.0 )
+    else:
+        transTimes    = pandas.to_datetime( numpy.asarray( transTimes ) ).to_numpy()
+        minCommission = numpy.where( transTimes >= numpy.datetime64( "2020-10-07" ), 5.0, 3.0 )
+    return numpy.maximum( values * 0.0039, minCommission )
+
+
+## binary search of first item in list fulfilling predicate
+## predicate have to be False for all items before found item and True for rest of items
+## returns size of list if not found
+def bisect_first( itemsList, predicate ) -> int:
+    low  = 0
+    high = len( itemsList )
+    while low < high:
+        mid = ( low + high ) // 2
+        if predicate( itemsList[ mid ] ):
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
+
 def trim_frame( stockValuesFrame, column_name ):
     numeric_data = stockValuesFrame.loc[:, column_name].values
     non_zero_index = numpy.argmax(numeric_data != 0, axis=0)
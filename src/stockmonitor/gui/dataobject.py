@@ -31,8 +31,10 @@ from pandas.core.frame import DataFrame
 from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtWidgets import QWidget, QUndoStack
 
+from stockdataaccess.dataaccess.datatype import StockDataType
 from stockdataaccess.dataaccess.gpw.gpwcurrentdata import GpwCurrentStockData, \
     GpwCurrentIndexesData
+from stockdataaccess.dataaccess.gpw.gpwinstruments import get_instruments_provider
 from stockdataaccess.dataaccess.gpw.gpwdata import GpwIndicatorsData
 from stockdataaccess.dataaccess.gpw.gpwespidata import GpwESPIData
 from stockdataaccess.dataaccess.finreportscalendardata import FinRepsCalendarData, PublishedFinRepsCalendarData
@@ -110,6 +112,8 @@ class DataObject( QObject ):
         self.favsGrpChanged.connect( self.updateAllFavsGroup )
         self.favsChanged.connect( self.updateAllFavsGroup )
 
+        self.stockDataChanged.connect( self.updateInstrumentsTickers )
+
     def store( self, outputDir ):
         return self.dataContainer.store( outputDir )
 
@@ -360,6 +364,10 @@ class DataObject( QObject ):
 
     ## ======================================================================
 
+    def updateInstrumentsTickers(self):
+        tickersDict = self.gpwCurrentData.getData( StockDataType.TICKER )
+        get_instruments_provider().updateTickers( tickersDict )
+
     def loadDownloadedStocks(self):
         return self.dataContainer.loadDownloadedStocks()
 
@@ -0,0 +1,553 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import copy
+import math
+
+from typing import Dict, List, Tuple
+
+import numpy
+from pandas import DataFrame, Series
+
+from PyQt5 import QtCore
+from PyQt5.QtCore import QModelIndex
+from PyQt5.QtCore import QAbstractTableModel
+from PyQt5.QtGui import QColor
+
+## workaround for mypy type errors
+from PyQt5.QtCore import Qt
+
+
+QtDisplayRole = Qt.DisplayRole                  # type: ignore
+QtUserRole = Qt.UserRole                        # type: ignore
+QtTextAlignmentRole = Qt.TextAlignmentRole      # type: ignore
+QtForegroundRole = Qt.ForegroundRole            # type: ignore
+QtBackgroundRole = Qt.BackgroundRole            # type: ignore
+QtAlignHCenter = Qt.AlignHCenter                # type: ignore
+QtAlignVCenter = Qt.AlignVCenter                # type: ignore
+QtAscendingOrder = Qt.AscendingOrder            # type: ignore
+
+
+def is_nan( value ):
+    try:
+        return math.isnan( value )
+    except TypeError:
+        return False
+
+
+def is_invalid_number( value ):
+    if value is None:
+        return True
+    if value in ("-", "--", "x", ""):
+        return True
+    if is_nan( value ):
+        return True
+    return False
+
+
+class TableRowColorDelegate():
+
+    STOCK_FAV_BGCOLOR    = QColor( "beige" )
+    STOCK_GRAY_BGCOLOR   = QColor( "#f0f0f0" )
+    STOCK_WALLET_BGCOLOR = QColor( "palegreen" )
+
+    def __init__(self):
+        self.parent: 'DataFrameTableModel' = None
+
+    def foreground(self, _: QModelIndex ):
+        ## reimplement if needed
+        return None
+
+    def background(self, _: QModelIndex ):
+        ## reimplement if needed
+        return None
+
+    def setParent(self, newParent):
+        self.parent = newParent
+
+
+## column-wise copy of DataFrame content: raw values and display strings
+## allows access to cells by plain array indexing (without 'DataFrame.iloc')
+class DataFrameBuffer():
+
+    def __init__(self, data: DataFrame = None):
+        ## raw values -- the same as returned by 'DataFrame.iloc[row, col]'
+        self.rawColumns: List[ numpy.ndarray ]     = []
+        ## values converted to 'str'
+        self.displayColumns: List[ numpy.ndarray ] = []
+        if data is not None:
+            self.setContent( data )
+
+    def setContent(self, data: DataFrame):
+        self.rawColumns     = []
+        self.displayColumns = []
+        colsNum = data.shape[1]
+        for col in range( colsNum ):
+            rawColumn = DataFrameBuffer.columnArray( data.iloc[ :, col ] )
+            displayColumn = numpy.array( [ str( value ) for value in rawColumn ], dtype=object )
+            self.rawColumns.append( rawColumn )
+            self.displayColumns.append( displayColumn )
+
+    ## returns array of column values -- the same as returned by 'Series.iloc[row]'
+    @staticmethod
+    def columnArray( column: Series ) -> numpy.ndarray:
+        if isinstance( column.dtype, numpy.dtype ) and column.dtype.kind in "biufcO":
+            ## numeric and object columns -- indexing gives the same scalars as 'iloc'
+            return column.to_numpy()
+        ## datetime and extension types -- keep pandas scalars (e.g. 'Timestamp')
+        rawColumn = numpy.empty( len( column ), dtype=object )
+        rawColumn[:] = list( column.array )
+        return rawColumn
+
+    def rawValue(self, row, col):
+        return self.rawColumns[ col ][ row ]
+
+    def displayValue(self, row, col):
+        return self.displayColumns[ col ][ row ]
+
+
+class DataFrameTableModel( QAbstractTableModel ):
+
+    def __init__(self, data: DataFrame):
+        super().__init__()
+        self._rawData: DataFrame                   = data
+        self.customHeader: Dict[ int, str ]        = {}
+        self.colorDelegate: TableRowColorDelegate  = None
+        ## buffered mode: content materialized in 'setContent', None if mode disabled (default)
+        self._buffer: DataFrameBuffer              = None
+        ## column identifying rows (e.g. ticker), None means data frame index
+        self._keyColumn = None
+        ## incremented on every content change
+        self._contentVersion = 0
+        self._contentChanged()
+
+    ## in buffered mode cells are read from arrays prepared once per content
+    ## data frame should not be modified after passing to the model
+    ## preparing display strings costs conversion of every cell, so the mode
+    ## pays off for tables that are refreshed often and viewed as a whole
+    def setBufferedMode(self, enabled: bool):
+        self.beginResetModel()
+        self._buffer = DataFrameBuffer() if enabled else None
+        self._contentChanged()
+        self.endResetModel()
+
+    def isBufferedMode(self) -> bool:
+        return self._buffer is not None
+
+    def contentVersion(self) -> int:
+        return self._contentVersion
+
+    ## rows of new content are considered the same as old ones if key column values are equal
+    def setKeyColumn(self, col):
+        self._keyColumn = col
+
+    ## returns array of raw values of given column (the same as returned for 'UserRole')
+    def columnValues(self, col) -> numpy.ndarray:
+        if self._buffer is not None:
+            return self._buffer.rawColumns[ col ]
+        return self._rawData.iloc[ :, col ].to_numpy()
+
+    ## returns array of values of given column converted to 'str' (the same as returned for 'DisplayRole')
+    def columnDisplayValues(self, col) -> numpy.ndarray:
+        if self._buffer is not None:
+            return self._buffer.displayColumns[ col ]
+        rawColumn = self.columnValues( col )
+        return numpy.array( [ str( value ) for value in rawColumn ], dtype=object )
+
+    def _contentChanged(self, newBuffer: DataFrameBuffer = None):
+        self._contentVersion += 1
+        ## called by Qt very often (e.g. on every index validation)
+        self._shape = ( 0, 0 ) if self._rawData is None else self._rawData.shape
+        if self._buffer is None:
+            return
+        if self._rawData is None:
+            self._buffer = DataFrameBuffer()
+            return
+        if newBuffer is not None:
+            self._buffer = newBuffer
+            return
+        self._buffer.setContent( self._rawData )
+
+    def setColorDelegate(self, decorator: TableRowColorDelegate):
+        self.beginResetModel()
+        self.colorDelegate = decorator
+        decorator.setParent( self )
+        self.endResetModel()
+
+    ## in buffered mode content of the same structure (shape, columns and row keys)
+    ## is updated in place -- 'dataChanged' is emitted only for changed cells,
+    ## so views keep selection, scroll position and proxies keep their state
+    def setContent(self, data: DataFrame):
+        newBuffer = None
+        if self._buffer is not None and data is not None:
+            newBuffer = DataFrameBuffer( data )
+            changedBlocks = self._changedBlocks( data, newBuffer )
+            if changedBlocks is not None:
+                self._rawData = data
+                self._contentChanged( newBuffer )
+                for top, left, bottom, right in changedBlocks:
+                    self.dataChanged.emit( self.index( top, left ), self.index( bottom, right ) )
+                return
+        self.beginResetModel()
+        self._rawData = data
+        self._contentChanged( newBuffer )
+        self.endResetModel()
+
+    ## returns list of blocks (top, left, bottom, right) of changed cells
+    ## returns None if structure of data changed (model have to be reset)
+    def _changedBlocks(self, data: DataFrame, newBuffer: DataFrameBuffer):
+        oldData = self._rawData
+        if oldData is None or oldData.shape != data.shape:
+            return None
+        if not oldData.columns.equals( data.columns ):
+            return None
+        if self._keyColumn is None:
+            if not oldData.index.equals( data.index ):
+                return None
+        elif self._keyColumn >= data.shape[1]:
+            return None
+        else:
+            oldKeys = self._buffer.displayColumns[ self._keyColumn ]
+            newKeys = newBuffer.displayColumns[ self._keyColumn ]
+            if not numpy.array_equal( oldKeys, newKeys ):
+                return None
+
+        rowsNum, colsNum = data.shape
+        if rowsNum < 1 or colsNum < 1:
+            return []
+
+        ## columns x rows
+        changedMask = numpy.zeros( ( colsNum, rowsNum ), dtype=bool )
+        for col in range( colsNum ):
+            if self._buffer.rawColumns[ col ].dtype != newBuffer.rawColumns[ col ].dtype:
+                changedMask[ col ] = True
+                continue
+            changedMask[ col ] = self._buffer.displayColumns[ col ] != newBuffer.displayColumns[ col ]
+
+        changedRows = numpy.flatnonzero( changedMask.any( axis=0 ) )
+        if len( changedRows ) < 1:
+            return []
+
+        ## split rows into ranges of consecutive indexes
+        splitPoints = numpy.flatnonzero( numpy.diff( changedRows ) > 1 )
+        topRows     = [ changedRows[0] ] + list( changedRows[ splitPoints + 1 ] )
+        bottomRows  = list( changedRows[ splitPoints ] ) + [ changedRows[-1] ]
+
+        ret = []
+        for top, bottom in zip( topRows, bottomRows ):
+            top    = int( top )
+            bottom = int( bottom )
+            if self.colorDelegate is not None:
+                ## colors are calculated per row -- update whole rows
+                ret.append( ( top, 0, bottom, colsNum - 1 ) )
+                continue
+            changedCols = numpy.flatnonzero( changedMask[ :, top:bottom + 1 ].any( axis=1 ) )
+            ret.append( ( top, int( changedCols[0] ), bottom, int( changedCols[-1] ) ) )
+        return ret
+
+    def setHeaders(self, headersDict, orientation=QtCore.Qt.Horizontal):
+        if headersDict is not None:
+            self.customHeader = copy.deepcopy( headersDict )
+        else:
+            self.customHeader = {}
+        colsNum = self.columnCount()
+        self.headerDataChanged.emit( orientation, 0, colsNum - 1 )
+
+    # pylint: disable=W0613
+    def rowCount(self, parent=None):
+        return self._shape[0]
+
+    # pylint: disable=W0613
+    def columnCount(self, parnet=None):
+        return self._shape[1]
+
+    def headerData(self, section, orientation, role):
+        if orientation == QtCore.Qt.Horizontal and role == QtDisplayRole:
+            headerValue = self.customHeader.get( section, None )
+            if headerValue is not None:
+                return headerValue
+            colName = self._rawData.columns[section]
+            if isinstance(colName, tuple):
+                return colName[0]
+            return colName
+        return super().headerData( section, orientation, role )
+
+    def setHeaderData(self, section, orientation, value, _=QtDisplayRole):
+        self.customHeader[ section ] = value
+        self.headerDataChanged.emit( orientation, section, section )
+        return True
+
+    def data(self, index: QModelIndex, role=QtDisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == QtDisplayRole:
+            if self._buffer is not None:
+                return self._buffer.displayValue( index.row(), index.column() )
+            rawData = self._rawData.iloc[index.row(), index.column()]
+            strData = str(rawData)
+            return strData
+        if role == QtUserRole:
+            if self._buffer is not None:
+                return self._buffer.rawValue( index.row(), index.column() )
+            rawData = self._rawData.iloc[index.row(), index.column()]
+            return rawData
+        if role == QtTextAlignmentRole:
+            return QtAlignHCenter | QtAlignVCenter
+
+        if self.colorDelegate is not None:
+            if role == QtForegroundRole:
+                return self.colorDelegate.foreground( index )
+            if role == QtBackgroundRole:
+                return self.colorDelegate.background( index )
+
+        return None
+
+
+## model of big data frames: rows are presented in chunks fetched on demand ('canFetchMore', 'fetchMore')
+## sorting and filtering is done on whole data frame (see 'sortRows' and 'filterRows'),
+## row of model points to row of data frame through 'dataRow()'
+class ChunkedDataFrameTableModel( DataFrameTableModel ):
+
+    def __init__(self, data: DataFrame, chunkSize=1000):
+        ## attributes used in '_contentChanged' called by base constructor
+        self.chunkSize = chunkSize
+        ## rows of data frame after filtering and sorting
+        self._rowsOrder: numpy.ndarray = numpy.arange( 0 )
+        ## number of fetched rows
+        self._fetchedRows = 0
+        ## columns of data frame (raw values) -- extracted on first access
+        self._dataColumns: Dict[ int, numpy.ndarray ] = {}
+        ## pair: ( column, order ), None means natural order of data frame
+        self._sortState: Tuple[ int, int ] = None
+        ## triple: ( column, condition, filter value )
+        self._filterState: Tuple[ int, int, str ] = None
+        super().__init__( data )
+
+    ## content is never materialized
+    def setBufferedMode(self, enabled: bool):
+        pass
+
+    def setContent(self, data: DataFrame):
+        self.beginResetModel()
+        self._rawData = data
+        self._contentChanged()
+        self.endResetModel()
+
+    ## negative column restores natural order (e.g. after clearing sort indicator)
+    def sortRows(self, column, order=QtAscendingOrder):
+        newState = None
+        if column is not None and column >= 0:
+            newState = ( column, order )
+        if newState == self._sortState:
+            return
+        self.beginResetModel()
+        self._sortState = newState
+        self._contentChanged()
+        self.endResetModel()
+
+    ## 'condition' -- the same as in 'DFProxyModel'
+    def filterRows(self, column, condition, filterValue: str):
+        newState = None
+        if column is not None and column >= 0 and filterValue:
+            newState = ( column, condition, filterValue )
+        if newState == self._filterState:
+            return
+        self.beginResetModel()
+        self._filterState = newState
+        self._contentChanged()
+        self.endResetModel()
+
+    ## number of rows after filtering (including not fetched)
+    def totalRowCount(self) -> int:
+        return len( self._rowsOrder )
+
+    ## returns index of data frame row presented in given row of model
+    def dataRow(self, row) -> int:
+        return int( self._rowsOrder[ row ] )
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._fetchedRows < len( self._rowsOrder )
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        fetchEnd = min( self._fetchedRows + self.chunkSize, len( self._rowsOrder ) )
+        if fetchEnd <= self._fetchedRows:
+            return
+        self.beginInsertRows( QModelIndex(), self._fetchedRows, fetchEnd - 1 )
+        self._fetchedRows = fetchEnd
+        self._contentVersion += 1
+        self._shape = ( self._fetchedRows, self._shape[1] )
+        self.endInsertRows()
+
+    ## returns raw values of fetched rows
+    def columnValues(self, col) -> numpy.ndarray:
+        return self._dataColumn( col )[ self._rowsOrder[ :self._fetchedRows ] ]
+
+    def _dataColumn(self, col) -> numpy.ndarray:
+        dataColumn = self._dataColumns.get( col )
+        if dataColumn is None:
+            dataColumn = DataFrameBuffer.columnArray( self._rawData.iloc[ :, col ] )
+            self._dataColumns[ col ] = dataColumn
+        return dataColumn
+
+    def _contentChanged(self, newBuffer: DataFrameBuffer = None):
+        self._contentVersion += 1
+        self._dataColumns = {}
+        if self._rawData is None:
+            self._rowsOrder = numpy.arange( 0 )
+            self._fetchedRows = 0
+            self._shape = ( 0, 0 )
+            return
+        rowsNum, colsNum = self._rawData.shape
+        rowsOrder = numpy.arange( rowsNum )
+
+        ascendingOrder = True
+        if self._sortState is not None and self._sortState[0] < colsNum:
+            sortColumn, sortOrder = self._sortState
+            ascendingOrder = sortOrder == QtAscendingOrder
+            ranks = sort_ranks( self._dataColumn( sortColumn ) )
+            rowsOrder = sort_permutation( ranks, ascendingOrder )
+
+        if self._filterState is not None and self._filterState[0] < colsNum:
+            filterColumn, condition, filterValue = self._filterState
+            strValues = numpy.array( [ str( value ) for value in self._dataColumn( filterColumn ) ], dtype=object )
+            mask = filter_mask( filter_values( strValues ), condition, filterValue, ascendingOrder )
+            rowsOrder = rowsOrder[ mask[ rowsOrder ] ]
+
+        self._rowsOrder = rowsOrder
+        self._fetchedRows = min( self.chunkSize, len( rowsOrder ) )
+        self._shape = ( self._fetchedRows, colsNum )
+
+    def data(self, index: QModelIndex, role=QtDisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtDisplayRole:
+            rawData = self._dataColumn( index.column() )[ self._rowsOrder[ index.row() ] ]
+            return str( rawData )
+        if role == QtUserRole:
+            return self._dataColumn( index.column() )[ self._rowsOrder[ index.row() ] ]
+        return super().data( index, role )
+
+
+## ===========================================================
+
+
+## rank of each value in ascending order, equal values have equal rank
+## values convertible to numbers are compared numerically, the rest is compared as strings
+## and ranked after numbers, invalid numbers (None, NaN, "-") have rank -1
+def sort_ranks( values ) -> numpy.ndarray:
+    values = numpy.asarray( values )
+    ranks  = numpy.full( len( values ), -1, dtype=numpy.int64 )
+    if values.dtype.kind in "biuf":
+        validMask = ~numpy.isnan( values ) if values.dtype.kind == "f" else numpy.full( len( values ), True )
+        keys = values[ validMask ]
+        if keys.size > 0:
+            _, ranks[ validMask ] = numpy.unique( keys, return_inverse=True )
+        return ranks
+
+    validMask   = numpy.array( [ not is_invalid_number( value ) for value in values ], dtype=bool )
+    validValues = values[ validMask ]
+    numbers     = numpy.full( len( validValues ), numpy.nan )
+    for i, value in enumerate( validValues ):
+        try:
+            numbers[ i ] = float( value )
+        except (TypeError, ValueError):
+            pass
+    parsedMask = ~numpy.isnan( numbers )
+    validRanks = numpy.zeros( len( validValues ), dtype=numpy.int64 )
+    numbersNum = 0
+    if parsedMask.any():
+        uniqueNumbers, validRanks[ parsedMask ] = numpy.unique( numbers[ parsedMask ], return_inverse=True )
+        numbersNum = len( uniqueNumbers )
+    if not parsedMask.all():
+        strValues = numpy.array( [ str( value ) for value in validValues[ ~parsedMask ] ], dtype=object )
+        _, strRanks = numpy.unique( strValues, return_inverse=True )
+        validRanks[ ~parsedMask ] = strRanks + numbersNum
+    ranks[ validMask ] = validRanks
+    return ranks
+
+
+## indexes of values in sorted order, 'ranks' is result of 'sort_ranks()'
+## order of equal values is kept, invalid values are put on bottom
+def sort_permutation( ranks, ascendingOrder=True ) -> numpy.ndarray:
+    validMask = ranks >= 0
+    if ascendingOrder:
+        sortKeys = ranks
+    else:
+        sortKeys = -ranks
+    permutation = numpy.argsort( sortKeys, kind="stable" )
+    return numpy.concatenate( ( permutation[ validMask[ permutation ] ],
+                                permutation[ ~validMask[ permutation ] ] ) )
+
+
+## values of column prepared for filtering: strings, parsed numbers (NaN if not a number),
+## mask of parsed numbers and mask of invalid numbers
+def filter_values( strValues ) -> Tuple[ numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray ]:
+    strValues   = numpy.asarray( strValues, dtype=object )
+    numbers     = numpy.full( len( strValues ), numpy.nan )
+    parsedMask  = numpy.full( len( strValues ), False )
+    for i, value in enumerate( strValues ):
+        try:
+            numbers[ i ]    = float( value )
+            parsedMask[ i ] = True
+        except ValueError:
+            pass
+    invalidMask = numpy.isin( strValues, [ "-", "--", "x", "" ] )
+    return ( strValues, numbers, parsedMask, invalidMask )
+
+
+## vectorized version of 'DFProxyModel.filterAcceptsRow()'
+## 'columnValues' is result of 'filter_values()'
+def filter_mask( columnValues, condition, filterValue: str, ascendingOrder=True ) -> numpy.ndarray:
+    strValues = columnValues[0]
+    if condition == 3:
+        ## contains
+        return numpy.array( [ filterValue in value for value in strValues ], dtype=bool )
+
+    filterData = filter_values( [ filterValue ] )
+    filterData = tuple( item[0] for item in filterData )
+
+    ## vectorized 'DFProxyModel.valueLessThan()' for strings
+    def less_than( leftData, rightData ):
+        leftStr, leftNum, leftParsed, leftInvalid     = leftData
+        rightStr, rightNum, rightParsed, rightInvalid = rightData
+        compared = numpy.where( leftParsed & rightParsed, leftNum < rightNum, leftStr < rightStr )
+        ## put no-data rows on bottom
+        compared = numpy.where( rightInvalid, ascendingOrder, compared )
+        compared = numpy.where( leftInvalid, not ascendingOrder, compared )
+        return numpy.broadcast_to( compared, strValues.shape ).astype( bool )
+
+    if condition == 0:
+        ## greater than
+        return less_than( filterData, columnValues )
+    if condition == 1:
+        ## equal
+        return ~less_than( columnValues, filterData ) & ~less_than( filterData, columnValues )
+    if condition == 2:
+        ## less than
+        return less_than( columnValues, filterData )
+    return numpy.full( len( strValues ), False )
@@ -26,22 +26,20 @@ import copy
 import re
 import io
 import csv
-import math
 
 from typing import Dict
 
 from urllib.parse import urlparse
+import numpy
 from pandas import DataFrame
 
 from PyQt5 import QtCore, QtWidgets, QtGui
 from PyQt5.QtCore import QModelIndex, QUrl
 from PyQt5.QtCore import pyqtSignal
-from PyQt5.QtCore import QAbstractTableModel
 from PyQt5.QtWidgets import QTableView, QTableWidgetItem
 from PyQt5.QtWidgets import QMenu
 from PyQt5.QtGui import QCursor
 from PyQt5.QtGui import QDesktopServices
-from PyQt5.QtGui import QColor
 
 ## workaround for mypy type errors
 from PyQt5.QtCore import Qt
@@ -49,16 +47,13 @@ from PyQt5.QtCore import Qt
 from .. import uiloader
 from .. import guistate
 
+from .dataframemodel import QtDisplayRole, QtUserRole, QtAscendingOrder
+from .dataframemodel import is_invalid_number, sort_ranks, filter_values, filter_mask
+from .dataframemodel import TableRowColorDelegate, DataFrameTableModel, ChunkedDataFrameTableModel
+
 
 QtChecked = Qt.Checked                          # type: ignore
 QtUnchecked = Qt.Unchecked                      # type: ignore
-QtDisplayRole = Qt.DisplayRole                  # type: ignore
-QtUserRole = Qt.UserRole                        # type: ignore
-QtTextAlignmentRole = Qt.TextAlignmentRole      # type: ignore
-QtForegroundRole = Qt.ForegroundRole            # type: ignore
-QtBackgroundRole = Qt.BackgroundRole            # type: ignore
-QtAlignHCenter = Qt.AlignHCenter                # type: ignore
-QtAlignVCenter = Qt.AlignVCenter                # type: ignore
 QtItemIsEditable = Qt.ItemIsEditable            # type: ignore
 
 
@@ -69,23 +64,6 @@ _LOGGER = logging.getLogger(__name__)
 TableSettingsDialogUiClass, TableSettingsDialogBaseClass = uiloader.load_ui_from_module_path( "widget/tablesettingsdialog" )
 
 
-def is_nan( value ):
-    try:
-        return math.isnan( value )
-    except TypeError:
-        return False
-
-
-def is_invalid_number( value ):
-    if value is None:
-        return True
-    if value in ("-", "--", "x", ""):
-        return True
-    if is_nan( value ):
-        return True
-    return False
-
-
 class TableSettingsDialog(TableSettingsDialogBaseClass):           # type: ignore
 
     setHeader  = pyqtSignal( int, str )
@@ -286,108 +264,6 @@ class TableFiltersDialog(TableFiltersDialogBaseClass):           # type: ignore
         model.setFilterState( self.oldState )
 
 
-## =========================================================
-
-
-class TableRowColorDelegate():
-
-    STOCK_FAV_BGCOLOR    = QColor( "beige" )
-    STOCK_GRAY_BGCOLOR   = QColor( "#f0f0f0" )
-    STOCK_WALLET_BGCOLOR = QColor( "palegreen" )
-
-    def __init__(self):
-        self.parent: 'DataFrameTableModel' = None
-
-    def foreground(self, _: QModelIndex ):
-        ## reimplement if needed
-        return None
-
-    def background(self, _: QModelIndex ):
-        ## reimplement if needed
-        return None
-
-    def setParent(self, newParent):
-        self.parent = newParent
-
-
-class DataFrameTableModel( QAbstractTableModel ):
-
-    def __init__(self, data: DataFrame):
-        super().__init__()
-        self._rawData: DataFrame                   = data
-        self.customHeader: Dict[ int, str ]        = {}
-        self.colorDelegate: TableRowColorDelegate  = None
-
-    def setColorDelegate(self, decorator: TableRowColorDelegate):
-        self.beginResetModel()
-        self.colorDelegate = decorator
-        decorator.setParent( self )
-        self.endResetModel()
-
-    def setContent(self, data: DataFrame):
-        self.beginResetModel()
-        self._rawData = data
-        self.endResetModel()
-
-    def setHeaders(self, headersDict, orientation=QtCore.Qt.Horizontal):
-        if headersDict is not None:
-            self.customHeader = copy.deepcopy( headersDict )
-        else:
-            self.customHeader = {}
-        colsNum = self.columnCount()
-        self.headerDataChanged.emit( orientation, 0, colsNum - 1 )
-
-    # pylint: disable=W0613
-    def rowCount(self, parent=None):
-        if self._rawData is None:
-            return 0
-        return self._rawData.shape[0]
-
-    # pylint: disable=W0613
-    def columnCount(self, parnet=None):
-        if self._rawData is None:
-            return 0
-        return self._rawData.shape[1]
-
-    def headerData(self, section, orientation, role):
-        if orientation == QtCore.Qt.Horizontal and role == QtDisplayRole:
-            headerValue = self.customHeader.get( section, None )
-            if headerValue is not None:
-                return headerValue
-            colName = self._rawData.columns[section]
-            if isinstance(colName, tuple):
-                return colName[0]
-            return colName
-        return super().headerData( section, orientation, role )
-
-    def setHeaderData(self, section, orientation, value, _=QtDisplayRole):
-        self.customHeader[ section ] = value
-        self.headerDataChanged.emit( orientation, section, section )
-        return True
-
-    def data(self, index: QModelIndex, role=QtDisplayRole):
-        if not index.isValid():
-            return None
-
-        if role == QtDisplayRole:
-            rawData = self._rawData.iloc[index.row(), index.column()]
-            strData = str(rawData)
-            return strData
-        if role == QtUserRole:
-            rawData = self._rawData.iloc[index.row(), index.column()]
-            return rawData
-        if role == QtTextAlignmentRole:
-            return QtAlignHCenter | QtAlignVCenter
-
-        if self.colorDelegate is not None:
-            if role == QtForegroundRole:
-                return self.colorDelegate.foreground( index )
-            if role == QtBackgroundRole:
-                return self.colorDelegate.background( index )
-
-        return None
-
-
 ## ===========================================================
 
 
@@ -417,25 +293,108 @@ class DFProxyModel( QtCore.QSortFilterProxyModel ):
         ##  3 - contains
         self.condition = 0
 
+        ## cache of sort ranks: ( data model, content version, column, ranks, ascending keys, descending keys )
+        self._sortRanks = None
+        ## cache of filtered column: ( data model, content version, column, filter values )
+        self._filterValues = None
+        ## cache of filter mask: ( data model, content version, column, condition, filter value, order, mask )
+        self._filterMask = None
+
+    def setSourceModel(self, sourceModel):
+        self._sortRanks    = None
+        self._filterValues = None
+        self._filterMask   = None
+        super().setSourceModel( sourceModel )
+
     def setFilterCondition(self, condition):
         self.condition = condition
 
+    ## override
+    def sort(self, column, order=QtAscendingOrder):
+        chunkedModel = self._chunkedModel()
+        if chunkedModel is None:
+            super().sort( column, order )
+            return
+        ## sort all rows, not only fetched ones
+        chunkedModel.sortRows( column, order )
+
+    ## pass filter to chunked data model (filtering of fetched rows is not enough)
+    def updateChunkedFilter(self):
+        chunkedModel = self._chunkedModel()
+        if chunkedModel is None:
+            return
+        filterValue = self.filterRegExp().pattern()
+        chunkedModel.filterRows( self.filterKeyColumn(), self.condition, filterValue )
+
+    def _chunkedModel(self) -> 'ChunkedDataFrameTableModel':
+        dataModel = self._dataModel()
+        if isinstance( dataModel, ChunkedDataFrameTableModel ):
+            return dataModel
+        return None
+
     def lessThan(self, left: QModelIndex, right: QModelIndex):
-        leftData  = self.sourceModel().data(left, QtUserRole)
-        rightData = self.sourceModel().data(right, QtUserRole)
-#         print("xxxxxxxx:", type(leftData), type(rightData) )
-        return self.valueLessThan( leftData, rightData )
+        sortCache = self._sortRanks
+        if sortCache is None or left.column() != sortCache[2] or sortCache[0].contentVersion() != sortCache[1]:
+            if self.sortRanks( left.column() ) is None:
+                leftData  = self.sourceModel().data(left, QtUserRole)
+                rightData = self.sourceModel().data(right, QtUserRole)
+                return self.valueLessThan( leftData, rightData )
+            sortCache = self._sortRanks
+
+        ## keys of no-data rows put them on bottom
+        if self.sortOrder() == QtAscendingOrder:
+            sortKeys = sortCache[4]
+        else:
+            sortKeys = sortCache[5]
+        if left.model() is sortCache[0]:
+            ## source model is data model
+            return sortKeys[ left.row() ] < sortKeys[ right.row() ]
+        return sortKeys[ self._mapToDataRow( left ) ] < sortKeys[ self._mapToDataRow( right ) ]
+
+    ## returns sort ranks (see 'sort_ranks()') of rows of data model or None if data model not available
+    def sortRanks(self, column) -> numpy.ndarray:
+        dataModel = self._dataModel()
+        if dataModel is None:
+            return None
+        version = dataModel.contentVersion()
+        if self._sortRanks is not None:
+            cachedModel, cachedVersion, cachedColumn, ranks, _, _ = self._sortRanks
+            if cachedModel is dataModel and cachedVersion == version and cachedColumn == column:
+                return ranks
+        ranks = sort_ranks( dataModel.columnValues( column ) )
+        ## plain lists are faster to index than arrays
+        invalidMask = ranks < 0
+        ascendingKeys = numpy.where( invalidMask, len( ranks ), ranks ).tolist()
+        descendingKeys = ranks.tolist()
+        self._sortRanks = ( dataModel, version, column, ranks, ascendingKeys, descendingKeys )
+        return ranks
+
+    ## find table model at the end of chain of proxy models
+    def _dataModel(self) -> 'DataFrameTableModel':
+        model = self.sourceModel()
+        while isinstance( model, QtCore.QAbstractProxyModel ):
+            model = model.sourceModel()
+        if isinstance( model, DataFrameTableModel ):
+            return model
+        return None
+
+    def _mapToDataRow(self, index: QModelIndex) -> int:
+        model = index.model()
+        while isinstance( model, QtCore.QAbstractProxyModel ):
+            index = model.mapToSource( index )
+            model = model.sourceModel()
+        return index.row()
 
     def valueLessThan(self, leftData, rightData):
 #         leftData, rightData = self.convertType( leftData, rightData )
 
         ## put no-data rows on bottom
         if is_invalid_number( leftData ):
-            if self.sortOrder() == QtCore.Qt.AscendingOrder:
+            if self.sortOrder() == QtAscendingOrder:
                 return False
             return True
         if is_invalid_number( rightData ):
-            if self.sortOrder() == QtCore.Qt.AscendingOrder:
+            if self.sortOrder() == QtAscendingOrder:
                 return True
             return False
 
@@ -459,6 +418,7 @@ class DFProxyModel( QtCore.QSortFilterProxyModel ):
     def clearFilter(self):
         self.condition = 0
         self.setFilterFixedString( "" )
+        self.updateChunkedFilter()
 
     def filterState(self):
         filterValue = self.filterRegExp().pattern()
@@ -468,13 +428,26 @@ class DFProxyModel( QtCore.QSortFilterProxyModel ):
         self.setFilterKeyColumn( state[0] )
         self.condition = state[1]
         self.setFilterRegExp( state[2] )
+        self.updateChunkedFilter()
 
     def filterAcceptsRow( self, sourceRow, sourceParent ):
         filterValue = self.filterRegExp().pattern()
         if not filterValue:
             ## empty filter -- accept all
             return True
+        if self._chunkedModel() is not None:
+            ## rows already filtered by data model
+            return True
         filterColumn = self.filterKeyColumn()
+        mask = self.filterMask( filterColumn, filterValue )
+        if mask is not None:
+            sourceModel = self.sourceModel()
+            if sourceModel is self._filterMask[0]:
+                ## source model is data model
+                return bool( mask[ sourceRow ] )
+            valueIndex = sourceModel.index( sourceRow, filterColumn, sourceParent )
+            return bool( mask[ self._mapToDataRow( valueIndex ) ] )
+
         valueIndex = self.sourceModel().index( sourceRow, filterColumn, sourceParent )
         rawValue = self.sourceModel().data( valueIndex, QtUserRole )
         value = str(rawValue)
@@ -500,6 +473,31 @@ class DFProxyModel( QtCore.QSortFilterProxyModel ):
         return False
 #         return super().filterAcceptsRow( sourceRow, sourceParent )
 
+    ## returns mask of accepted rows of data model or None if data model not available
+    def filterMask( self, column, filterValue ) -> numpy.ndarray:
+        ascendingOrder = self.sortOrder() == QtAscendingOrder
+        filterKey = ( column, self.condition, filterValue, ascendingOrder )
+        maskCache = self._filterMask
+        if maskCache is not None and maskCache[2:-1] == filterKey and maskCache[0].contentVersion() == maskCache[1]:
+            ## called for every row -- data model is not searched
+            return maskCache[-1]
+
+        dataModel = self._dataModel()
+        if dataModel is None:
+            return None
+        version = dataModel.contentVersion()
+        maskKey = ( dataModel, version ) + filterKey
+
+        valuesKey = ( dataModel, version, column )
+        if self._filterValues is None or self._filterValues[:-1] != valuesKey:
+            columnValues = filter_values( dataModel.columnDisplayValues( column ) )
+            self._filterValues = valuesKey + ( columnValues, )
+        columnValues = self._filterValues[-1]
+
+        mask = filter_mask( columnValues, self.condition, filterValue, ascendingOrder )
+        self._filterMask = maskKey + ( mask, )
+        return mask
+
     def convertType(self, leftData, rightData):
         if contains_string(leftData) or contains_string(rightData):
             return ( str(leftData), str(rightData) )
@@ -571,6 +569,7 @@ class DataFrameTable( QTableView ):
         model.setFilterKeyColumn( columnIndex )
         model.setFilterCondition( conditionIndex )
         model.setFilterFixedString( filterText )
+        model.updateChunkedFilter()
 
     @property
     def headersText(self):
@@ -657,6 +656,14 @@ class DataFrameTable( QTableView ):
     def setColorDelegate(self, decorator: TableRowColorDelegate):
         self.pandaModel.setColorDelegate( decorator )
 
+    ## see 'DataFrameTableModel.setBufferedMode'
+    def setBufferedMode(self, enabled: bool):
+        self.pandaModel.setBufferedMode( enabled )
+
+    ## see 'DataFrameTableModel.setKeyColumn'
+    def setKeyColumn(self, col):
+        self.pandaModel.setKeyColumn( col )
+
     def setData(self, rawData: DataFrame ):
         self._rawData = rawData
         self.pandaModel.setContent( rawData )
@@ -87,6 +87,8 @@ class StockFavsTable( StockTable ):
         self.setObjectName("stockfavstable")
         self.setShowGrid( True )
         self.setAlternatingRowColors( False )
+        self.setBufferedMode( True )
+        self.setKeyColumn( GpwCurrentStockData.getColumnIndex( StockDataType.TICKER ) )
         self.dataObject = None
         self.favGroup = None
 
@@ -28,9 +28,11 @@ from PyQt5 import QtWidgets
 from PyQt5.QtCore import QModelIndex
 from PyQt5.QtWidgets import QWidget
 
+from stockdataaccess.dataaccess.datatype import StockDataType
 from stockmonitor.gui.widget.stocktable import StockTable, stock_background_color
 from stockmonitor.gui.dataobject import DataObject
 from stockmonitor.gui.widget.dataframetable import TableRowColorDelegate
+from stockmonitor.gui.widget.dataframemodel import ChunkedDataFrameTableModel, QtUserRole
 from stockmonitor.gui.utils import set_label_url
 
 
@@ -71,8 +73,9 @@ class ShortSellingsColorDelegate( TableRowColorDelegate ):
 #         return None
 
     def background(self, index: QModelIndex ):
-        dataRow = index.row()
-        isin = self.dataAccess.getISIN( dataRow )
+        ## row of model can differ from row of data frame (chunked model)
+        isinColumn = self.dataAccess.getDataColumnIndex( StockDataType.ISIN )
+        isin = index.siblingAtColumn( isinColumn ).data( QtUserRole )
         ticker = self.dataObject.getTickerFromIsin( isin )
         return stock_background_color( self.dataObject, ticker )
 
@@ -108,6 +111,8 @@ class ShortSellingsWidget( QWidget ):
         ## history shorts row
         self.historyShortsTable = ShortSellingsTable(self)
         self.historyShortsTable.setObjectName("historyshortstable")
+        ## history contains all short positions since 2010 -- load rows on demand
+        self.historyShortsTable.setSourceModel( ChunkedDataFrameTableModel( None ) )
         vlayout.addWidget( self.historyShortsTable )
 
         ## source info row
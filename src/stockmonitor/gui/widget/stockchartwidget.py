@@ -22,9 +22,12 @@
 #
 
 import logging
+import collections
+import threading
 
-from typing import Dict, List
+from typing import Tuple, OrderedDict
 
+import numpy
 import pandas
 
 from PyQt5 import QtCore
@@ -443,57 +446,73 @@ class StockChartWidget(QtBaseClass):                    # type: ignore
         self._updateView()
 
 
+## cache of candle data: id of source data frame -> ( source data frame, bins, candle data frame )
+## one entry per source (chart or mosaic tile), so size is about number of displayed charts
+_CANDLE_CACHE: OrderedDict[ int, Tuple[ pandas.DataFrame, int, pandas.DataFrame ] ] = collections.OrderedDict()
+_CANDLE_CACHE_SIZE = 64
+_CANDLE_CACHE_LOCK = threading.Lock()
+
+
+## returns candle data (columns: "Open", "High", "Low", "Close", "Volume") of given intraday source
+## data is aggregated to given number of bins if source has more rows
+## results are cached for source data and number of bins -- repaint of chart does not recalculate bins
 def prepare_candle_data( intraSource: GpwCurrentStockIntradayData, bins=None ):
     dataFrame = intraSource.getWorksheetData()
     if dataFrame is None:
         return None
 
-    recalculate = True
-    if bins is None:
-        recalculate = False
-    elif len( dataFrame ) <= bins:
-        recalculate = False
+    if bins is not None and len( dataFrame ) <= bins:
+        bins = None
 
-    if recalculate is False:
+    ## source data frame is kept in cache, so its 'id' is not reused
+    cacheKey = id( dataFrame )
+    with _CANDLE_CACHE_LOCK:
+        cachedData = _CANDLE_CACHE.get( cacheKey )
+        if cachedData is not None and cachedData[0] is dataFrame and cachedData[1] == bins:
+            _CANDLE_CACHE.move_to_end( cacheKey )
+            return cachedData[2].copy()
+
+    if bins is None:
         rename_map = { "o": "Open",
                        "c": "Close",
                        "l": "Low",
                        "h": "High",
                        "v": "Volume"
                        }
-        renamedData = dataFrame.rename( columns=rename_map )
-        renamedData.index = pandas.DatetimeIndex( renamedData["t"] )
-        # renamedData.drop( columns="t", inplace=True )
-        return renamedData
-
-    ## calculate bins
-
-    dataFrame[ "bin" ] = pandas.cut( dataFrame["t"], bins=bins, labels=False )
-
-    recent_bin = -1
-    timestamps = []
-    frame: Dict[ str, List ] = { 'Open': [], 'High': [], 'Low': [], 'Close': [], 'Volume': [] }
-
-    for _, row in dataFrame.iterrows():
-        curr_bin = row["bin"]
-        if curr_bin != recent_bin:
-            recent_bin = curr_bin
-            timestamps.append( row["t"] )
-            frame[ 'Open' ].append( row["o"] )
-            frame[ 'High' ].append( row["h"] )
-            frame[ 'Low' ].append( row["l"] )
-            frame[ 'Close' ].append( row["c"] )
-            frame[ 'Volume' ].append( row["v"] )
-            continue
-
-        # frame[ 'Open' ].append( row["o"] )
-        frame[ 'High' ][-1]    = max( frame[ 'High' ][-1], row["h"] )
-        frame[ 'Low' ][-1]     = min( frame[ 'High' ][-1], row["h"] )
-        frame[ 'Close' ][-1]   = row["c"]
-        frame[ 'Volume' ][-1] += row["v"]
-
+        candleData = dataFrame.rename( columns=rename_map )
+        candleData.index = pandas.DatetimeIndex( candleData["t"] )
+        # candleData.drop( columns="t", inplace=True )
+    else:
+        candleData = bin_candle_data( dataFrame, bins )
+
+    with _CANDLE_CACHE_LOCK:
+        _CANDLE_CACHE[ cacheKey ] = ( dataFrame, bins, candleData )
+        _CANDLE_CACHE.move_to_end( cacheKey )
+        while len( _CANDLE_CACHE ) > _CANDLE_CACHE_SIZE:
+            _CANDLE_CACHE.popitem( last=False )
+    return candleData.copy()
+
+
+## aggregate intraday data (columns: "t", "o", "h", "l", "c", "v") to given number of time bins of equal width
+## consecutive rows of the same bin form one candle
+def bin_candle_data( dataFrame: pandas.DataFrame, bins ) -> pandas.DataFrame:
+    binColumn = pandas.cut( dataFrame["t"], bins=bins, labels=False ).to_numpy( dtype=float )
+    rowsNum   = len( binColumn )
+
+    ## NaN is not equal to NaN -- row without bin starts new candle
+    startMask = numpy.full( rowsNum, True )
+    startMask[1:] = binColumn[1:] != binColumn[:-1]
+    startIndexes = numpy.flatnonzero( startMask )
+    endIndexes   = numpy.append( startIndexes[1:], rowsNum ) - 1
+
+    frame = { 'Open':   dataFrame["o"].to_numpy()[ startIndexes ],
+              'High':   numpy.fmax.reduceat( dataFrame["h"].to_numpy(), startIndexes ),
+              'Low':    numpy.fmin.reduceat( dataFrame["l"].to_numpy(), startIndexes ),
+              'Close':  dataFrame["c"].to_numpy()[ endIndexes ],
+              'Volume': numpy.add.reduceat( dataFrame["v"].to_numpy(), startIndexes )
+              }
     retFrame = pandas.DataFrame( frame )
-    retFrame.index = pandas.DatetimeIndex( timestamps )
+    retFrame.index = pandas.DatetimeIndex( dataFrame["t"].to_numpy()[ startIndexes ] )
     return retFrame
 
 
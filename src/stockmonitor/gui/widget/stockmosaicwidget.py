@@ -23,7 +23,9 @@
 
 import logging
 
-from typing import Dict, Any
+from typing import Dict, List, Tuple, Any
+
+import pandas
 
 # from PyQt5.QtGui import QCloseEvent
 
@@ -90,6 +92,11 @@ class StockMosaicWidget(QtBaseClass):                    # type: ignore
         self.threads.finished.connect( self._sortPlots )
         # self.threads.deleteOnFinish()
 
+        ## tiles data is prepared in separate worker list
+        self._pendingTiles = None
+        self.prepareThreads = ThreadingListType( self )
+        self.prepareThreads.finished.connect( self._drawTiles )
+
     def connectData(self, dataObject: DataObject, tickerList):
         self.dataObject = dataObject
         self.tickerList = list( tickerList )
@@ -179,7 +186,8 @@ class StockMosaicWidget(QtBaseClass):                    # type: ignore
         sortText = self.ui.sortPlotsCB.currentText()
         _LOGGER.warning( "unhandled sort value -- %s: %s", sortIndex, sortText )
 
-    # pylint: disable=R0914
+    ## data of all tiles is prepared in worker threads, then the whole mosaic
+    ## is drawn in GUI thread and the canvas is redrawn only once
     def _updateView(self):
         self.ui.refreshPB.setEnabled( True )
 
@@ -188,100 +196,101 @@ class StockMosaicWidget(QtBaseClass):                    # type: ignore
         currentSource: GpwCurrentStockData = self.getCurrentDataSource()
         currentSource.getWorksheetData()
 
-        self.clearData()
-
-        minTransTime = None
-        maxTransTime = None
-
-        tickerSize = len( self.tickerList )
-        for index in range( 0, tickerSize ):
-            ticker_pair = self.tickerList[ index ]
+        isinDict = self._getIsinDict()
+        tilesList = []
+        for index, ticker_pair in enumerate( self.tickerList ):
             ticker = ticker_pair[0]
-            isin = self.dataObject.getStockIsinFromTicker( ticker )
+            isin = isinDict.get( ticker )
+            _LOGGER.debug( "updating chart data, range[%s] isin[%s] index[%s]", rangeText, isin, index )
+            intraSource: GpwCurrentStockIntradayData = self.dataObject.gpwStockIntradayData.getSource( isin, rangeText )
+            tilesList.append( MosaicTileData( index, ticker_pair, intraSource ) )
 
-            intraSource: GpwCurrentStockIntradayData = self.getIntradayDataSource( ticker )
+        ## wallet can be modified in GUI thread -- copy its values before starting workers
+        walletFlags = ( self.ui.showWalletCB.isChecked(),
+                        self.ui.showTransactionsLevelsCB.isChecked(),
+                        self.ui.showTransactionsPointsCB.isChecked() )
+        transMode = self.dataObject.transactionsMatchMode()
+        for tile in tilesList:
+            ticker = tile.tickerPair[0]
+            walletStock: TransHistory = self.dataObject.wallet[ ticker ]
+            set_wallet_data( tile, walletStock, transMode, walletFlags )
+
+        self._pendingTiles = tilesList
+        if not tilesList:
+            self._drawTiles()
+            return
 
-            transTime = intraSource.getRecentTransTime()
-            if transTime is not None:
-                if maxTransTime is None or transTime > maxTransTime:
-                    maxTransTime = transTime
+        call_list = []
+        for tile in tilesList:
+            call_list.append( [ prepare_tile_data, [ tile, currentSource, self._currBinsNum ] ] )
+        self.prepareThreads.start( call_list )
+
+    ## draw tiles prepared by '_updateView'
+    def _drawTiles(self):
+        tilesList = self._pendingTiles
+        if tilesList is None:
+            return
+        for tile in tilesList:
+            if tile.prepared is False:
+                ## finished outdated preparation -- wait for recent one
+                return
+        self._pendingTiles = None
 
-            dataFrame = intraSource.getWorksheetData()
-            if dataFrame is not None:
-                startTime = dataFrame.iloc[ 0 ].at[ 't' ]
-                if minTransTime is None or startTime < minTransTime:
-                    minTransTime = startTime
+        self.clearData()
 
-        self.ui.timeLabel.setText( str(maxTransTime) )
+        minTransTime = None
+        maxTransTime = None
+        for tile in tilesList:
+            if tile.transTime is not None:
+                if maxTransTime is None or tile.transTime > maxTransTime:
+                    maxTransTime = tile.transTime
+            if tile.startTime is not None:
+                if minTransTime is None or tile.startTime < minTransTime:
+                    minTransTime = tile.startTime
 
-        for index in range( 0, tickerSize ):
-            ticker_pair = self.tickerList[ index ]
-            ticker = ticker_pair[0]
-            isin = self.dataObject.getStockIsinFromTicker( ticker )
-            _LOGGER.debug( "updating chart data, range[%s] isin[%s] index[%s]", rangeText, isin, index )
+        self.ui.timeLabel.setText( str(maxTransTime) )
 
-            intraSource: GpwCurrentStockIntradayData = self.getIntradayDataSource( ticker )
-            self._updateCandleChart( intraSource, index, minTransTime, maxTransTime )
+        for tile in tilesList:
+            self._drawCandleChart( tile, minTransTime, maxTransTime )
 
         self.ui.candleChart.refreshCanvas()
 
-    def _updateCandleChart( self, intraSource: GpwCurrentStockIntradayData, tickerIndex, minTransTime, maxTransTime ):
-        ## get data
-        ##intraSource = self.dataObject.gpwStockIntradayData.getSource( isin, rangeText )
-        ##return intraSource
-
-        ticker_pair = self.tickerList[ tickerIndex ]
-        ticker       = ticker_pair[0]
-        name         = ticker_pair[1]
-        recentChange = ticker_pair[2]
+    def _drawCandleChart( self, tile: 'MosaicTileData', minTransTime, maxTransTime ):
+        tickerIndex = tile.index
 
         pricePlot  = self.ui.candleChart.getPricePlot( tickerIndex )
         volumePlot = self.ui.candleChart.getVolumePlot( tickerIndex )
 
-        currentSource: GpwCurrentStockData = self.getCurrentDataSource()
-
-        if isinstance(recentChange, float):
-            if recentChange > 0.0:
-                recentChange = "+" + str(recentChange)
-            title = f"{name} ({ticker})   {recentChange}%"
-        else:
-            title = f"{name} ({ticker})   {recentChange}"
-
-        candleFrame = prepare_candle_data( intraSource, self._currBinsNum )
-        if candleFrame is None or len( candleFrame ) < 2:
+        candleFrame = tile.candleFrame
+        if candleFrame is None:
             ## no data to show
-            pricePlot.set_title( title )
+            pricePlot.set_title( tile.title )
             clear_labels( pricePlot )
             clear_labels( volumePlot )
             return
 
-#         print( ticker, tickerIndex, "\n", candleFrame )
-
-#         dataFrame = intraSource.getWorksheetData()
-
-        timeColumn   = candleFrame.index
-        priceColumn  = candleFrame["Close"]
-
-        refPrice    = currentSource.getReferenceValueByTicker( ticker )
+        refPrice = tile.refPrice
 
         self.ui.candleChart.addPriceSecondaryY( refPrice, index=tickerIndex, set_label=False )
 
-        timeData = list(timeColumn)
-        self.ui.candleChart.addPriceLine( timeData, priceColumn, color='#FF000055', index=tickerIndex )
+        timeData = list(candleFrame.index)
+        self.ui.candleChart.addPriceLine( timeData, candleFrame["Close"], color='#FF000055', index=tickerIndex )
 
         self.ui.candleChart.addPriceHLine( refPrice, color='r', index=tickerIndex )
 
         ## add wallet points
-        self._addWalletData( intraSource, self.ui.candleChart, tickerIndex )
+        for hLine in tile.hLines:
+            self.ui.candleChart.addPriceHLine( hLine[0], color=hLine[1], index=tickerIndex )
+        for point in tile.points:
+            self.ui.candleChart.addPricePoint( point[0], point[1], color='blue', annotation=point[2],
+                                               index=tickerIndex )
 
-        closeColumn  = candleFrame["Close"]
-        recentPrice = closeColumn.iloc[-1]
-        self.ui.candleChart.addVolumeSecondaryY( recentPrice, index=tickerIndex, set_label=False )
+        self.ui.candleChart.addVolumeSecondaryY( tile.recentPrice, index=tickerIndex, set_label=False )
 
         returnParamsDict: Dict[Any, Any] = {}
         paramsDict = { "ylabel": "",
                        "ylabel_lower": "",
-                       "axtitle": title,
+                       "axtitle": tile.title,
                        "xlim": (minTransTime, maxTransTime),
                        "return_calculated_values": returnParamsDict,
                        "returnfig": True
@@ -294,54 +303,21 @@ class StockMosaicWidget(QtBaseClass):                    # type: ignore
         candlestickchart.set_ref_format_coord( pricePlot, refPrice )
         candlestickchart.set_int_format_coord( volumePlot )
 
-    def _addWalletData(self, intraSource, chart, tickerIndex):
-        ticker_pair = self.tickerList[ tickerIndex ]
-        ticker       = ticker_pair[0]
-
-        dataFrame = intraSource.getWorksheetData()
-        timeColumn = dataFrame["t"]
-        timeData = list(timeColumn)
-#         refX = [ timeData[0], timeData[-1] ]
-
-        transMode = self.dataObject.transactionsMatchMode()
-        walletStock: TransHistory = self.dataObject.wallet[ ticker ]
-        if walletStock is not None:
-            if self.ui.showWalletCB.isChecked():
-                amount, buy_unit_price = walletStock.currentTransactionsAvg( transMode )
-                if amount > 0:
-#                     refY = [ buy_unit_price, buy_unit_price ]
-#                     chart.addPriceLine( refX, refY, color='black', style="--" )
-                    chart.addPriceHLine( buy_unit_price, color='black', index=tickerIndex )
-
-            if self.ui.showTransactionsLevelsCB.isChecked():
-                currTransactions = walletStock.currentTransactions( transMode )
-                for item in currTransactions:
-                    buy_unit_price = item.unitPrice
-#                     refY = [ buy_unit_price, buy_unit_price ]
-#                     chart.addPriceLine( refX, refY, color='blue', style="--" )
-                    chart.addPriceHLine( buy_unit_price, color='blue', index=tickerIndex )
-
-            if self.ui.showTransactionsPointsCB.isChecked():
-                allTransactions = walletStock.allTransactions()
-                for item in allTransactions:
-                    trans_time     = item.transTime
-                    if trans_time < timeData[0]:
-                        continue
-                    amount         = item.amount
-                    buy_unit_price = item.unitPrice
-                    if amount > 0:
-                        chart.addPricePoint( trans_time, buy_unit_price, color='blue', annotation="+",
-                                             index=tickerIndex )
-                    else:
-                        chart.addPricePoint( trans_time, buy_unit_price, color='blue', annotation="-",
-                                             index=tickerIndex )
+    def _getIsinDict(self):
+        isinDict = {}
+        for ticker_pair in self.tickerList:
+            ticker = ticker_pair[0]
+            if ticker not in isinDict:
+                isinDict[ ticker ] = self.dataObject.getStockIsinFromTicker( ticker )
+        return isinDict
 
     def _dataSourceObjectsList(self):
         retList = []
 
+        isinDict = self._getIsinDict()
         for ticker_pair in self.tickerList:
             ticker = ticker_pair[0]
-            isin = self.dataObject.getStockIsinFromTicker( ticker )
+            isin = isinDict.get( ticker )
 
             ## current range item
             rangeText = self.ui.rangeCB.currentText()
@@ -381,12 +357,13 @@ class StockMosaicWidget(QtBaseClass):                    # type: ignore
     def closeChart(self):
         ## prevent segfault (calling C++ released object)
         self.threads.stopExecution()
+        self.prepareThreads.stopExecution()
 
         if not self.dataObject:
             return
+        isinDict = self._getIsinDict()
         for ticker_pair in self.tickerList:
-            ticker = ticker_pair[0]
-            isin = self.dataObject.getStockIsinFromTicker( ticker )
+            isin = isinDict.get( ticker_pair[0] )
             dataMap: GpwStockIntradayMap = self.dataObject.gpwStockIntradayData
             dataMap.deleteData( isin )
 
@@ -442,3 +419,93 @@ def clear_labels( plot ):
     plot.set_xticks( [] )
     plot.set_yticks( [] )
     plot.set_ylabel( "" )
+
+
+## =================================================================
+
+
+class MosaicTileData():
+    """Data of single mosaic tile prepared outside of GUI thread."""
+
+    def __init__(self, index, ticker_pair, intraSource: GpwCurrentStockIntradayData):
+        self.index       = index
+        self.tickerPair  = ticker_pair
+        self.intraSource = intraSource
+
+        ## wallet data -- set in GUI thread (see 'set_wallet_data')
+        self.hLines: List[ Tuple[ float, str ] ] = []             ## (price, color)
+        self.transPoints: List[ Tuple[ Any, float, str ] ] = []   ## (time, price, annotation)
+
+        ## set in worker thread (see 'prepare_tile_data')
+        self.prepared: bool                 = False
+        self.title: str                     = None
+        self.candleFrame: pandas.DataFrame  = None          ## None if there is no data to show
+        self.refPrice: float                = None
+        self.recentPrice: float             = None
+        self.points: List[ Tuple[ Any, float, str ] ] = []    ## transaction points in time range of chart
+        self.startTime: Any                 = None
+        self.transTime: Any                 = None
+
+
+## executed in GUI thread -- copies wallet values, so workers do not access wallet
+def set_wallet_data( tile: MosaicTileData, walletStock: TransHistory, transMode, walletFlags ):
+    tile.hLines      = []
+    tile.transPoints = []
+    if walletStock is None:
+        return
+    showWallet, showLevels, showPoints = walletFlags
+    if showWallet:
+        amount, buy_unit_price = walletStock.currentTransactionsAvg( transMode )
+        if amount > 0:
+            tile.hLines.append( ( buy_unit_price, 'black' ) )
+
+    if showLevels:
+        currTransactions = walletStock.currentTransactions( transMode )
+        for item in currTransactions:
+            tile.hLines.append( ( item.unitPrice, 'blue' ) )
+
+    if showPoints:
+        allTransactions = walletStock.allTransactions()
+        for item in allTransactions:
+            annotation = "+" if item.amount > 0 else "-"
+            tile.transPoints.append( ( item.transTime, item.unitPrice, annotation ) )
+
+
+## executed in worker thread -- does not touch widgets nor wallet
+def prepare_tile_data( tile: MosaicTileData, currentSource: GpwCurrentStockData, bins ):
+    try:
+        _prepare_tile( tile, currentSource, bins )
+    finally:
+        tile.prepared = True
+
+
+def _prepare_tile( tile: MosaicTileData, currentSource: GpwCurrentStockData, bins ):
+    ticker       = tile.tickerPair[0]
+    name         = tile.tickerPair[1]
+    recentChange = tile.tickerPair[2]
+
+    if isinstance(recentChange, float):
+        if recentChange > 0.0:
+            recentChange = "+" + str(recentChange)
+        tile.title = f"{name} ({ticker})   {recentChange}%"
+    else:
+        tile.title = f"{name} ({ticker})   {recentChange}"
+
+    intraSource = tile.intraSource
+    tile.transTime = intraSource.getRecentTransTime()
+    dataFrame = intraSource.getWorksheetData()
+    if dataFrame is not None:
+        tile.startTime = dataFrame.iloc[ 0 ].at[ 't' ]
+
+    candleFrame = prepare_candle_data( intraSource, bins )
+    if candleFrame is None or len( candleFrame ) < 2:
+        ## no data to show
+        return
+
+    tile.refPrice    = currentSource.getReferenceValueByTicker( ticker )
+    tile.recentPrice = candleFrame["Close"].iloc[-1]
+
+    startTime = tile.startTime
+    tile.points = [ item for item in tile.transPoints if item[0] >= startTime ]
+
+    tile.candleFrame = candleFrame
@@ -38,6 +38,7 @@ from stockdataaccess.dataaccess.gpw.gpwcurrentdata import GpwCurrentStockData
 from stockmonitor.datatypes.datatypes import MarkerEntry
 from stockmonitor.gui.dataobject import DataObject, READONLY_FAV_GROUPS
 from stockmonitor.gui.widget.dataframetable import DataFrameTable, TableRowColorDelegate
+from stockmonitor.gui.widget.dataframemodel import QtBackgroundRole
 from stockmonitor.gui.widget import stockchartwidget, stockmosaicwidget
 from stockmonitor.gui.widget import indexchartwidget
 
@@ -334,6 +335,47 @@ class StockFullColorDelegate( TableRowColorDelegate ):
     def __init__(self, dataObject: DataObject):
         super().__init__()
         self.dataObject = dataObject
+        ## background color of each data row -- calculated once for model content
+        ## pair: ( content version, colors list )
+        self._rowColors = None
+
+        self.dataObject.stockDataChanged.connect( self.invalidateColors )
+        self.dataObject.markersChanged.connect( self.invalidateColors )
+        self.dataObject.walletDataChanged.connect( self.invalidateColors )
+        self.dataObject.favsChanged.connect( self.invalidateColors )
+        self.dataObject.favsGrpChanged.connect( self.invalidateColors )
+
+    def invalidateColors(self, *_):
+        self._rowColors = None
+        ## content of model could stay the same, so repaint all rows with new colors
+        dataModel = self.parent
+        if dataModel is None:
+            return
+        rowsNum = dataModel.rowCount()
+        colsNum = dataModel.columnCount()
+        if rowsNum < 1 or colsNum < 1:
+            return
+        topLeft     = dataModel.index( 0, 0 )
+        bottomRight = dataModel.index( rowsNum - 1, colsNum - 1 )
+        dataModel.dataChanged.emit( topLeft, bottomRight, [ QtBackgroundRole ] )
+
+    ## returns list of background colors (or None) for each row of model
+    def rowColors(self):
+        dataModel = self.parent
+        if dataModel is None:
+            return None
+        version = dataModel.contentVersion()
+        if self._rowColors is not None and self._rowColors[0] == version:
+            return self._rowColors[1]
+        tickerIndex = GpwCurrentStockData.getColumnIndex( StockDataType.TICKER )
+        valueIndex  = GpwCurrentStockData.getColumnIndex( StockDataType.RECENT_VALUE )
+        if dataModel.columnCount() <= max( tickerIndex, valueIndex ):
+            return None
+        tickerList  = dataModel.columnValues( tickerIndex )
+        valuesList  = dataModel.columnValues( valueIndex )
+        colorsList  = stock_background_colors( self.dataObject, tickerList, valuesList )
+        self._rowColors = ( version, colorsList )
+        return colorsList
 
     ## override
     def foreground(self, index: QModelIndex ):
@@ -351,6 +393,9 @@ class StockFullColorDelegate( TableRowColorDelegate ):
 
     def background(self, index: QModelIndex ):
         dataRow = index.row()
+        colorsList = self.rowColors()
+        if colorsList is not None:
+            return colorsList[ dataRow ]
         ticker = self.dataObject.getTicker( dataRow )
         return stock_background_color( self.dataObject, ticker )
 
@@ -362,6 +407,8 @@ class StockFullTable( StockTable ):
         self.setObjectName("stockfulltable")
         self.setShowGrid( True )
         self.setAlternatingRowColors( False )
+        self.setBufferedMode( True )
+        self.setKeyColumn( GpwCurrentStockData.getColumnIndex( StockDataType.TICKER ) )
 
     def connectData(self, dataObject):
         super().connectData( dataObject )
@@ -583,7 +630,7 @@ class ToolStockProxyModel( QtCore.QSortFilterProxyModel ):
             return ticker in allFavsSet
 
         if self._limitResults == 2:
-            walletStock = dataObject.wallet.getCurrentStock()
+            walletStock = dataObject.wallet.getCurrentStockSet()
             return ticker in walletStock
 
         return True
@@ -629,7 +676,7 @@ class ToolStockTable( StockTable ):
 
 
 def wallet_background_color( dataObject, ticker ):
-    walletStock = dataObject.wallet.getCurrentStock()
+    walletStock = dataObject.wallet.getCurrentStockSet()
     if ticker in walletStock:
         return TableRowColorDelegate.STOCK_WALLET_BGCOLOR
     return None
@@ -664,6 +711,25 @@ def stock_background_color( dataObject, ticker ):
     return None
 
 
+## the same as 'stock_background_color' called for each pair of ticker and recent value,
+## but wallet, favs and markers are accessed only once
+def stock_background_colors( dataObject: DataObject, tickerList, recentValues ):
+    walletStock = dataObject.wallet.getCurrentStockSet()
+    allFavs     = dataObject.favs.getFavsAll()
+    markerColors = dataObject.markers.matchColors( tickerList, recentValues )
+    ret = []
+    for ticker, markerColor in zip( tickerList, markerColors ):
+        if markerColor is not None:
+            ret.append( QtGui.QColor( markerColor ) )
+        elif ticker in walletStock:
+            ret.append( TableRowColorDelegate.STOCK_WALLET_BGCOLOR )
+        elif ticker in allFavs:
+            ret.append( TableRowColorDelegate.STOCK_FAV_BGCOLOR )
+        else:
+            ret.append( None )
+    return ret
+
+
 def insert_new_action( menu: QMenu, text: str, index: int ):
     actionsList = menu.actions()
     if index >= len( actionsList ):
@@ -26,7 +26,7 @@ import datetime
 
 import pandas
 
-from PyQt5.QtCore import QUrl, Qt
+from PyQt5.QtCore import QUrl, Qt, pyqtSignal
 from PyQt5.QtGui import QDesktopServices
 
 from stockdataaccess.dataaccess import TMP_DIR
@@ -34,6 +34,7 @@ from stockdataaccess.dataaccess import TMP_DIR
 from stockmonitor.analysis.stockanalysis import StockAnalysis
 from stockmonitor.analysis.activityanalysis import GpwCurrentIntradayProvider, \
     ActivityAnalysis, MetaStockIntradayProvider
+from stockmonitor.analysis.analysisjob import AnalysisJob, JOBS_REGISTRY
 from stockmonitor.gui import threadlist
 from stockmonitor.gui.utils import set_label_url
 
@@ -48,12 +49,16 @@ _LOGGER = logging.getLogger(__name__)
 
 class ActivityWidget(QtBaseClass):           # type: ignore
 
+    jobProgress = pyqtSignal( int, int )
+    jobFinished = pyqtSignal( object, object )
+
     def __init__(self, parentWidget=None):
         super().__init__(parentWidget)
         self.ui = UiTargetClass()
         self.ui.setupUi(self)
 
         self.recentOutput = None
+        self.currentJob: AnalysisJob = None
 
         toDate = datetime.date.today() - datetime.timedelta( days=1 )
         self.ui.fromDE.setDate( toDate )
@@ -73,8 +78,12 @@ class ActivityWidget(QtBaseClass):           # type: ignore
         set_label_url( self.ui.sourceLabel, analysis.sourceLink() )
 
         self.ui.calculatePB.clicked.connect( self.calculate )
+        self.ui.cancelPB.clicked.connect( self.cancel )
         self.ui.openPB.clicked.connect( self.openResults )
 
+        self.jobProgress.connect( self._updateProgress )
+        self.jobFinished.connect( self._jobFinished )
+
         self.ui.limitResultsCB.currentIndexChanged.connect( self.ui.dataTable.limitResults )
 
         self.ui.rangeDataRB.click()
@@ -86,63 +95,91 @@ class ActivityWidget(QtBaseClass):           # type: ignore
         self.ui.dataTable.connectData( dataObject )
 
     def calculate(self):
+        thresh = self.ui.threshSB.value()
         if self.ui.todayDataRB.isChecked():
             _LOGGER.warning("calculating based on current intraday")
-            threadlist.calculate( self, self._calculateCurr )
+            today = datetime.datetime.now().date()
+            jobKey = ( "activity", "curr", today, thresh )
+            calcFunction = self._calculateCurr
+            calcArgs = [ thresh ]
         elif self.ui.rangeDataRB.isChecked():
             _LOGGER.warning("calculating based on metastock intraday")
-            threadlist.calculate( self, self._calculatePrev )
-            #self._calculatePrev()
+            fromDate = self.ui.fromDE.date().toPyDate()
+            toDate   = self.ui.toDE.date().toPyDate()
+            if self.ui.currentRefRB.isChecked():
+                refDataProvider = self.ui.dataTable.dataObject.gpwCurrentData
+            elif self.ui.rangeRefRB.isChecked():
+                refDataProvider = None
+            else:
+                _LOGGER.warning("unknown state")
+                return
+            jobKey = ( "activity", "range", fromDate, toDate, thresh, refDataProvider is not None )
+            calcFunction = self._calculatePrev
+            calcArgs = [ fromDate, toDate, thresh, refDataProvider ]
         else:
             _LOGGER.warning("unknown state")
+            return
+
+        job, created = JOBS_REGISTRY.acquire( jobKey )
+        self.recentOutput = TMP_DIR + "out/output_activity.csv"
+        if self.currentJob is not None and self.currentJob is not job:
+            self.currentJob.cancel()
+        self.currentJob = job
 
-    def _calculateCurr(self):
         self.ui.calculatePB.setEnabled( False )
         self.ui.openPB.setEnabled( False )
+        self.ui.cancelPB.setEnabled( True )
+        self.ui.progressBar.setValue( 0 )
         self.ui.dataTable.clear()
 
-        thresh = self.ui.threshSB.value()
-
-        dataProvider = GpwCurrentIntradayProvider()
+        job.attach( self.jobProgress.emit, self.jobFinished.emit )
+        if created is False:
+            _LOGGER.info( "calculation already in progress, waiting for results: %s", jobKey )
+            return
 
-        analysis = ActivityAnalysis( dataProvider )
-        today = datetime.datetime.now().date()
-        self.recentOutput = TMP_DIR + "out/output_activity.csv"
-        resultData: pandas.DataFrame = analysis.calcActivity( today, today, thresh, self.recentOutput, True )
+        threadlist.calculate( self, self._calculateJob, [ job, calcFunction, calcArgs ] )
 
-        self.ui.dataTable.setData( resultData )
+    def cancel(self):
+        if self.currentJob is not None:
+            self.currentJob.cancel()
 
-        self.ui.calculatePB.setEnabled( True )
-        self.ui.openPB.setEnabled( True )
+    ## executed in worker thread
+    def _calculateJob(self, job: AnalysisJob, calcFunction, calcArgs):
+        ## results are passed through 'jobFinished' signal attached to job
+        job.run( calcFunction, job, *calcArgs )
 
-    def _calculatePrev(self):
-        self.ui.calculatePB.setEnabled( False )
-        self.ui.openPB.setEnabled( False )
-        self.ui.dataTable.clear()
+    def _calculateCurr(self, job: AnalysisJob, thresh):
+        dataProvider = GpwCurrentIntradayProvider()
 
-        fromDate = self.ui.fromDE.date().toPyDate()
-        toDate   = self.ui.toDE.date().toPyDate()
-        thresh   = self.ui.threshSB.value()
+        analysis = ActivityAnalysis( dataProvider )
+        analysis.job = job
+        today = datetime.datetime.now().date()
+        return analysis.calcActivity( today, today, thresh, self.recentOutput, True )
 
+    def _calculatePrev(self, job: AnalysisJob, fromDate, toDate, thresh, refDataProvider):
         dataProvider = MetaStockIntradayProvider()
-
-        if self.ui.currentRefRB.isChecked():
-            dataProvider.refDataProvider = self.ui.dataTable.dataObject.gpwCurrentData
-        elif self.ui.rangeRefRB.isChecked():
-            dataProvider.refDataProvider = None
-        else:
-            _LOGGER.warning("unknown state")
-            self.ui.calculatePB.setEnabled( True )
-            self.ui.openPB.setEnabled( True )
-            return
+        dataProvider.refDataProvider = refDataProvider
 
         analysis = ActivityAnalysis( dataProvider )
-        self.recentOutput = TMP_DIR + "out/output_activity.csv"
-        resultData: pandas.DataFrame = analysis.calcActivity( fromDate, toDate, thresh, self.recentOutput )
+        analysis.job = job
+        return analysis.calcActivity( fromDate, toDate, thresh, self.recentOutput )
 
-        self.ui.dataTable.setData( resultData )
+    def _updateProgress(self, done, total):
+        self.ui.progressBar.setMaximum( total )
+        self.ui.progressBar.setValue( done )
 
+    def _jobFinished(self, job: AnalysisJob, resultData: pandas.DataFrame):
+        if job is not self.currentJob:
+            ## result of replaced job
+            return
+        self.currentJob = None
         self.ui.calculatePB.setEnabled( True )
+        self.ui.cancelPB.setEnabled( False )
+        if resultData is None:
+            ## cancelled or failed
+            self.ui.progressBar.setValue( 0 )
+            return
+        self.ui.dataTable.setData( resultData )
         self.ui.openPB.setEnabled( True )
 
     def openResults(self):
@@ -24,12 +24,16 @@
 import logging
 from enum import unique, Enum
 
-from PyQt5.QtCore import QUrl, Qt
+import pandas
+
+from PyQt5.QtCore import QUrl, Qt, pyqtSignal
 from PyQt5.QtGui import QDesktopServices
 
 from stockdataaccess.dataaccess import TMP_DIR
 
 from stockmonitor.analysis.stockanalysis import StockAnalysis
+from stockmonitor.analysis.analysisjob import AnalysisJob, JOBS_REGISTRY
+from stockmonitor.gui import threadlist
 from stockmonitor.gui.utils import set_label_url
 
 from ... import uiloader
@@ -57,12 +61,16 @@ class DaysDataType(Enum):
 
 class DayWidget(QtBaseClass):           # type: ignore
 
+    jobProgress = pyqtSignal( int, int )
+    jobFinished = pyqtSignal( object, object )
+
     def __init__(self, parentWidget=None):
         super().__init__(parentWidget)
         self.ui = UiTargetClass()
         self.ui.setupUi(self)
 
         self.recentOutput = None
+        self.currentJob: AnalysisJob = None
 
         self.ui.openPB.setEnabled( False )
 
@@ -75,8 +83,12 @@ class DayWidget(QtBaseClass):           # type: ignore
         set_label_url( self.ui.sourceLabel, analysis.sourceLink() )
 
         self.ui.calculatePB.clicked.connect( self.calculate )
+        self.ui.cancelPB.clicked.connect( self.cancel )
         self.ui.openPB.clicked.connect( self.openResults )
 
+        self.jobProgress.connect( self._updateProgress )
+        self.jobFinished.connect( self._jobFinished )
+
         self.ui.limitResultsCB.currentIndexChanged.connect( self.ui.dataTable.limitResults )
 
     def connectData(self, dataObject):
@@ -86,18 +98,62 @@ class DayWidget(QtBaseClass):           # type: ignore
         weeksNum   = self.ui.numWeeksSB.value()
         fieldIndex = self.ui.fieldCB.currentIndex()
         fieldValue = self.ui.fieldCB.itemData( fieldIndex )
+
+        jobKey = ( "day", fieldValue, weeksNum )
+        job, created = JOBS_REGISTRY.acquire( jobKey )
         self.recentOutput = TMP_DIR + "out/output_day.csv"
+        if self.currentJob is not None and self.currentJob is not job:
+            self.currentJob.cancel()
+        self.currentJob = job
+
+        self.ui.calculatePB.setEnabled( False )
+        self.ui.openPB.setEnabled( False )
+        self.ui.cancelPB.setEnabled( True )
+        self.ui.progressBar.setValue( 0 )
 
-        resultData = None
+        job.attach( self.jobProgress.emit, self.jobFinished.emit )
+        if created is False:
+            _LOGGER.info( "calculation already in progress, waiting for results: %s", jobKey )
+            return
+
+        threadlist.calculate( self, self._calculateJob, [ job, fieldValue, weeksNum ] )
+
+    def cancel(self):
+        if self.currentJob is not None:
+            self.currentJob.cancel()
+
+    ## executed in worker thread
+    def _calculateJob(self, job: AnalysisJob, fieldValue, weeksNum):
+        ## results are passed through 'jobFinished' signal attached to job
+        job.run( self._calculateData, job, fieldValue, weeksNum )
+
+    def _calculateData(self, job: AnalysisJob, fieldValue, weeksNum):
 
         analysis = StockAnalysis()
+        analysis.job = job
         if fieldValue == DaysDataType.MONDAY:
-            resultData = analysis.calcMonday( weeksNum, outFilePath=self.recentOutput )
-        elif fieldValue == DaysDataType.FRIDAY:
-            resultData = analysis.calcFriday( weeksNum, outFilePath=self.recentOutput )
-        elif fieldValue == DaysDataType.WEEKEND:
-            resultData = analysis.calcWeekend( weeksNum, outFilePath=self.recentOutput )
-
+            return analysis.calcMonday( weeksNum, outFilePath=self.recentOutput )
+        if fieldValue == DaysDataType.FRIDAY:
+            return analysis.calcFriday( weeksNum, outFilePath=self.recentOutput )
+        if fieldValue == DaysDataType.WEEKEND:
+            return analysis.calcWeekend( weeksNum, outFilePath=self.recentOutput )
+        return None
+
+    def _updateProgress(self, done, total):
+        self.ui.progressBar.setMaximum( total )
+        self.ui.progressBar.setValue( done )
+
+    def _jobFinished(self, job: AnalysisJob, resultData: pandas.DataFrame):
+        if job is not self.currentJob:
+            ## result of replaced job
+            return
+        self.currentJob = None
+        self.ui.calculatePB.setEnabled( True )
+        self.ui.cancelPB.setEnabled( False )
+        if resultData is None:
+            ## cancelled or failed
+            self.ui.progressBar.setValue( 0 )
+            return
         self.ui.dataTable.setData( resultData )
         self.ui.openPB.setEnabled( True )
 
@@ -24,13 +24,16 @@
 import logging
 import datetime
 
-from PyQt5.QtCore import QUrl, Qt
+import pandas
+
+from PyQt5.QtCore import QUrl, Qt, pyqtSignal
 from PyQt5.QtGui import QDesktopServices
 
 from stockdataaccess.dataaccess import TMP_DIR
 
 from stockmonitor.analysis.stockanalysis import StockAnalysis
 from stockmonitor.analysis.volumenanalysis import VolumenAnalysis, MetaStockIntradayProvider
+from stockmonitor.analysis.analysisjob import AnalysisJob, JOBS_REGISTRY
 from stockmonitor.gui import threadlist
 from stockmonitor.gui.utils import set_label_url
 
@@ -45,12 +48,16 @@ _LOGGER = logging.getLogger(__name__)
 
 class VolumenWidget(QtBaseClass):           # type: ignore
 
+    jobProgress = pyqtSignal( int, int )
+    jobFinished = pyqtSignal( object, object )
+
     def __init__(self, parentWidget=None):
         super().__init__(parentWidget)
         self.ui = UiTargetClass()
         self.ui.setupUi(self)
 
         self.recentOutput = None
+        self.currentJob: AnalysisJob = None
 
         toDate = datetime.date.today() - datetime.timedelta( days=1 )
         fromDate = toDate - datetime.timedelta( days=7 )
@@ -65,8 +72,12 @@ class VolumenWidget(QtBaseClass):           # type: ignore
         set_label_url( self.ui.sourceLabel, analysis.sourceLink() )
 
         self.ui.calculatePB.clicked.connect( self.calculate )
+        self.ui.cancelPB.clicked.connect( self.cancel )
         self.ui.openPB.clicked.connect( self.openResults )
 
+        self.jobProgress.connect( self._updateProgress )
+        self.jobFinished.connect( self._jobFinished )
+
         self.ui.limitResultsCB.currentIndexChanged.connect( self.ui.dataTable.limitResults )
 
     def connectData(self, dataObject):
@@ -74,24 +85,60 @@ class VolumenWidget(QtBaseClass):           # type: ignore
 
     def calculate(self):
         _LOGGER.warning("calculating based on metastock intraday")
-        threadlist.calculate( self, self._calculateData )
+        fromDate  = self.ui.fromDE.date().toPyDate()
+        toDate    = self.ui.toDE.date().toPyDate()
+
+        jobKey = ( "volumen", fromDate, toDate )
+        job, created = JOBS_REGISTRY.acquire( jobKey )
+        self.recentOutput = TMP_DIR + "out/output_volumen.csv"
+        if self.currentJob is not None and self.currentJob is not job:
+            self.currentJob.cancel()
+        self.currentJob = job
 
-    def _calculateData(self):
         self.ui.calculatePB.setEnabled( False )
         self.ui.openPB.setEnabled( False )
+        self.ui.cancelPB.setEnabled( True )
+        self.ui.progressBar.setValue( 0 )
         self.ui.dataTable.clear()
 
-        fromDate  = self.ui.fromDE.date().toPyDate()
-        toDate    = self.ui.toDE.date().toPyDate()
+        job.attach( self.jobProgress.emit, self.jobFinished.emit )
+        if created is False:
+            _LOGGER.info( "calculation already in progress, waiting for results: %s", jobKey )
+            return
 
-        dataProvider = MetaStockIntradayProvider()
-        analysis = VolumenAnalysis( dataProvider )
-        self.recentOutput = TMP_DIR + "out/output_volumen.csv"
-        resultData = analysis.calcVolumen( fromDate, toDate, self.recentOutput )
+        threadlist.calculate( self, self._calculateJob, [ job, fromDate, toDate ] )
 
-        self.ui.dataTable.setData( resultData )
+    def cancel(self):
+        if self.currentJob is not None:
+            self.currentJob.cancel()
 
+    ## executed in worker thread
+    def _calculateJob(self, job: AnalysisJob, fromDate, toDate):
+        ## results are passed through 'jobFinished' signal attached to job
+        job.run( self._calculateData, job, fromDate, toDate )
+
+    def _calculateData(self, job: AnalysisJob, fromDate, toDate):
+        dataProvider = MetaStockIntradayProvider()
+        analysis = VolumenAnalysis( dataProvider )
+        analysis.job = job
+        return analysis.calcVolumen( fromDate, toDate, self.recentOutput )
+
+    def _updateProgress(self, done, total):
+        self.ui.progressBar.setMaximum( total )
+        self.ui.progressBar.setValue( done )
+
+    def _jobFinished(self, job: AnalysisJob, resultData: pandas.DataFrame):
+        if job is not self.currentJob:
+            ## result of replaced job
+            return
+        self.currentJob = None
         self.ui.calculatePB.setEnabled( True )
+        self.ui.cancelPB.setEnabled( False )
+        if resultData is None:
+            ## cancelled or failed
+            self.ui.progressBar.setValue( 0 )
+            return
+        self.ui.dataTable.setData( resultData )
         self.ui.openPB.setEnabled( True )
 
     def openResults(self):
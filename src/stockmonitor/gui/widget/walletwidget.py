@@ -101,6 +101,8 @@ class WalletStockTable( StockTable ):
     def __init__(self, parentWidget=None):
         super().__init__(parentWidget)
         self.setObjectName("walletstocktable")
+        self.setBufferedMode( True )
+        self.setKeyColumn( 1 )                                  ## ticker
 
     def connectData(self, dataObject):
         super().connectData( dataObject )
@@ -94,3 +94,10 @@ class GpwArchiveDataTest(unittest.TestCase):
     def test_getIsinField(self):
         rowData = self.dataAccess.getIsinField( 4 )
         self.assertEqual( rowData, "PL4FNMD00013" )
+
+    def test_getDataColumns(self):
+        dataTypes = [ StockDataType.OPENING, StockDataType.CLOSING ]
+        currData = self.dataAccess.getDataColumns( dataTypes )
+        self.assertEqual( len( currData ), 428 )
+        self.assertEqual( list( currData.columns ), dataTypes )
+        self.assertGreater( currData.loc[ "ALLEGRO", StockDataType.CLOSING ], 0 )
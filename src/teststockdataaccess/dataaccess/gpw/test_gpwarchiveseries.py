@@ -0,0 +1,165 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import datetime
+import shutil
+import os
+
+from teststockdataaccess.data import get_data_path
+from stockdataaccess.dataaccess import TMP_DIR
+from stockdataaccess.dataaccess.worksheetdata import WorksheetStorageMock
+from stockdataaccess.dataaccess.gpw.gpwarchivedata import GpwArchiveData
+from stockdataaccess.dataaccess.gpw.gpwarchiveseries import GpwArchiveSeries
+
+
+## =================================================================
+
+
+class GpwArchiveDataMock( GpwArchiveData ):
+
+    def __init__(self, validDays):
+        super().__init__()
+        self.validDays = validDays
+        self.requestedDays = []
+
+    ## override
+    def getDataColumns(self, dataTypes, day=None, indexType=None):
+        self.requestedDays.append( day )
+        if day not in self.validDays:
+            return None
+        self.dao = GpwArchiveData.GpwArchiveDAO( day )
+        self.dao.getDataPath = lambda: get_data_path( "gpw_archive_2022-02-10_akcje.xls" )
+        self.dao.storage = WorksheetStorageMock()
+        self.dao.parseWorksheetFromFile( self.dao.getDataPath() )
+        return super().getDataColumns( dataTypes, None, indexType )
+
+
+class HolidayDataMock():
+
+    def __init__(self):
+        self.holidaySet = set()
+
+
+class GpwArchiveSeriesTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.dataDir = TMP_DIR + "out/archseries/"
+        shutil.rmtree( self.dataDir, ignore_errors=True )
+        self.holidays = HolidayDataMock()
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        shutil.rmtree( self.dataDir, ignore_errors=True )
+
+    def test_update(self):
+        day1 = datetime.date( 2022, 2, 10 )
+        day2 = datetime.date( 2022, 2, 11 )
+        day3 = datetime.date( 2022, 2, 14 )
+        archive = GpwArchiveDataMock( [ day1, day2, day3 ] )
+        series = GpwArchiveSeries( self.dataDir, archive, self.holidays )
+
+        daysNum = series.update( day1, day1 )
+        self.assertEqual( daysNum, 1 )
+        data = series.getSeries( "LU2237380790" )
+        self.assertEqual( len( data ), 1 )
+        self.assertEqual( list( data.columns ), ["t", "o", "h", "l", "c", "v"] )
+        self.assertGreater( data["c"].iloc[0], 0 )
+
+        ## weekend and ingested days are skipped
+        archive.requestedDays.clear()
+        daysNum = series.update( day1, day3 )
+        self.assertEqual( daysNum, 2 )
+        self.assertEqual( archive.requestedDays, [ day2, day3 ] )
+
+        ## state is persisted
+        series = GpwArchiveSeries( self.dataDir, archive, self.holidays )
+        self.assertEqual( series.getLastDay(), day3 )
+        data = series.getSeries( "LU2237380790" )
+        self.assertEqual( len( data ), 3 )
+        data = series.getSeries( "LU2237380790", day3 )
+        self.assertEqual( len( data ), 1 )
+
+    def test_update_missingDays(self):
+        day1 = datetime.date( 2022, 2, 10 )
+        day2 = datetime.date( 2022, 2, 11 )
+        day3 = datetime.date( 2022, 2, 14 )
+        archive = GpwArchiveDataMock( [ day1, day3 ] )
+        series = GpwArchiveSeries( self.dataDir, archive, self.holidays )
+
+        ## no data at all -- state is not changed
+        daysNum = series.update( day3 + datetime.timedelta(days=1) )
+        self.assertEqual( daysNum, 0 )
+        self.assertIsNone( series.getLastDay() )
+
+        ## ingestion stops on trading day without data
+        archive.requestedDays.clear()
+        daysNum = series.update( day1, day3 )
+        self.assertEqual( daysNum, 1 )
+        self.assertEqual( archive.requestedDays, [ day1, day2 ] )
+        self.assertEqual( series.getLastDay(), day1 )
+
+        ## missing day is requested again
+        archive.validDays.append( day2 )
+        archive.requestedDays.clear()
+        daysNum = series.update( day1, day3 )
+        self.assertEqual( daysNum, 2 )
+        self.assertEqual( archive.requestedDays, [ day2, day3 ] )
+        self.assertEqual( series.getLastDay(), day3 )
+        data = series.getSeries( "LU2237380790" )
+        self.assertEqual( len( data ), 3 )
+
+    def test_update_holiday(self):
+        day1 = datetime.date( 2022, 2, 10 )
+        day2 = datetime.date( 2022, 2, 11 )
+        day3 = datetime.date( 2022, 2, 14 )
+        archive = GpwArchiveDataMock( [ day1, day3 ] )
+        self.holidays.holidaySet.add( day2 )
+        series = GpwArchiveSeries( self.dataDir, archive, self.holidays )
+
+        daysNum = series.update( day1, day3 )
+        self.assertEqual( daysNum, 2 )
+        self.assertEqual( archive.requestedDays, [ day1, day3 ] )
+        self.assertEqual( series.getLastDay(), day3 )
+
+    def test_update_notStoredState(self):
+        day1 = datetime.date( 2022, 2, 10 )
+        day2 = datetime.date( 2022, 2, 11 )
+        archive = GpwArchiveDataMock( [ day1, day2 ] )
+        series = GpwArchiveSeries( self.dataDir, archive, self.holidays )
+        series.update( day1, day2 )
+
+        ## series stored, but state lost (e.g. crash before storing state)
+        os.remove( os.path.join( self.dataDir, "state.pickle" ) )
+        series = GpwArchiveSeries( self.dataDir, archive, self.holidays )
+        self.assertIsNone( series.getLastDay() )
+        daysNum = series.update( day1, day2 )
+        self.assertEqual( daysNum, 2 )
+        data = series.getSeries( "LU2237380790" )
+        self.assertEqual( len( data ), 2 )
+
+    def test_getSeries_missing(self):
+        series = GpwArchiveSeries( self.dataDir, GpwArchiveDataMock( [] ), self.holidays )
+        self.assertIsNone( series.getSeries( "XXX" ) )
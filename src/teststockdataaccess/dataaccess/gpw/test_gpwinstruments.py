@@ -0,0 +1,182 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import datetime
+import pickle
+import os
+import threading
+
+from stockdataaccess.dataaccess import TMP_DIR
+from stockdataaccess.dataaccess.datatype import StockDataType
+from stockdataaccess.dataaccess.gpw.gpwinstruments import GpwInstruments, GpwInstrumentsProvider
+
+
+## =================================================================
+
+
+class GpwArchiveDataMock():
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.loadCounter = 0
+        self.validDayCounter = 0
+
+    def getRecentValidDay(self, day):
+        self.validDayCounter += 1
+        validDays = [ item for item in self.sessions if item <= day ]
+        if not validDays:
+            return None
+        return max( validDays )
+
+    def getData(self, dataType, day):
+        if dataType != StockDataType.ISIN:
+            return None
+        self.loadCounter += 1
+        return self.sessions.get( day )
+
+
+class GpwArchiveBlockingMock( GpwArchiveDataMock ):
+
+    def __init__(self, sessions):
+        super().__init__( sessions )
+        self.entered = threading.Event()
+        self.blocked = threading.Event()
+        self.blocked.set()
+
+    def getRecentValidDay(self, day):
+        self.entered.set()
+        self.blocked.wait()
+        return super().getRecentValidDay( day )
+
+
+class GpwInstrumentsTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.day1 = datetime.date( 2022, 2, 10 )
+        self.day2 = datetime.date( 2022, 2, 11 )
+        self.instruments = GpwInstruments()
+        self.instruments.updateSession( self.day1, { "AAA": "PL001", "BBB": "PL002" } )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_updateSession(self):
+        changed = self.instruments.updateSession( self.day2, { "AAA": "PL001", "CCC": "PL003" } )
+        self.assertTrue( changed )
+        self.assertEqual( self.instruments.getNameIsinDict(), { "AAA": "PL001", "CCC": "PL003" } )
+        self.assertEqual( self.instruments.getEntry( "PL001" ).firstDay, self.day1 )
+        self.assertEqual( self.instruments.getEntry( "PL001" ).lastDay, self.day2 )
+        self.assertEqual( self.instruments.getEntry( "PL002" ).lastDay, self.day1 )
+        self.assertEqual( self.instruments.getIsinFromName( "BBB" ), "PL002" )
+
+        ## older session is ignored
+        changed = self.instruments.updateSession( self.day1, { "DDD": "PL004" } )
+        self.assertFalse( changed )
+
+    def test_updateTickers(self):
+        changed = self.instruments.updateTickers( { "AAA": "AAT", "XXX": "XXT" } )
+        self.assertTrue( changed )
+        self.assertEqual( self.instruments.getTickerFromIsin( "PL001" ), "AAT" )
+        self.assertEqual( self.instruments.getTickerFromName( "AAA" ), "AAT" )
+        self.assertEqual( self.instruments.getIsinFromTicker( "AAT" ), "PL001" )
+        self.assertEqual( self.instruments.getNameFromTicker( "AAT" ), "AAA" )
+        self.assertIsNone( self.instruments.getIsinFromTicker( "XXT" ) )
+
+        changed = self.instruments.updateTickers( { "AAA": "AAT" } )
+        self.assertFalse( changed )
+
+        ## changed ticker -- old ticker is not resolved anymore
+        changed = self.instruments.updateTickers( { "AAA": "AAN" } )
+        self.assertTrue( changed )
+        self.assertEqual( self.instruments.getIsinFromTicker( "AAN" ), "PL001" )
+        self.assertIsNone( self.instruments.getIsinFromTicker( "AAT" ) )
+
+    def test_pickle(self):
+        self.instruments.updateTickers( { "AAA": "AAT" } )
+        data = pickle.dumps( self.instruments )
+        loaded = pickle.loads( data )
+        self.assertEqual( loaded.sessionDay, self.day1 )
+        self.assertEqual( loaded.getIsinFromTicker( "AAT" ), "PL001" )
+        self.assertEqual( loaded.getNameIsinDict(), self.instruments.getNameIsinDict() )
+
+    def test_provider(self):
+        storagePath = TMP_DIR + "out/instruments.pickle"
+        if os.path.isfile( storagePath ):
+            os.remove( storagePath )
+        archive = GpwArchiveDataMock( { self.day1: { "AAA": "PL001" }, self.day2: { "BBB": "PL002" } } )
+        provider = GpwInstrumentsProvider( archive, storagePath )
+
+        isinDict = provider.getISINForDate( self.day2 )
+        self.assertEqual( isinDict, { "BBB": "PL002" } )
+        self.assertEqual( archive.loadCounter, 1 )
+
+        ## session already loaded
+        isinDict = provider.getISINForDate( self.day2 + datetime.timedelta(days=2) )
+        self.assertEqual( isinDict, { "BBB": "PL002" } )
+        self.assertEqual( archive.loadCounter, 1 )
+
+        ## historical session
+        isinDict = provider.getISINForDate( self.day1 )
+        self.assertEqual( isinDict, { "AAA": "PL001" } )
+
+        ## valid days are resolved once
+        counter = archive.validDayCounter
+        provider.getISINForDate( self.day1 )
+        provider.getInstruments( self.day2 + datetime.timedelta(days=2) )
+        self.assertEqual( archive.validDayCounter, counter )
+
+        ## persisted
+        provider = GpwInstrumentsProvider( archive, storagePath )
+        self.assertEqual( provider.instruments.sessionDay, self.day2 )
+        os.remove( storagePath )
+
+    def test_provider_updateTickers_archiveLoading(self):
+        storagePath = TMP_DIR + "out/instruments_lock.pickle"
+        if os.path.isfile( storagePath ):
+            os.remove( storagePath )
+        archive = GpwArchiveBlockingMock( { self.day1: { "AAA": "PL001" } } )
+        provider = GpwInstrumentsProvider( archive, storagePath )
+        provider.getInstruments( self.day1 )
+
+        ## archive is being loaded in worker thread
+        archive.blocked.clear()
+        worker = threading.Thread( target=provider.getISINForDate, args=[ self.day2 ] )
+        worker.start()
+        self.assertTrue( archive.entered.wait( 5.0 ) )
+
+        ## tickers are updated without waiting for archive
+        updater = threading.Thread( target=provider.updateTickers, args=[ { "AAA": "AAT" } ] )
+        updater.start()
+        updater.join( 5.0 )
+        finished = not updater.is_alive()
+        archive.blocked.set()
+        worker.join()
+        updater.join()
+
+        self.assertTrue( finished )
+        self.assertEqual( provider.instruments.getIsinFromTicker( "AAT" ), "PL001" )
+        os.remove( storagePath )
@@ -0,0 +1,117 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+from stockmonitor.analysis.analysisjob import AnalysisJobRegistry, AnalysisCancelledError
+
+
+## =================================================================
+
+
+class AnalysisJobTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.registry = AnalysisJobRegistry()
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_acquire_duplicate(self):
+        job1, created1 = self.registry.acquire( ("key", 1) )
+        job2, created2 = self.registry.acquire( ("key", 1) )
+        job3, created3 = self.registry.acquire( ("key", 2) )
+        self.assertTrue( created1 )
+        self.assertFalse( created2 )
+        self.assertTrue( created3 )
+        self.assertIs( job1, job2 )
+        self.assertIsNot( job1, job3 )
+
+    def test_acquire_cancelled(self):
+        job1, _ = self.registry.acquire( "key" )
+        job1.cancel()
+        job2, created = self.registry.acquire( "key" )
+        self.assertTrue( created )
+        self.assertIsNot( job1, job2 )
+
+    def test_run_progress(self):
+        job, _ = self.registry.acquire( "key" )
+        progress = []
+        job.attach( lambda done, total: progress.append( (done, total) ) )
+
+        def calc():
+            for i in range(0, 3):
+                job.step( i, 3 )
+            return 7
+
+        result = job.run( calc )
+        self.assertEqual( result, 7 )
+        self.assertEqual( progress, [ (0, 3), (1, 3), (2, 3) ] )
+        self.assertTrue( job.isFinished() )
+        self.assertIsNone( self.registry.get( "key" ) )
+
+    def test_attach_duplicate(self):
+        job, _ = self.registry.acquire( "key" )
+        results = []
+        job.attach( None, lambda job, result: results.append( ("first", result) ) )
+        job2, created = self.registry.acquire( "key" )
+        self.assertFalse( created )
+        job2.attach( None, lambda job, result: results.append( ("second", result) ) )
+
+        job.run( lambda: 7 )
+        self.assertEqual( results, [ ("first", 7), ("second", 7) ] )
+
+    def test_attach_finished(self):
+        job, _ = self.registry.acquire( "key" )
+        job.run( lambda: 7 )
+        results = []
+        job.attach( None, lambda job, result: results.append( result ) )
+        self.assertEqual( results, [ 7 ] )
+
+    def test_run_cancel(self):
+        job, _ = self.registry.acquire( "key" )
+        steps = []
+
+        def calc():
+            for i in range(0, 3):
+                job.step( i, 3 )
+                steps.append( i )
+                job.cancel()
+            return 7
+
+        results = []
+        job.attach( None, lambda job, result: results.append( result ) )
+        result = job.run( calc )
+        self.assertIsNone( result )
+        self.assertEqual( steps, [ 0 ] )
+        self.assertEqual( results, [ None ] )
+        self.assertIsNone( self.registry.get( "key" ) )
+
+    def test_step_cancelled(self):
+        job, _ = self.registry.acquire( "key" )
+        job.cancel()
+        with self.assertRaises( AnalysisCancelledError ):
+            job.step( 0, 1 )
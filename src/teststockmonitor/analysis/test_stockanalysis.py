@@ -0,0 +1,119 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import datetime
+import os
+import pandas
+
+from stockdataaccess.dataaccess import TMP_DIR
+from stockdataaccess.dataaccess.datatype import StockDataType
+from stockmonitor.analysis.stockanalysis import StockAnalysis, calc_change_stats
+
+
+## =================================================================
+
+
+class AnalysisDataMock():
+
+    def __init__(self, openingPanel, closingPanel):
+        self.panels = { StockDataType.OPENING: openingPanel, StockDataType.CLOSING: closingPanel }
+
+    def getRecentValidDay(self, day):
+        return day
+
+    def getNextValidDay(self, day):
+        return day
+
+    def getDayData(self, _):
+        return None
+
+    def getDataPanel(self, dataType, _):
+        return self.panels[ dataType ]
+
+    def getISIN(self):
+        return {}
+
+
+class StockAnalysisTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        openingPanel = pandas.DataFrame( { "AAA": [10.0, 10.0], "BBB": [0.0, 10.0] } )
+        closingPanel = pandas.DataFrame( { "AAA": [11.0, 12.0], "BBB": [5.0, 9.0] } )
+        self.analysis = StockAnalysis()
+        self.analysis.data = AnalysisDataMock( openingPanel, closingPanel )
+        self.outFilePath = TMP_DIR + "out/test_day_change.csv"
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        if os.path.isfile( self.outFilePath ):
+            os.remove( self.outFilePath )
+
+    def test_calcMonday_zeroOpening(self):
+        result = self.analysis.calcMonday( 2, datetime.date( 2021, 3, 10 ), self.outFilePath )
+        ## raise from zero opening is not counted
+        self.assertEqual( list( result["name"] ), [ "AAA" ] )
+        self.assertEqual( result["accuracy"].iloc[0], 1.0 )
+
+    def test_calcFriday_zeroOpening(self):
+        result = self.analysis.calcFriday( 2, datetime.date( 2021, 3, 10 ), self.outFilePath )
+        self.assertEqual( list( result["name"] ), [ "AAA" ] )
+
+
+class CalcChangeStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_calc_change_stats(self):
+        refPanel = pandas.DataFrame( { "AAA": [10.0, 10.0, 10.0], "BBB": [0.0, 10.0, 10.0] } )
+        valPanel = pandas.DataFrame( { "AAA": [11.0, 9.0, 12.0], "BBB": [5.0, 9.0, 9.0] } )
+        stats = calc_change_stats( refPanel, valPanel, [50] )
+        self.assertEqual( stats.loc["AAA", "raise count"], 2 )
+        self.assertAlmostEqual( stats.loc["AAA", "raise avg"], 0.15 )
+        self.assertAlmostEqual( stats.loc["AAA", "change p50"], 0.1 )
+        ## change from zero is not defined
+        self.assertEqual( stats.loc["BBB", "raise count"], 0 )
+        self.assertTrue( pandas.isna( stats.loc["BBB", "raise avg"] ) )
+        self.assertAlmostEqual( stats.loc["BBB", "change p50"], -0.1 )
+
+        ## raise from zero is counted (weekend analysis)
+        stats = calc_change_stats( refPanel, valPanel, [50], zeroRefRaise=True )
+        self.assertEqual( stats.loc["AAA", "raise count"], 2 )
+        self.assertEqual( stats.loc["BBB", "raise count"], 1 )
+        self.assertTrue( pandas.isna( stats.loc["BBB", "raise avg"] ) )
+
+    def test_calc_change_stats_missing(self):
+        refPanel = pandas.DataFrame( { "AAA": [10.0, 10.0] }, index=["d1", "d2"] )
+        valPanel = pandas.DataFrame( { "AAA": [11.0, 12.0], "BBB": [5.0, 6.0] }, index=["d3", "d4"] )
+        stats = calc_change_stats( refPanel, valPanel )
+        self.assertEqual( stats.loc["AAA", "raise count"], 2 )
+        self.assertEqual( stats.loc["BBB", "raise count"], 0 )
+        self.assertEqual( list( stats.columns ), ["raise count", "raise avg"] )
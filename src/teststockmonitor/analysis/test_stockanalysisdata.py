@@ -22,15 +22,103 @@
 #
 
 import unittest
-# import datetime
+import datetime
+import multiprocessing.dummy
 import pandas
 
-from stockmonitor.analysis.stockanalysisdata import VarCalc
+from stockmonitor.analysis.stockanalysisdata import VarCalc, StockAnalysisData
 
 
 ## =================================================================
 
 
+class VarCalcMock( VarCalc ):
+
+    def __init__(self, dataDict):
+        super().__init__( None )
+        self.dataDict = dataDict
+        self.loadCounter = 0
+
+    ## override
+    def _loadWorksheet(self, key):
+        self.loadCounter += 1
+        _, isin = key
+        return self.dataDict.get( isin )
+
+
+class DataProviderMock():
+
+    def __init__(self):
+        self.loadCounter = 0
+
+    def getDataColumns(self, dataTypes, day):
+        self.loadCounter += 1
+        return pandas.DataFrame( { dataType: [ day.day ] for dataType in dataTypes } )
+
+
+class ArchiveSeriesMock():
+
+    def __init__(self, lastDay=None):
+        self.lastDay = lastDay
+        self.updatedRanges = []
+
+    def getLastDay(self):
+        return self.lastDay
+
+    def update(self, fromDay, toDay):
+        self.updatedRanges.append( ( fromDay, toDay ) )
+        self.lastDay = toDay
+        return 1
+
+
+class StockAnalysisDataTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_getDayData_cacheLimit(self):
+        data = StockAnalysisData()
+        data.dataProvider = DataProviderMock()
+        data.archiveSeries = None
+        data.DAYS_CACHE_SIZE = 2
+        day1 = datetime.date( 2021, 1, 4 )
+        day2 = datetime.date( 2021, 1, 5 )
+        day3 = datetime.date( 2021, 1, 6 )
+
+        data.getDayData( day1 )
+        data.getDayData( day2 )
+        data.getDayData( day1 )                 ## day2 becomes least recently used
+        self.assertEqual( data.dataProvider.loadCounter, 2 )
+
+        data.getDayData( day3 )
+        self.assertEqual( list( data.daysCache.keys() ), [ day1, day3 ] )
+        data.getDayData( day1 )
+        self.assertEqual( data.dataProvider.loadCounter, 3 )
+
+    def test_getDayData_archiveSeries(self):
+        data = StockAnalysisData()
+        data.dataProvider = DataProviderMock()
+        data.archiveSeries = ArchiveSeriesMock()
+        day1 = datetime.date( 2021, 1, 4 )
+        day2 = datetime.date( 2021, 1, 8 )
+
+        data.getDayData( day1 )
+        self.assertEqual( data.archiveSeries.updatedRanges, [ ( day1, day1 ) ] )
+
+        ## series is extended up to loaded day
+        data.getDayData( day2 )
+        self.assertEqual( data.archiveSeries.updatedRanges[-1], ( datetime.date( 2021, 1, 5 ), day2 ) )
+
+        ## older days are already covered
+        data.getDayData( datetime.date( 2021, 1, 6 ) )
+        self.assertEqual( len( data.archiveSeries.updatedRanges ), 2 )
+
+
 class VarCalcTest(unittest.TestCase):
 
     def setUp(self):
@@ -75,3 +163,22 @@ class VarCalcTest(unittest.TestCase):
         dataColumn = pandas.Series( [10.0, 7.5, 15.0, 11.0] )
         change = VarCalc.calcChange3( dataColumn, 20.0 )
         self.assertEqual(change, (100.0, 1))
+
+    def test_calculateMetrics(self):
+        dataFrame = pandas.DataFrame( { "c": [10.0, 11.0, 10.0, 11.0], "v": [100, 200, 100, 200] } )
+        calc = VarCalcMock( { "isin1": dataFrame } )
+        isinList = [ ("stock1", "isin1"), ("stock2", "isin2") ]
+        with multiprocessing.dummy.Pool( 2 ) as pool:
+            result = calc.calculateMetrics( [ ("change1", "c"), ("var", "c"), ("sum", "v") ], isinList, pool )
+        self.assertEqual( calc.loadCounter, 2 )
+        self.assertEqual( list( result.columns ), [ "change1 c", "var c", "sum v" ] )
+        self.assertEqual( list( result.index ), [ "stock1", "stock2" ] )
+        self.assertAlmostEqual( result.loc[ "stock1", "change1 c" ], VarCalc.calcChange1( dataFrame["c"] ) )
+        self.assertAlmostEqual( result.loc[ "stock1", "var c" ], VarCalc.calcVar( dataFrame["c"] ) )
+        self.assertEqual( result.loc[ "stock1", "sum v" ], 600 )
+        self.assertEqual( result.loc[ "stock2", "sum v" ], 0 )
+
+    def test_calculateMetrics_invalid(self):
+        calc = VarCalcMock( {} )
+        with self.assertRaises( ValueError ):
+            calc.calculateMetrics( [ ("xxx", "c") ], [], None )
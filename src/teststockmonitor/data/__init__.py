@@ -23,7 +23,13 @@
 
 import os
 import json
+from typing import Dict, List
+
 import yaml
+from pandas import DataFrame
+
+from stockdataaccess.dataaccess.datatype import StockDataType
+from stockdataaccess.dataaccess.gpw.gpwcurrentdata import GpwCurrentStockData
 
 
 SCRIPT_DIR = os.path.dirname(__file__)
@@ -47,3 +53,14 @@ def load_yaml( fileName: str ):
     data_path = get_data_path(fileName)
     with open( data_path, encoding="utf-8" ) as data_file:
         return yaml.full_load(data_file)
+
+
+## returns frame with columns layout the same as in 'GpwCurrentStockData'
+## columns not given in 'columnsData' are filled with "-"
+def create_current_stock_data( columnsData: Dict[ StockDataType, List ] ) -> DataFrame:
+    rowsNum = max( ( len( values ) for values in columnsData.values() ), default=0 )
+    columns = { f"col{col}": [ "-" ] * rowsNum for col in range( 15 ) }
+    for dataType, values in columnsData.items():
+        colIndex = GpwCurrentStockData.getColumnIndex( dataType )
+        columns[ f"col{colIndex}" ] = values
+    return DataFrame( columns )
@@ -22,12 +22,14 @@
 #
 
 import unittest
-# import datetime
+import io
+import datetime
 import codecs
-# import pandas
+import pandas
 
 from teststockmonitor.data import get_data_path
-from stockmonitor.dataaccess.transactionsloader import parse_mb_transactions_file
+from stockmonitor.dataaccess.transactionsloader import parse_mb_transactions_file, \
+    load_mb_transactions_data, parse_transaction_times
 
 
 ## =================================================================
@@ -58,6 +60,7 @@ class TransactionsLoaderTest(unittest.TestCase):
 
         self.assertEqual( dataFrame["currency"][0], "PLN" )
         self.assertEqual( dataFrame["unit_price"][1], 18.95 )
+        self.assertEqual( dataFrame["trans_time"][0], "14.04.2020 09:58:46" )
 
     def test_parse_mb_transactions_file_badseparator_02(self):
         transactionsPath = get_data_path( "transactions_bad_separator2.csv" )
@@ -76,3 +79,34 @@ class TransactionsLoaderTest(unittest.TestCase):
         self.assertEqual( dataFrame["commission_value"][0], 11.7 )
         self.assertEqual( dataFrame["price"][0], 3001.20 )
         self.assertEqual( dataFrame["unit_price"][1], 6.2 )
+
+    def test_parse_mb_transactions_file_noamount(self):
+        content = "22.11.2020 14:14:16;CCC;WWA-GPW;S;18;87,62;PLN;1 577,16;PLN\n" \
+                  "23.11.2020 14:14:16;CCC;WWA-GPW;S;;87,62;PLN;1 577,16;PLN\n"
+        dataFrame = parse_mb_transactions_file( io.StringIO( content ) )
+
+        self.assertEqual( len( dataFrame ), 1 )
+        self.assertEqual( dataFrame["amount"][0], 18 )
+        self.assertEqual( dataFrame["amount"].dtype, "int64" )
+
+    def test_load_mb_transactions_data_history(self):
+        content = "Historia transakcji\r\n" \
+                  "Czas transakcji;Walor;Gie\u0142da;K/S;Liczba;Kurs;Waluta;Warto\u015b\u0107;Waluta\r\n" \
+                  "22.11.2020 14:14:16;XTRADEBDM;WWA-GPW;S;1 018;87,62;PLN;89 197,16;PLN\r\n" \
+                  "\r\n"
+        dataFrame, dataType = load_mb_transactions_data( content )
+
+        self.assertEqual( dataType, 0 )
+        self.assertEqual( len( dataFrame ), 1 )
+        self.assertEqual( dataFrame["name"][0], "XTB" )
+        self.assertEqual( dataFrame["amount"][0], 1018 )
+        self.assertEqual( dataFrame["price"][0], 89197.16 )
+
+    def test_load_mb_transactions_data_noheader(self):
+        dataFrame, dataType = load_mb_transactions_data( "22.11.2020 14:14:16;CCC;WWA-GPW;S;18;87,62;PLN;1 577,16;PLN" )
+        self.assertEqual( dataFrame, None )
+        self.assertEqual( dataType, -1 )
+
+    def test_parse_transaction_times(self):
+        times = parse_transaction_times( pandas.Series( [ "31.03.2020 13:21:44", "xxx" ] ) )
+        self.assertEqual( times, [ datetime.datetime( 2020, 3, 31, 13, 21, 44 ), None ] )
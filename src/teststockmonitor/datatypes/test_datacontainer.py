@@ -23,9 +23,14 @@
 
 import unittest
 
+import datetime
+from pandas.core.frame import DataFrame
+
+from stockdataaccess.dataaccess.datatype import StockDataType
+from stockdataaccess.dataaccess.worksheetdata import WorksheetStorageMock
 from stockmonitor.datatypes.wallettypes import TransactionMatchMode
-from stockmonitor.datatypes.datacontainer import DataContainer
-from teststockmonitor.data import load_yaml
+from stockmonitor.datatypes.datacontainer import DataContainer, join_step_frames
+from teststockmonitor.data import load_yaml, create_current_stock_data
 
 
 class DataContainerTest(unittest.TestCase):
@@ -48,6 +53,44 @@ class DataContainerTest(unittest.TestCase):
         data_container.importWalletDict( trans_dict, True )
         self.assertEqual( data_container.wallet.currentItems(TransactionMatchMode.OLDEST), [('ALR', 100, 50.1)] )
 
+    def test_getFavStock(self):
+        data_container = DataContainer()
+        storage = WorksheetStorageMock()
+        data_container.gpwCurrentData.dao.storage = storage
+        storage.worksheet = create_current_stock_data( { StockDataType.TICKER: [ "AAA", "BBB", "CCC", "DDD" ] } )
+
+        self.assertEqual( data_container.getFavStock( "xxx" ), None )
+
+        data_container.favs.addFav( "xxx", [ "DDD", "BBB", "EEE" ] )
+        favStock = data_container.getFavStock( "xxx" )
+        self.assertEqual( list( favStock[ "col4" ] ), [ "BBB", "DDD" ] )
+        self.assertEqual( list( favStock.index ), [ 1, 3 ] )
+        self.assertIs( data_container.getFavStock( "xxx" ), favStock )
+
+        data_container.favs.addFav( "xxx", [ "AAA" ] )
+        favStock = data_container.getFavStock( "xxx" )
+        self.assertEqual( list( favStock[ "col4" ] ), [ "AAA", "BBB", "DDD" ] )
+
+        storage.worksheet = create_current_stock_data( { StockDataType.TICKER: [ "DDD", "CCC", "BBB", "AAA" ] } )
+        favStock = data_container.getFavStock( "xxx" )
+        self.assertEqual( list( favStock[ "col4" ] ), [ "DDD", "BBB", "AAA" ] )
+
+    def test_join_step_frames(self):
+        frame1 = DataFrame( [ [ datetime.date(2021, 1, 1), 10.0 ],
+                              [ datetime.date(2021, 1, 3), 20.0 ],
+                              [ datetime.date(2021, 1, 5), 30.0 ] ], columns=["t", "c"] )
+        frame2 = DataFrame( [ [ datetime.date(2021, 1, 2), 1.0 ],
+                              [ datetime.date(2021, 1, 3), 2.0 ],
+                              [ datetime.date(2021, 1, 6), 3.0 ] ], columns=["t", "c"] )
+        retData = join_step_frames( [ frame1, None, frame2, DataFrame( columns=["t", "c"] ) ] )
+        self.assertEqual( list( retData["t"] ), [ datetime.date(2021, 1, day) for day in [1, 2, 3, 5, 6] ] )
+        self.assertEqual( list( retData["c"] ), [ 10.0, 11.0, 22.0, 32.0, 33.0 ] )
+
+    def test_join_step_frames_empty(self):
+        retData = join_step_frames( [] )
+        self.assertTrue( retData.empty )
+        self.assertEqual( list( retData.columns ), [ "t", "c" ] )
+
     ## test results depend on stock exchange quotes
     # def test_getWalletState(self):
     #     trans_dict = load_yaml("trans_alior.yaml")
@@ -114,3 +114,39 @@ class MarkersContainerTest(unittest.TestCase):
         data.addMarker( "XXX", 1.0, 100, MarkerEntry.OperationType.SELL, "green" )
 
         self.assertEqual( data.getBestMatchingColor( "XXX", 2.5 ), "green" )
+
+    def test_getBestMatchingColor_equal_values(self):
+        data = MarkersContainer()
+        data.addMarker( "XXX", 3.0, 100, MarkerEntry.OperationType.SELL, "red" )
+        data.addMarker( "XXX", 3.0, 100, MarkerEntry.OperationType.SELL, "green" )
+        data.addMarker( "XXX", 4.0, 100, MarkerEntry.OperationType.BUY, "blue" )
+        data.addMarker( "XXX", 4.0, 100, MarkerEntry.OperationType.BUY, "yellow" )
+
+        self.assertEqual( data.getBestMatchingColor( "XXX", 3.0 ), "red" )
+        self.assertEqual( data.getBestMatchingColor( "XXX", 2.0 ), "blue" )
+
+    def test_getBestMatchingColor_modified(self):
+        data = MarkersContainer()
+        data.addMarker( "XXX", 3.0, 100, MarkerEntry.OperationType.BUY, "red" )
+        self.assertEqual( data.getBestMatchingColor( "XXX", 2.0 ), "red" )
+
+        newEntry = MarkerEntry()
+        newEntry.ticker = "XXX"
+        newEntry.value = 1.0
+        newEntry.setOperation( MarkerEntry.OperationType.SELL )
+        data.replaceItem( data.get( 0 ), newEntry )
+        self.assertEqual( data.getBestMatchingColor( "XXX", 2.0 ), "orange" )
+
+        data.deleteItem( newEntry )
+        self.assertEqual( data.getBestMatchingColor( "XXX", 2.0 ), None )
+
+        data.addItemList( [ newEntry ] )
+        self.assertEqual( data.getBestMatchingColor( "XXX", 2.0 ), "orange" )
+
+    def test_matchColors(self):
+        data = MarkersContainer()
+        data.addMarker( "XXX", 3.0, 100, MarkerEntry.OperationType.BUY, "red" )
+        data.addMarker( "YYY", 1.0, 100, MarkerEntry.OperationType.SELL, "green" )
+
+        colors = data.matchColors( [ "XXX", "XXX", "YYY", "YYY", "ZZZ" ], [ 2.0, 4.0, 2.0, "-", 2.0 ] )
+        self.assertEqual( colors, [ "red", None, "green", None, None ] )
@@ -24,9 +24,10 @@
 import unittest
 
 import datetime
+import pickle
 
 from stockmonitor.datatypes.datatypes import WalletData
-from stockmonitor.datatypes.wallettypes import TransactionMatchMode
+from stockmonitor.datatypes.wallettypes import TransactionMatchMode, Transaction
 from teststockmonitor.data import load_yaml
 
 
@@ -53,6 +54,36 @@ class WalletDataTest(unittest.TestCase):
         self.assertEqual( items[1].amount, 2 )
         self.assertEqual( items[2].amount, 1 )
 
+    def test_tickers_index(self):
+        dataobject = WalletData()
+        dataobject.addTransaction( "xxx name", "xxx", 2, 20.0, datetime.datetime(2, 2, 2) )
+        dataobject.addTransaction( "yyy name", "yyy", 1, 20.0, datetime.datetime(1, 1, 1) )
+        dataobject.addTransaction( "yyy name", "yyy", -1, 20.0, datetime.datetime(3, 3, 3) )
+
+        self.assertEqual( dataobject.tickers(), set( ["xxx", "yyy"] ) )
+        self.assertEqual( dataobject.transactions("yyy").size(), 2 )
+        self.assertEqual( dataobject.transactions("zzz"), None )
+        self.assertEqual( dataobject.getCurrentStock(), [ "xxx" ] )
+        self.assertEqual( dataobject.getCurrentStockSet(), set( ["xxx"] ) )
+
+        dataobject.addTransaction( "yyy name", "yyy", 5, 20.0, datetime.datetime(4, 4, 4) )
+        self.assertEqual( dataobject.getCurrentStockSet(), set( ["xxx", "yyy"] ) )
+
+        ## tickers set is cached until modification
+        self.assertIs( dataobject.tickers(), dataobject.tickers() )
+        dataobject.addTransaction( "zzz name", "zzz", 1, 20.0, datetime.datetime(5, 5, 5) )
+        self.assertEqual( dataobject.tickers(), set( ["xxx", "yyy", "zzz"] ) )
+        dataobject.remTransactionObject( ("zzz name", "zzz"), Transaction( 1, 20.0, 0.0, datetime.datetime(5, 5, 5) ) )
+
+        loaded = pickle.loads( pickle.dumps( dataobject ) )
+        self.assertEqual( loaded.transactions("yyy").size(), 3 )
+        self.assertEqual( loaded.getCurrentStock(), [ "xxx", "yyy" ] )
+
+        dataobject.clear()
+        self.assertEqual( dataobject.tickers(), set() )
+        self.assertEqual( dataobject.transactions("xxx"), None )
+        self.assertEqual( dataobject.getCurrentStock(), [] )
+
     def test_add_buy(self):
         dataobject = WalletData()
         matchMode = TransactionMatchMode.BEST
@@ -163,6 +194,28 @@ class WalletDataTest(unittest.TestCase):
         self.assertEqual( amount, 1 )
         self.assertEqual( unit_price, 11.0 )
 
+    def test_addWallet(self):
+        dataobject = WalletData()
+        dataobject.addTransaction( "xxx name", "xxx", 2, 20.0, datetime.datetime(2, 2, 2) )
+        dataobject.addTransaction( "xxx name", "xxx", 1, 20.0, datetime.datetime(1, 1, 1) )
+
+        importWallet = WalletData()
+        importWallet.addTransaction( "xxx name", "xxx", 1, 20.0, datetime.datetime(1, 1, 1) )
+        importWallet.addTransaction( "xxx name", "xxx", 3, 20.0, datetime.datetime(3, 3, 3) )
+        importWallet.addTransaction( "yyy name", "yyy", 4, 20.0, datetime.datetime(4, 4, 4) )
+
+        dataobject.addWallet( importWallet )
+
+        self.assertEqual( dataobject.tickers(), set( ["xxx", "yyy"] ) )
+        items = dataobject.transactions("xxx").items()
+        self.assertEqual( [ item.amount for item in items ], [ 3, 2, 1 ] )
+        self.assertEqual( dataobject.transactions("yyy").currentAmount(), 4 )
+        self.assertEqual( dataobject.getCurrentStockSet(), set( ["xxx", "yyy"] ) )
+
+        ## repeated import does not duplicate transactions
+        dataobject.addWallet( importWallet )
+        self.assertEqual( dataobject.transactions("xxx").size(), 3 )
+
     def test_importDataFromDict(self):
         trans_dict = load_yaml("trans_agora.yaml")
         wallet = WalletData()
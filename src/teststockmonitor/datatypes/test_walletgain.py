@@ -0,0 +1,84 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+import datetime
+
+from stockmonitor.datatypes.walletdata import WalletData
+from stockmonitor.datatypes.wallettypes import TransactionMatchMode
+from stockmonitor.datatypes.walletgain import WalletGainHistory
+
+
+## =================================================================
+
+
+class WalletGainHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.wallet = WalletData()
+        self.wallet.addTransaction( "AAA", "AAA",  10, 10.0, datetime.datetime(2020, 10, 1, 12, 0, 0), 1.0 )
+        self.wallet.addTransaction( "BBB", "BBB",  10, 20.0, datetime.datetime(2020, 10, 2, 12, 0, 0), 1.0 )
+        self.wallet.addTransaction( "AAA", "AAA", -10, 12.0, datetime.datetime(2020, 10, 3, 12, 0, 0), 1.0 )
+        self.wallet.addTransaction( "BBB", "BBB",  -5, 22.0, datetime.datetime(2020, 10, 4, 12, 0, 0), 1.0 )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_getHistory(self):
+        gainHistory = WalletGainHistory( TransactionMatchMode.OLDEST )
+        dataFrame = gainHistory.getHistory( self.wallet.stockData() )
+
+        self.assertEqual( list( dataFrame["t"] ), [ datetime.datetime(2020, 10, 3, 12, 0, 0),
+                                                    datetime.datetime(2020, 10, 4, 12, 0, 0) ] )
+        self.assertEqual( list( dataFrame["c"] ), [ 18.0, 26.5 ] )
+
+    def test_getHistory_start(self):
+        gainHistory = WalletGainHistory( TransactionMatchMode.OLDEST )
+        startDate = datetime.datetime(2020, 10, 4, 0, 0, 0)
+        dataFrame = gainHistory.getHistory( self.wallet.stockData(), startDate )
+
+        self.assertEqual( list( dataFrame["t"] ), [ startDate, datetime.datetime(2020, 10, 4, 12, 0, 0) ] )
+        self.assertEqual( list( dataFrame["c"] ), [ 18.0, 26.5 ] )
+
+        dataFrame = gainHistory.getHistory( self.wallet.stockData(), datetime.datetime(2020, 10, 5, 0, 0, 0) )
+        self.assertEqual( list( dataFrame["c"] ), [ 26.5 ] )
+
+    def test_getHistory_append(self):
+        gainHistory = WalletGainHistory( TransactionMatchMode.OLDEST )
+        gainHistory.getHistory( self.wallet.stockData() )
+
+        self.wallet.addTransaction( "BBB", "BBB", -5, 19.0, datetime.datetime(2020, 10, 5, 12, 0, 0), 1.0 )
+        dataFrame = gainHistory.getHistory( self.wallet.stockData() )
+        self.assertEqual( gainHistory.size(), 3 )
+        self.assertEqual( list( dataFrame["c"] ), [ 18.0, 26.5, 20.0 ] )
+
+        ## transaction in the past
+        self.wallet.addTransaction( "AAA", "AAA", 10, 10.0, datetime.datetime(2020, 9, 1, 12, 0, 0), 1.0 )
+        dataFrame = gainHistory.getHistory( self.wallet.stockData() )
+        self.assertEqual( list( dataFrame["c"] ), [ 18.0, 26.5, 20.0 ] )
+
+        self.wallet.clear()
+        dataFrame = gainHistory.getHistory( self.wallet.stockData() )
+        self.assertTrue( dataFrame.empty )
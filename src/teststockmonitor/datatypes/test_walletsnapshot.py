@@ -0,0 +1,88 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import datetime
+
+from stockdataaccess.dataaccess.datatype import StockDataType
+from stockdataaccess.dataaccess.worksheetdata import WorksheetStorageMock
+from stockmonitor.datatypes.datacontainer import DataContainer
+from stockmonitor.datatypes.walletsnapshot import get_stock_prices
+from teststockmonitor.data import create_current_stock_data
+
+
+class WalletSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.dataContainer = DataContainer()
+        currentData = create_current_stock_data( { StockDataType.STOCK_NAME:    [ "AAA SA", "BBB SA" ],
+                                                   StockDataType.ISIN:          [ "PL001", "PL002" ],
+                                                   StockDataType.TICKER:        [ "AAA", "BBB" ],
+                                                   StockDataType.REFERENCE:     [ 10.0, 5.0 ],
+                                                   StockDataType.RECENT_VALUE:  [ 12.0, "-" ],
+                                                   StockDataType.CHANGE_TO_REF: [ 20.0, "-" ] } )
+        dataAccess = self.dataContainer.gpwCurrentData
+        dataAccess.dao.storage = WorksheetStorageMock()
+        dataAccess.dao.storage.worksheet = currentData
+
+        wallet = self.dataContainer.wallet
+        wallet.addTransaction( "AAA SA", "AAA", 100, 10.0, datetime.datetime(2021, 1, 4, 10, 0, 0), 3.0, False )
+        wallet.addTransaction( "BBB SA", "BBB", 200,  4.0, datetime.datetime(2021, 1, 4, 11, 0, 0), 3.0, False )
+        wallet.addTransaction( "CCC SA", "CCC",  10,  1.0, datetime.datetime(2021, 1, 4, 12, 0, 0), 3.0, False )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_get_stock_prices(self):
+        currentData = self.dataContainer.gpwCurrentData.getWorksheetData()
+        prices = get_stock_prices( currentData )
+        self.assertEqual( list( prices["ticker"] ), [ "AAA", "BBB" ] )
+        self.assertEqual( list( prices["unit_price"] ), [ 12.0, 5.0 ] )
+        self.assertEqual( list( prices["change_pnt"] ), [ 20.0, 0.0 ] )
+
+    def test_getWalletState(self):
+        state = self.dataContainer.getWalletState( False )
+        ## value: 1200 - 5 (commission) + 1000 - 5 (commission), buy cost: 1003 + 803
+        self.assertEqual( state, ( 2190.0, 384.0, "9.5%", 0.0, 384.0 ) )
+
+    def test_getWalletStock(self):
+        stock = self.dataContainer.getWalletStock()
+        ## sorted by profit
+        self.assertEqual( list( stock["Ticker"] ), [ "BBB", "AAA", "CCC" ] )
+        self.assertEqual( list( stock["Wartość [PLN]"] ), [ 995.0, 1195.0, "" ] )
+        self.assertEqual( list( stock["Zm.do k.odn.[PLN]"] ), [ 0.0, 240.0, "" ] )
+        self.assertEqual( list( stock["Średni kurs nabycia"] ), [ 4.015, 10.03, 1.3 ] )
+
+    def test_getWalletSnapshot_cache(self):
+        snapshot = self.dataContainer.getWalletSnapshot()
+        self.assertIs( self.dataContainer.getWalletSnapshot(), snapshot )
+
+        self.dataContainer.wallet.addTransaction( "AAA SA", "AAA", -50, 12.0, datetime.datetime(2021, 1, 5), 3.0 )
+        newSnapshot = self.dataContainer.getWalletSnapshot()
+        self.assertIsNot( newSnapshot, snapshot )
+
+        dataAccess = self.dataContainer.gpwCurrentData
+        dataAccess.dao.storage.worksheet = dataAccess.dao.storage.worksheet.copy()
+        self.assertIsNot( self.dataContainer.getWalletSnapshot(), newSnapshot )
@@ -24,10 +24,12 @@
 import unittest
 
 import datetime
+import pickle
 import pandas
 
 from stockmonitor.datatypes.wallettypes import TransHistory, Transaction, \
-    TransactionMatchMode, TransactionsMatch, BuyTransactionsMatch, SellTransactionsMatch
+    TransactionMatchMode, TransactionsMatch, BuyTransactionsMatch, SellTransactionsMatch, \
+    broker_commission, broker_commission_array
 
 
 class TransHistoryTest(unittest.TestCase):
@@ -66,6 +68,61 @@ class TransHistoryTest(unittest.TestCase):
         foundIndex = data.findIndex( indexTime )
         self.assertEqual( foundIndex, 3 )
 
+    def test_findIndex_unordered(self):
+        data = TransHistory()
+        data.appendItem( ( 1, 1.0, 0.0, datetime.datetime(2020, 10, 8, 12, 0, 0) ) )
+        data.appendItem( ( 1, 1.0, 0.0, datetime.datetime(2020, 10, 6, 12, 0, 0) ) )     ## older than previous
+        self.assertFalse( data.isTimeOrdered() )
+
+        ## linear search is used
+        self.assertEqual( data.findIndex( datetime.datetime(2020, 10, 7, 12, 0, 0) ), 0 )
+
+        data.sort()
+        self.assertTrue( data.isTimeOrdered() )
+        self.assertEqual( data.findIndex( datetime.datetime(2020, 10, 7, 12, 0, 0) ), 1 )
+
+    def test_setTransactions_unordered(self):
+        data = TransHistory()
+        transList = [ Transaction( 1, 1.0, 0.0, datetime.datetime(2020, 10, 6, 12, 0, 0) ),
+                      Transaction( 2, 1.0, 0.0, datetime.datetime(2020, 10, 8, 12, 0, 0) ) ]
+        data.setTransactions( transList )
+        self.assertFalse( data.isTimeOrdered() )
+
+        data.sort()
+        self.assertEqual( [ item.amount for item in data.transactions ], [ 2, 1 ] )
+
+    def test_findSame(self):
+        data = TransHistory()
+        transList = \
+            [ ( 3, 1.0, 0.0, datetime.datetime(2020, 10, 8, 12, 0, 0) ),
+              ( 2, 1.0, 0.0, datetime.datetime(2020, 10, 7, 12, 0, 0) ),
+              ( 1, 1.0, 0.0, datetime.datetime(2020, 10, 7, 12, 0, 0) ),
+              ( 1, 1.0, 0.0, datetime.datetime(2020, 10, 6, 12, 0, 0) ) ]
+        data.appendList( transList )
+
+        data.rem( 1, 1.0, 0.0, datetime.datetime(2020, 10, 7, 12, 0, 0) )
+        self.assertEqual( [ item.amount for item in data.transactions ], [ 3, 2, 1 ] )
+        self.assertEqual( data[2].transTime, datetime.datetime(2020, 10, 6, 12, 0, 0) )
+
+        data.rem( 1, 1.0, 0.0, datetime.datetime(2020, 10, 5, 12, 0, 0) )      ## not existing
+        self.assertEqual( data.size(), 3 )
+
+    def test_addList_remList(self):
+        data = TransHistory()
+        data.add( 5, 1.0, 0.0, datetime.datetime(2020, 10, 7, 12, 0, 0) )
+        transList = \
+            [ ( 1, 1.0, 0.0, datetime.datetime(2020, 10, 6, 12, 0, 0) ),
+              ( 2, 1.0, 0.0, datetime.datetime(2020, 10, 8, 12, 0, 0) ),
+              ( 3, 1.0, 0.0, datetime.datetime(2020, 10, 7, 12, 0, 0) ) ]
+        data.addList( transList )
+        self.assertEqual( [ item.amount for item in data.transactions ], [ 2, 3, 5, 1 ] )
+        self.assertTrue( data.isTimeOrdered() )
+
+        data.remList( [ ( 5, 1.0, 0.0, datetime.datetime(2020, 10, 7, 12, 0, 0) ),
+                        ( 1, 1.0, 0.0, datetime.datetime(2020, 10, 6, 12, 0, 0) ),
+                        ( 1, 1.0, 0.0, datetime.datetime(2020, 10, 6, 12, 0, 0) ) ] )
+        self.assertEqual( [ item.amount for item in data.transactions ], [ 2, 3 ] )
+
     def test_findIndexBefore_before(self):
         data = TransHistory()
         data.append( -8, 20.0, 0.1, datetime.datetime( year=2020, month=5, day=4 ) )
@@ -326,6 +383,27 @@ class TransHistoryTest(unittest.TestCase):
         indexList = data.matchStockAfter( dataframe )
         self.assertEqual( indexList, [1, 1, 0] )
 
+    def test_matchStockRowsTransactions(self):
+        data = TransHistory()
+
+        ## reverse order (amount, unit_price, commission, trans time)
+        transList = \
+            [ ( 100, 3.0, 0.0, datetime.datetime(2020, 10, 11, 12, 0, 0)),
+              ( 100, 2.0, 0.0, datetime.datetime(2020, 10, 8, 12, 0, 0)),
+              ( 100, 1.0, 0.0, datetime.datetime(2020, 10, 6, 12, 0, 0)) ]
+
+        data.appendList( transList )
+
+        dataframe = pandas.DataFrame( [ [ datetime.datetime(2020, 10,  5, 12, 0, 0), 10.0 ],
+                                        [ datetime.datetime(2020, 10,  6, 12, 0, 0), 10.0 ],
+                                        [ datetime.datetime(2020, 10,  7, 12, 0, 0), 10.0 ],
+                                        [ datetime.datetime(2020, 10, 10, 12, 0, 0), 12.0 ],
+                                        [ datetime.datetime(2020, 10, 12, 12, 0, 0), 12.0 ]
+                                        ], columns=[ 't', 'c' ] )
+
+        indexList = data.matchStockRowsTransactions( dataframe )
+        self.assertEqual( list( indexList ), [-1, 0, 1, 2, 2] )
+
     def test_calculateValueHistory(self):
         data = TransHistory()
 
@@ -469,6 +547,61 @@ class TransHistoryTest(unittest.TestCase):
         self.assertEqual( trans.amount, 100 )
         self.assertEqual( trans.unitPrice, 3.0 )
 
+    def test_matchTransactions_incremental(self):
+        data = TransHistory()
+
+        ## reverse order
+        transList = \
+            [ (  300, 4.0, 0.1, datetime.datetime(2020, 9, 25, 13, 11, 31)),
+              (  200, 3.0, 0.1, datetime.datetime(2020, 8, 31,  9, 11, 26)),
+              (  100, 2.0, 0.1, datetime.datetime(2020, 8, 25, 13, 11, 31)) ]
+
+        data.appendList( transList )
+        buyList, sellList = data.matchTransactionsBestFit()
+        self.assertEqual( len( buyList ), 3 )
+        self.assertEqual( len( sellList ), 0 )
+
+        data.appendItem( ( -150, 3.5, 0.1, datetime.datetime(2020, 10, 5, 15, 41, 33) ) )
+        buyList, sellList = data.matchTransactionsBestFit()
+        self.assertEqual( [ ( item.amount, item.unitPrice ) for item in buyList ], [ (300, 4.0), (150, 3.0) ] )
+        self.assertEqual( len( sellList ), 2 )
+        replayList = data.replayTransactions( TransactionMatchMode.BEST )[0]
+        self.assertEqual( [ tuple( item ) for item in buyList ], [ tuple( item ) for item in replayList ] )
+
+        data.rem( 300, 4.0, 0.1, datetime.datetime(2020, 9, 25, 13, 11, 31) )
+        buyList, sellList = data.matchTransactionsBestFit()
+        self.assertEqual( [ ( item.amount, item.unitPrice ) for item in buyList ], [ (150, 3.0) ] )
+
+    def test_matchTransactions_copy(self):
+        data = TransHistory()
+        data.append( 100, 2.0, 0.1, datetime.datetime(2020, 8, 25, 13, 11, 31) )
+        buyList, _ = data.matchTransactionsFirst()
+        currList = data.currentTransactions( TransactionMatchMode.OLDEST )
+
+        ## appending sell does not change lists returned before
+        data.appendItem( ( -40, 3.0, 0.1, datetime.datetime(2020, 9, 25, 13, 11, 31) ) )
+        self.assertEqual( buyList[0].amount, 100 )
+        self.assertEqual( currList[0].amount, 100 )
+
+        ## modifying returned lists does not change cached state
+        buyList, sellList = data.matchTransactionsFirst()
+        buyList[0].amount = 1
+        sellList[0][0].amount = 1
+        buyList, sellList = data.matchTransactionsFirst()
+        self.assertEqual( buyList[0].amount, 60 )
+        self.assertEqual( sellList[0][0].amount, 40 )
+
+    def test_matchTransactions_pickle(self):
+        data = TransHistory()
+        data.append( 100, 2.0, 0.1, datetime.datetime(2020, 8, 25, 13, 11, 31) )
+        state1 = pickle.dumps( data )
+        data.matchTransactionsFirst()
+        state2 = pickle.dumps( data )
+        self.assertEqual( state1, state2 )
+
+        loaded = pickle.loads( state2 )
+        self.assertEqual( loaded.currentTransactionsAvg( TransactionMatchMode.OLDEST ), (100, 2.001) )
+
     def test_sellTransactions_bestFit_01(self):
         data = TransHistory()
         matchMode = TransactionMatchMode.BEST
@@ -550,3 +683,52 @@ class TransHistoryTest(unittest.TestCase):
 
         gainValue = data.transactionsGain( matchMode, True )
         self.assertEqual( gainValue, 99.19999999999999 )
+
+
+class TransactionTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_pickle(self):
+        item = Transaction( 10, 2.0, 0.5, datetime.datetime(2020, 10, 6, 12, 0, 0) )
+        loaded = pickle.loads( pickle.dumps( item ) )
+        self.assertEqual( tuple( loaded ), tuple( item ) )
+        self.assertFalse( hasattr( loaded, "__dict__" ) )
+
+    def test_setstate_dict(self):
+        ## state of object stored before introducing slots
+        item = Transaction.empty()
+        item.__setstate__( { "amount": 10, "unitPrice": 2.0, "commission": 0.5,
+                             "transTime": datetime.datetime(2020, 10, 6, 12, 0, 0) } )
+        self.assertEqual( tuple( item ), ( 10, 2.0, 0.5, datetime.datetime(2020, 10, 6, 12, 0, 0) ) )
+
+
+class BrokerCommissionTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_broker_commission_array(self):
+        values = [ 100.0, -100.0, 10000.0, 100.0, 10000.0 ]
+        times  = [ datetime.datetime(2020, 10, 5, 12, 0, 0),
+                   datetime.datetime(2020, 10, 6, 23, 0, 0),
+                   datetime.datetime(2020, 10, 6, 12, 0, 0),
+                   datetime.datetime(2020, 10, 7, 9, 0, 0),
+                   datetime.datetime(2020, 10, 8, 12, 0, 0) ]
+        commission = broker_commission_array( values, times )
+        expected = [ broker_commission( val, tim ) for val, tim in zip( values, times ) ]
+        self.assertEqual( list( commission ), expected )
+        self.assertEqual( list( commission ), [ 3.0, 3.0, 39.0, 5.0, 39.0 ] )
+
+    def test_broker_commission_array_notime(self):
+        commission = broker_commission_array( [ 100.0, 10000.0 ] )
+        self.assertEqual( list( commission ), [ 5.0, 39.0 ] )
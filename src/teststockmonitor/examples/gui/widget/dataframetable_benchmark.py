@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+#
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+try:
+    ## following import success only when file is directly executed from command line
+    ## otherwise will throw exception when executing as parameter for "python -m"
+    # pylint: disable=W0611
+    import __init__
+except ImportError:
+    ## when import fails then it means that the script was executed indirectly
+    ## in this case __init__ is already loaded
+    pass
+
+import sys
+import time
+
+import numpy
+import pandas
+
+from stockmonitor.gui.widget.dataframemodel import DataFrameTableModel, QtDisplayRole, QtUserRole
+
+
+## benchmark of 'DataFrameTableModel.data()' -- does not require QApplication nor display
+
+
+def create_data( rowsNum, colsNum ):
+    dataDict = {}
+    for col in range( colsNum ):
+        if col % 4 == 0:
+            dataDict[ f"name {col}" ] = [ f"item {row}" for row in range( rowsNum ) ]
+        elif col % 4 == 1:
+            dataDict[ f"int {col}" ] = numpy.arange( rowsNum )
+        else:
+            dataDict[ f"float {col}" ] = numpy.random.rand( rowsNum ) * 100.0
+    return pandas.DataFrame( dataDict )
+
+
+def drive_model( model: DataFrameTableModel, repeats ):
+    rowsNum = model.rowCount()
+    colsNum = model.columnCount()
+    indexes = [ model.index( row, col ) for row in range( rowsNum ) for col in range( colsNum ) ]
+    startTime = time.time()
+    for _ in range( repeats ):
+        for index in indexes:
+            model.data( index, QtDisplayRole )
+            model.data( index, QtUserRole )
+    return time.time() - startTime
+
+
+## ============================= main section ===================================
+
+
+if __name__ != '__main__':
+    sys.exit(0)
+
+
+dataFrame = create_data( 400, 20 )
+repeatsNum = 5
+
+dataModel = DataFrameTableModel( None )
+dataModel.setBufferedMode( False )
+dataModel.setContent( dataFrame )
+directTime = drive_model( dataModel, repeatsNum )
+
+dataModel.setBufferedMode( True )
+contentStart = time.time()
+dataModel.setContent( dataFrame )
+contentTime = time.time() - contentStart
+bufferedTime = drive_model( dataModel, repeatsNum )
+
+print( f"grid: {dataFrame.shape[0]}x{dataFrame.shape[1]}, full grid passes: {repeatsNum}" )
+print( f"direct access:   {directTime:.3f}s" )
+print( f"buffered access: {bufferedTime:.3f}s (content preparation: {contentTime:.3f}s)" )
@@ -0,0 +1,243 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+import numpy
+import pandas
+
+from PyQt5.QtCore import Qt, QModelIndex
+
+from stockmonitor.gui.widget.dataframetable import DFProxyModel
+from stockmonitor.gui.widget.dataframemodel import DataFrameTableModel, ChunkedDataFrameTableModel, \
+    sort_ranks, sort_permutation, filter_values, filter_mask
+
+
+## =================================================================
+
+
+class DataFrameTableModelTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_data_buffered(self):
+        dataFrame = pandas.DataFrame( { "a": [ "xxx", None ],
+                                        "b": [ 1.5, numpy.nan ],
+                                        "c": pandas.to_datetime( [ "2020-01-01", "2021-02-02 10:00" ] ) } )
+        model = DataFrameTableModel( dataFrame )
+        self.assertFalse( model.isBufferedMode() )
+
+        for bufferedMode in [ True, False ]:
+            model.setBufferedMode( bufferedMode )
+            self.assertEqual( model.rowCount(), 2 )
+            self.assertEqual( model.data( model.index( 0, 0 ), Qt.DisplayRole ), "xxx" )
+            self.assertEqual( model.data( model.index( 1, 0 ), Qt.DisplayRole ), "None" )
+            self.assertEqual( model.data( model.index( 0, 1 ), Qt.UserRole ), 1.5 )
+            self.assertEqual( model.data( model.index( 1, 1 ), Qt.DisplayRole ), "nan" )
+            self.assertEqual( model.data( model.index( 1, 2 ), Qt.UserRole ), pandas.Timestamp( "2021-02-02 10:00" ) )
+            self.assertEqual( model.data( model.index( 1, 2 ), Qt.DisplayRole ), "2021-02-02 10:00:00" )
+
+    def test_setContent(self):
+        model = DataFrameTableModel( None )
+        self.assertEqual( model.rowCount(), 0 )
+
+        model.setContent( pandas.DataFrame( { "a": [ 1, 2, 3 ] } ) )
+        self.assertEqual( model.rowCount(), 3 )
+        self.assertEqual( model.data( model.index( 2, 0 ), Qt.DisplayRole ), "3" )
+
+        model.setContent( None )
+        self.assertEqual( model.rowCount(), 0 )
+
+    def test_setContent_update(self):
+        model = DataFrameTableModel( pandas.DataFrame( { "a": [ "x", "y", "z", "w" ], "b": [ 1, 2, 3, 4 ] } ) )
+        model.setBufferedMode( True )
+        model.setKeyColumn( 0 )
+        resetCounter = []
+        changedList  = []
+        model.modelReset.connect( lambda: resetCounter.append( 1 ) )
+        model.dataChanged.connect( lambda topLeft, bottomRight, _:
+                                   changedList.append( ( topLeft.row(), topLeft.column(),
+                                                         bottomRight.row(), bottomRight.column() ) ) )
+        version = model.contentVersion()
+
+        model.setContent( pandas.DataFrame( { "a": [ "x", "y", "z", "w" ], "b": [ 5, 2, 6, 7 ] } ) )
+        self.assertEqual( len( resetCounter ), 0 )
+        self.assertEqual( changedList, [ (0, 1, 0, 1), (2, 1, 3, 1) ] )
+        self.assertEqual( model.data( model.index( 3, 1 ), Qt.DisplayRole ), "7" )
+        self.assertGreater( model.contentVersion(), version )
+
+        ## changed keys
+        changedList.clear()
+        model.setContent( pandas.DataFrame( { "a": [ "y", "x", "z", "w" ], "b": [ 5, 2, 6, 7 ] } ) )
+        self.assertEqual( len( resetCounter ), 1 )
+        self.assertEqual( changedList, [] )
+
+        ## changed shape
+        model.setContent( pandas.DataFrame( { "a": [ "y", "x", "z" ], "b": [ 5, 2, 6 ] } ) )
+        self.assertEqual( len( resetCounter ), 2 )
+        self.assertEqual( model.rowCount(), 3 )
+
+
+class ChunkedDataFrameTableModelTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_fetchMore(self):
+        dataFrame = pandas.DataFrame( { "a": list( range( 25 ) ) } )
+        model = ChunkedDataFrameTableModel( dataFrame, chunkSize=10 )
+        self.assertEqual( model.rowCount(), 10 )
+        self.assertEqual( model.totalRowCount(), 25 )
+
+        fetchCounter = 0
+        while model.canFetchMore( QModelIndex() ):
+            model.fetchMore( QModelIndex() )
+            fetchCounter += 1
+        self.assertEqual( fetchCounter, 2 )
+        self.assertEqual( model.rowCount(), 25 )
+        self.assertEqual( model.data( model.index( 24, 0 ), Qt.DisplayRole ), "24" )
+
+    def test_sort_filter(self):
+        dataFrame = pandas.DataFrame( { "a": [ 3.0, "-", 1.0, 2.0, 5.0 ] } )
+        model = ChunkedDataFrameTableModel( dataFrame, chunkSize=2 )
+        proxy = DFProxyModel()
+        proxy.setSourceModel( model )
+
+        ## whole content is sorted, not only fetched rows
+        proxy.sort( 0, Qt.DescendingOrder )
+        self.assertEqual( proxy.rowCount(), 2 )
+        self.assertEqual( [ model.dataRow( row ) for row in range( 2 ) ], [ 4, 0 ] )
+        self.assertEqual( proxy.index( 0, 0 ).data( Qt.UserRole ), 5.0 )
+
+        proxy.setFilterKeyColumn( 0 )
+        proxy.setFilterCondition( 2 )
+        proxy.setFilterFixedString( "2.5" )
+        proxy.updateChunkedFilter()
+        ## no-data rows are treated as lowest in descending order
+        self.assertEqual( model.totalRowCount(), 3 )
+        self.assertEqual( [ model.dataRow( row ) for row in range( 2 ) ], [ 3, 2 ] )
+
+        proxy.clearFilter()
+        self.assertEqual( model.totalRowCount(), 5 )
+
+    def test_sort_clear(self):
+        dataFrame = pandas.DataFrame( { "a": [ 3.0, "-", 1.0, 2.0, 5.0 ] } )
+        model = ChunkedDataFrameTableModel( dataFrame, chunkSize=10 )
+        proxy = DFProxyModel()
+        proxy.setSourceModel( model )
+
+        proxy.sort( 0, Qt.AscendingOrder )
+        self.assertEqual( [ model.dataRow( row ) for row in range( 5 ) ], [ 2, 3, 0, 4, 1 ] )
+
+        ## cleared sort indicator passes negative column
+        proxy.sort( -1, Qt.AscendingOrder )
+        self.assertEqual( [ model.dataRow( row ) for row in range( 5 ) ], [ 0, 1, 2, 3, 4 ] )
+
+        ## natural order is kept on new content
+        model.setContent( pandas.DataFrame( { "a": [ 4.0, 1.0 ] } ) )
+        self.assertEqual( [ model.dataRow( row ) for row in range( 2 ) ], [ 0, 1 ] )
+
+
+class DFProxyModelTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_sort_ranks(self):
+        ranks = sort_ranks( numpy.array( [ 3.0, numpy.nan, 1.0, 3.0 ] ) )
+        self.assertEqual( ranks.tolist(), [ 1, -1, 0, 1 ] )
+
+        ranks = sort_ranks( numpy.array( [ "10", "-", 9, None, "2.5" ], dtype=object ) )
+        self.assertEqual( ranks.tolist(), [ 2, -1, 1, -1, 0 ] )
+
+        ranks = sort_ranks( numpy.array( [ "bb", "a", "-", "c" ], dtype=object ) )
+        self.assertEqual( ranks.tolist(), [ 1, 0, -1, 2 ] )
+
+        ## mixed column: numbers ranked numerically, strings after numbers
+        ranks = sort_ranks( numpy.array( [ "10", "abc", 9, None, "2.5", "ab" ], dtype=object ) )
+        self.assertEqual( ranks.tolist(), [ 2, 4, 1, -1, 0, 3 ] )
+
+    def test_sort(self):
+        dataFrame = pandas.DataFrame( { "a": [ 3.0, "-", 1.0, 2.0, None ] } )
+        model = DataFrameTableModel( dataFrame )
+        proxy = DFProxyModel()
+        proxy.setSourceModel( model )
+
+        def sorted_rows():
+            return [ proxy.mapToSource( proxy.index( row, 0 ) ).row() for row in range( proxy.rowCount() ) ]
+
+        proxy.sort( 0, Qt.AscendingOrder )
+        self.assertEqual( sorted_rows(), [ 2, 3, 0, 1, 4 ] )
+        self.assertEqual( sort_permutation( proxy.sortRanks( 0 ), True ).tolist(), [ 2, 3, 0, 1, 4 ] )
+
+        proxy.sort( 0, Qt.DescendingOrder )
+        self.assertEqual( sorted_rows(), [ 0, 3, 2, 1, 4 ] )
+        self.assertEqual( sort_permutation( proxy.sortRanks( 0 ), False ).tolist(), [ 0, 3, 2, 1, 4 ] )
+
+        ## new content sorted dynamically
+        model.setContent( pandas.DataFrame( { "a": [ 1.0, 5.0, 3.0 ] } ) )
+        self.assertEqual( sorted_rows(), [ 1, 2, 0 ] )
+
+    def test_filter_mask(self):
+        columnValues = filter_values( [ "10", "9", "-", "abc", "1.5" ] )
+        ## no-data rows are treated as greatest in ascending order (like in sorting)
+        self.assertEqual( filter_mask( columnValues, 0, "5" ).tolist(), [ True, True, True, True, False ] )
+        self.assertEqual( filter_mask( columnValues, 1, "9.0" ).tolist(), [ False, True, False, False, False ] )
+        self.assertEqual( filter_mask( columnValues, 2, "5" ).tolist(), [ False, False, False, False, True ] )
+        self.assertEqual( filter_mask( columnValues, 3, "1" ).tolist(), [ True, False, False, False, True ] )
+
+    def test_filterAcceptsRow(self):
+        dataFrame = pandas.DataFrame( { "a": [ "xxx", "yyy", "axa" ], "b": [ 3.0, numpy.nan, 1.0 ] } )
+        model = DataFrameTableModel( dataFrame )
+        proxy = DFProxyModel()
+        proxy.setSourceModel( model )
+
+        proxy.setFilterKeyColumn( 0 )
+        proxy.setFilterCondition( 3 )
+        proxy.setFilterFixedString( "x" )
+        self.assertEqual( proxy.rowCount(), 2 )
+
+        proxy.setFilterKeyColumn( 1 )
+        proxy.setFilterCondition( 0 )
+        proxy.setFilterFixedString( "2" )
+        self.assertEqual( proxy.rowCount(), 1 )
+
+        ## new content filtered dynamically
+        model.setContent( pandas.DataFrame( { "a": [ "x", "y" ], "b": [ 3.0, 4.0 ] } ) )
+        self.assertEqual( proxy.rowCount(), 2 )
+
+        proxy.clearFilter()
+        self.assertEqual( proxy.rowCount(), 2 )
@@ -0,0 +1,93 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+import datetime
+import pandas
+
+from stockmonitor.gui.widget import stockchartwidget
+from stockmonitor.gui.widget.stockchartwidget import prepare_candle_data, bin_candle_data
+
+
+## =================================================================
+
+
+class IntradaySourceMock():
+
+    def __init__(self, dataFrame):
+        self.dataFrame = dataFrame
+
+    def getWorksheetData(self):
+        return self.dataFrame
+
+
+def create_intraday_frame():
+    startTime = datetime.datetime( 2021, 1, 4, 9, 0, 0 )
+    timeList  = [ startTime + datetime.timedelta( minutes=minute ) for minute in [ 0, 1, 2, 10, 11, 20 ] ]
+    return pandas.DataFrame( { "t": timeList,
+                               "o": [ 10.0, 11.0, 12.0, 13.0, 14.0, 15.0 ],
+                               "h": [ 10.5, 13.0, 12.5, 13.5, 14.5, 15.5 ],
+                               "l": [  9.5,  8.0, 11.5, 12.5,  9.0, 14.5 ],
+                               "c": [ 10.2, 11.2, 12.2, 13.2, 14.2, 15.2 ],
+                               "v": [ 1, 2, 3, 4, 5, 6 ] } )
+
+
+class PrepareCandleDataTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_bin_candle_data(self):
+        dataFrame = create_intraday_frame()
+        candleFrame = bin_candle_data( dataFrame, 3 )
+        self.assertEqual( list( candleFrame.index ), list( dataFrame["t"].iloc[ [ 0, 3, 5 ] ] ) )
+        self.assertEqual( list( candleFrame["Open"] ), [ 10.0, 13.0, 15.0 ] )
+        self.assertEqual( list( candleFrame["High"] ), [ 13.0, 14.5, 15.5 ] )
+        self.assertEqual( list( candleFrame["Low"] ), [ 8.0, 9.0, 14.5 ] )
+        self.assertEqual( list( candleFrame["Close"] ), [ 12.2, 14.2, 15.2 ] )
+        self.assertEqual( list( candleFrame["Volume"] ), [ 6, 9, 6 ] )
+
+    def test_prepare_candle_data(self):
+        dataFrame = create_intraday_frame()
+        intraSource = IntradaySourceMock( dataFrame )
+
+        candleFrame = prepare_candle_data( intraSource, 3 )
+        self.assertEqual( len( candleFrame ), 3 )
+        self.assertNotIn( "bin", dataFrame.columns )
+        ## result is cached, but caller gets own copy
+        candleFrame[ "Close" ] = 0.0
+        self.assertEqual( list( prepare_candle_data( intraSource, 3 )["Close"] ), [ 12.2, 14.2, 15.2 ] )
+
+        ## no binning if data is small enough
+        candleFrame = prepare_candle_data( intraSource, 10 )
+        self.assertEqual( list( candleFrame["Low"] ), list( dataFrame["l"] ) )
+
+        ## change of bins replaces cached entry of source
+        # pylint: disable=W0212
+        self.assertEqual( list( stockchartwidget._CANDLE_CACHE.keys() ).count( id( dataFrame ) ), 1 )
+        self.assertEqual( stockchartwidget._CANDLE_CACHE[ id( dataFrame ) ][1], None )
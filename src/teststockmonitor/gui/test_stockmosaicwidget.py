@@ -0,0 +1,110 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+import datetime
+
+from stockmonitor.gui.widget.stockmosaicwidget import MosaicTileData, set_wallet_data, prepare_tile_data
+
+from teststockmonitor.gui.test_stockchartwidget import IntradaySourceMock, create_intraday_frame
+
+
+## =================================================================
+
+
+class IntradayTimeSourceMock( IntradaySourceMock ):
+
+    def getRecentTransTime(self):
+        return self.dataFrame["t"].iloc[-1]
+
+
+class CurrentSourceMock():
+
+    def getReferenceValueByTicker(self, _):
+        return 11.0
+
+
+class TransactionMock():
+
+    def __init__(self, amount, unitPrice, transTime):
+        self.amount    = amount
+        self.unitPrice = unitPrice
+        self.transTime = transTime
+
+
+class TransHistoryMock():
+
+    def __init__(self, transactions):
+        self.transactions = transactions
+
+    def currentTransactionsAvg(self, _):
+        return ( 10, 12.5 )
+
+    def currentTransactions(self, _):
+        return self.transactions
+
+    def allTransactions(self):
+        return self.transactions
+
+
+class PrepareTileDataTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_prepare_tile_data(self):
+        dataFrame = create_intraday_frame()
+        startTime = dataFrame["t"].iloc[0]
+        transactions = [ TransactionMock(  5, 12.0, startTime - datetime.timedelta( days=1 ) ),
+                         TransactionMock(  5, 13.0, startTime + datetime.timedelta( minutes=5 ) ),
+                         TransactionMock( -2, 14.0, startTime + datetime.timedelta( minutes=6 ) ) ]
+        tile = MosaicTileData( 0, ("ABC", "name", 1.5), IntradayTimeSourceMock( dataFrame ) )
+        set_wallet_data( tile, TransHistoryMock( transactions ), None, (True, True, True) )
+        ## wallet is not accessed by worker
+        transactions.clear()
+        prepare_tile_data( tile, CurrentSourceMock(), 3 )
+
+        self.assertTrue( tile.prepared )
+        self.assertEqual( tile.title, "name (ABC)   +1.5%" )
+        self.assertEqual( len( tile.candleFrame ), 3 )
+        self.assertEqual( tile.refPrice, 11.0 )
+        self.assertEqual( tile.recentPrice, 15.2 )
+        self.assertEqual( tile.startTime, startTime )
+        self.assertEqual( tile.transTime, dataFrame["t"].iloc[-1] )
+        self.assertEqual( tile.hLines, [ (12.5, 'black'), (12.0, 'blue'), (13.0, 'blue'), (14.0, 'blue') ] )
+        self.assertEqual( [ item[2] for item in tile.points ], [ "+", "-" ] )
+
+    def test_prepare_tile_data_nodata(self):
+        tile = MosaicTileData( 0, ("ABC", "name", "-"), IntradayTimeSourceMock( create_intraday_frame().iloc[ :1 ] ) )
+        set_wallet_data( tile, None, None, (True, True, True) )
+        prepare_tile_data( tile, CurrentSourceMock(), 3 )
+
+        self.assertTrue( tile.prepared )
+        self.assertEqual( tile.title, "name (ABC)   -" )
+        self.assertIsNone( tile.candleFrame )
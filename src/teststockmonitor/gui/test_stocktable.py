@@ -0,0 +1,106 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from PyQt5.QtCore import Qt
+
+from stockdataaccess.dataaccess.datatype import StockDataType
+from stockmonitor.datatypes.datatypes import MarkerEntry
+from stockmonitor.gui.dataobject import DataObject
+from stockmonitor.gui.widget.dataframetable import DataFrameTableModel, TableRowColorDelegate
+from stockmonitor.gui.widget.stocktable import StockFullColorDelegate, stock_background_colors
+from teststockmonitor.data import create_current_stock_data
+
+
+## =================================================================
+
+
+class StockFullColorDelegateTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_stock_background_colors(self):
+        dataObject = DataObject()
+        dataObject.addFav( "xxx", [ "AAA", "BBB" ] )
+        marker = MarkerEntry()
+        marker.ticker = "BBB"
+        marker.value = 20.0
+        marker.setOperation( MarkerEntry.OperationType.BUY )
+        dataObject.addMarkerEntry( marker )
+
+        colors = stock_background_colors( dataObject, [ "AAA", "BBB", "CCC", "BBB" ], [ 10.0, 10.0, 10.0, 30.0 ] )
+        self.assertEqual( colors[0], TableRowColorDelegate.STOCK_FAV_BGCOLOR )
+        self.assertEqual( colors[1].name(), "#ffa500" )                        ## orange
+        self.assertEqual( colors[2], None )
+        self.assertEqual( colors[3], TableRowColorDelegate.STOCK_FAV_BGCOLOR )
+
+    def test_background_invalidate(self):
+        dataObject = DataObject()
+        dataFrame = create_current_stock_data( { StockDataType.TICKER:       [ "AAA", "BBB" ],
+                                                 StockDataType.RECENT_VALUE: [ 10.0, 20.0 ] } )
+        model = DataFrameTableModel( dataFrame )
+        model.setColorDelegate( StockFullColorDelegate( dataObject ) )
+
+        self.assertEqual( model.data( model.index( 1, 0 ), Qt.BackgroundRole ), None )
+
+        dataObject.addFav( "xxx", [ "BBB" ] )
+        self.assertEqual( model.data( model.index( 1, 0 ), Qt.BackgroundRole ),
+                          TableRowColorDelegate.STOCK_FAV_BGCOLOR )
+
+        dataObject.undoStack.undo()
+        self.assertEqual( model.data( model.index( 1, 0 ), Qt.BackgroundRole ), None )
+
+        model.setContent( create_current_stock_data( { StockDataType.TICKER:       [ "BBB", "AAA" ],
+                                                       StockDataType.RECENT_VALUE: [ 20.0, 10.0 ] } ) )
+        dataObject.addFav( "xxx", [ "AAA" ] )
+        self.assertEqual( model.data( model.index( 0, 0 ), Qt.BackgroundRole ), None )
+        self.assertEqual( model.data( model.index( 1, 0 ), Qt.BackgroundRole ),
+                          TableRowColorDelegate.STOCK_FAV_BGCOLOR )
+
+    def test_invalidateColors_dataChanged(self):
+        dataObject = DataObject()
+        dataFrame = create_current_stock_data( { StockDataType.TICKER:       [ "AAA", "BBB" ],
+                                                 StockDataType.RECENT_VALUE: [ 10.0, 20.0 ] } )
+        model = DataFrameTableModel( dataFrame )
+        model.setColorDelegate( StockFullColorDelegate( dataObject ) )
+
+        changedList = []
+
+        def data_changed( topLeft, bottomRight, roles ):
+            changedList.append( ( topLeft, bottomRight, roles ) )
+
+        model.dataChanged.connect( data_changed )
+
+        ## content of model does not change
+        dataObject.addFav( "xxx", [ "BBB" ] )
+        self.assertGreater( len( changedList ), 0 )
+        topLeft, bottomRight, roles = changedList[-1]
+        self.assertEqual( ( topLeft.row(), topLeft.column() ), ( 0, 0 ) )
+        self.assertEqual( ( bottomRight.row(), bottomRight.column() ), ( 1, 14 ) )
+        self.assertEqual( roles, [ Qt.BackgroundRole ] )